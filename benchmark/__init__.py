@@ -0,0 +1,6 @@
+"""
+vnpy_taos性能测试。
+
+python -m benchmark：使用进程内模拟连接测试数据处理性能，并与基准结果对比
+python -m benchmark.bench_load：连接实际的TDengine数据库测试读取性能
+"""
@@ -0,0 +1,56 @@
+"""
+对比对象读取与列式读取的性能，需要连接可用的TDengine数据库。
+
+python -m benchmark.bench_load rb2410 SHFE 1m 2024-01-01 2024-12-31
+"""
+
+import sys
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+
+from vnpy_taos.taos_database import TaosDatabase
+
+from .measure import BenchmarkResult, measure, print_results
+
+
+def main() -> None:
+    """主函数"""
+    symbol: str = sys.argv[1]
+    exchange: Exchange = Exchange(sys.argv[2])
+    interval: Interval = Interval(sys.argv[3])
+    start: datetime = datetime.strptime(sys.argv[4], "%Y-%m-%d").replace(tzinfo=DB_TZ)
+    end: datetime = datetime.strptime(sys.argv[5], "%Y-%m-%d").replace(tzinfo=DB_TZ)
+    repeat: int = int(sys.argv[6]) if len(sys.argv) > 6 else 3
+
+    database: TaosDatabase = TaosDatabase()
+
+    results: list[BenchmarkResult] = [
+        measure(
+            "load_bar_data",
+            lambda: database.load_bar_data(symbol, exchange, interval, start, end),
+            repeat
+        ),
+        measure(
+            "load_bar_arrays",
+            lambda: database.load_bar_arrays(symbol, exchange, interval, start, end),
+            repeat
+        ),
+        measure(
+            "load_tick_data",
+            lambda: database.load_tick_data(symbol, exchange, start, end),
+            repeat
+        ),
+        measure(
+            "load_tick_arrays",
+            lambda: database.load_tick_arrays(symbol, exchange, start, end),
+            repeat
+        ),
+    ]
+
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+按固定随机种子生成的合成K线和tick数据，以及对应的模拟数据表。
+"""
+
+from datetime import datetime, timedelta
+from random import Random
+
+import pandas as pd
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.database import DB_TZ
+
+from vnpy_taos.taos_database import (
+    BAR_ARRAY_FIELDS,
+    TICK_QUERY_FIELDS,
+    generate_bar_table_name,
+    generate_tick_table_name,
+)
+
+from .fake_taos import FakeTable
+
+
+# 合成数据的起始时间
+START: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+
+# 随机种子
+SEED: int = 20240102
+
+
+def generate_bars(
+    count: int,
+    symbol: str = "rb2410",
+    exchange: Exchange = Exchange.SHFE,
+    interval: Interval = Interval.MINUTE
+) -> list[BarData]:
+    """生成连续的1分钟K线"""
+    random: Random = Random(SEED)
+    price: float = 3500
+    bars: list[BarData] = []
+
+    for i in range(count):
+        open_price: float = price
+        price = round(price + random.choice((-1, 0, 1)), 1)
+
+        bar: BarData = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=START + timedelta(minutes=i),
+            interval=interval,
+            volume=float(random.randint(1, 1000)),
+            turnover=float(random.randint(1, 1000) * 35000),
+            open_interest=float(100000 + i),
+            open_price=open_price,
+            high_price=max(open_price, price) + 1,
+            low_price=min(open_price, price) - 1,
+            close_price=price,
+            gateway_name="DB"
+        )
+        bars.append(bar)
+
+    return bars
+
+
+def generate_ticks(
+    count: int,
+    symbol: str = "rb2410",
+    exchange: Exchange = Exchange.SHFE
+) -> list[TickData]:
+    """生成间隔500毫秒的五档tick"""
+    random: Random = Random(SEED)
+    price: float = 3500
+    volume: float = 0
+    ticks: list[TickData] = []
+
+    for i in range(count):
+        price = round(price + random.choice((-1, 0, 1)), 1)
+        volume += random.randint(0, 10)
+        dt: datetime = START + timedelta(milliseconds=500 * i)
+
+        tick: TickData = TickData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=dt,
+            name="螺纹钢2410",
+            volume=volume,
+            turnover=volume * price * 10,
+            open_interest=float(100000 + i),
+            last_price=price,
+            last_volume=float(random.randint(0, 10)),
+            limit_up=3800,
+            limit_down=3200,
+            open_price=3500,
+            high_price=3600,
+            low_price=3400,
+            pre_close=3500,
+            localtime=dt.replace(tzinfo=None),
+            gateway_name="DB"
+        )
+
+        for n in range(1, 6):
+            setattr(tick, f"bid_price_{n}", price - n)
+            setattr(tick, f"ask_price_{n}", price + n)
+            setattr(tick, f"bid_volume_{n}", float(random.randint(1, 100)))
+            setattr(tick, f"ask_volume_{n}", float(random.randint(1, 100)))
+
+        ticks.append(tick)
+
+    return ticks
+
+
+def generate_bar_table(bars: list[BarData]) -> FakeTable:
+    """生成K线数据表"""
+    bar: BarData = bars[0]
+
+    columns: dict[str, list] = {field: [getattr(b, field) for b in bars] for field in BAR_ARRAY_FIELDS}
+    tags: dict = {
+        "tbname": generate_bar_table_name(bar.symbol, bar.exchange, bar.interval),
+        "symbol": bar.symbol,
+        "exchange": bar.exchange.value,
+        "interval_": bar.interval.value,
+        "start_time": bars[0].datetime,
+        "end_time": bars[-1].datetime,
+        "count_": float(len(bars)),
+    }
+
+    return FakeTable("s_bar", columns, tags)
+
+
+def generate_tick_table(ticks: list[TickData]) -> FakeTable:
+    """生成tick数据表"""
+    tick: TickData = ticks[0]
+
+    columns: dict[str, list] = {field: [getattr(t, field) for t in ticks] for field in TICK_QUERY_FIELDS}
+    columns["localtime"] = [t.localtime.replace(tzinfo=DB_TZ) for t in ticks]
+
+    tags: dict = {
+        "tbname": generate_tick_table_name(tick.symbol, tick.exchange),
+        "symbol": tick.symbol,
+        "exchange": tick.exchange.value,
+        "start_time": ticks[0].datetime,
+        "end_time": ticks[-1].datetime,
+        "count_": float(len(ticks)),
+    }
+
+    return FakeTable("s_tick", columns, tags)
+
+
+def generate_bar_frame(bars: list[BarData]) -> pd.DataFrame:
+    """将K线转换为按列保存的DataFrame"""
+    return pd.DataFrame({field: [getattr(b, field) for b in bars] for field in BAR_ARRAY_FIELDS})
+
+
+def generate_tick_frame(ticks: list[TickData]) -> pd.DataFrame:
+    """将tick转换为按列保存的DataFrame"""
+    return pd.DataFrame({field: [getattr(t, field) for t in ticks] for field in TICK_QUERY_FIELDS})
+
+
+def generate_overview_tables(count: int) -> list[FakeTable]:
+    """生成只有汇总信息标签的K线和tick数据表，用于测试汇总信息查询"""
+    tables: list[FakeTable] = []
+    end: datetime = START + timedelta(days=30)
+
+    for i in range(count):
+        symbol: str = f"test{i:05d}"
+
+        tables.append(FakeTable("s_bar", {}, {
+            "tbname": generate_bar_table_name(symbol, Exchange.SHFE, Interval.MINUTE),
+            "symbol": symbol,
+            "exchange": Exchange.SHFE.value,
+            "interval_": Interval.MINUTE.value,
+            "start_time": START,
+            "end_time": end,
+            "count_": 10000.0,
+        }))
+
+        tables.append(FakeTable("s_tick", {}, {
+            "tbname": generate_tick_table_name(symbol, Exchange.SHFE),
+            "symbol": symbol,
+            "exchange": Exchange.SHFE.value,
+            "start_time": START,
+            "end_time": end,
+            "count_": 100000.0,
+        }))
+
+    return tables
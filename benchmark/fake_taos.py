@@ -0,0 +1,459 @@
+"""
+进程内模拟的taos连接器，按内存中的合成数据响应查询，用于在没有TDengine服务时测试Python侧的处理性能。
+
+查询解析字段列表、数据表名、datetime列的区间条件和LIMIT，其他WHERE条件会被忽略，合成数据需按时间排序。
+超级表查询按tbname IN条件过滤子表，查询数据列时依次返回各子表的数据（即PARTITION BY tbname的结果）。
+
+导入时如果vnpy发布版本中缺少MainContract，install会补充定义，使vnpy_taos可以导入。
+"""
+
+import re
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone, tzinfo
+from time import sleep
+from types import ModuleType
+from typing import Any
+from zoneinfo import ZoneInfo
+
+
+# 查询语句解析
+SELECT_PATTERN: re.Pattern = re.compile(
+    r"SELECT\s+(?:TAGS\s+|DISTINCT\s+)?(.*?)\s+FROM\s+(\w+)(.*)",
+    re.IGNORECASE | re.DOTALL
+)
+CAST_PATTERN: re.Pattern = re.compile(r"CAST\((\w+) AS BIGINT\)", re.IGNORECASE)
+FIRST_PATTERN: re.Pattern = re.compile(r"FIRST\((\w+)\)", re.IGNORECASE)
+LAST_PATTERN: re.Pattern = re.compile(r"LAST\((\w+)\)", re.IGNORECASE)
+LIMIT_PATTERN: re.Pattern = re.compile(r"LIMIT\s+(\d+)", re.IGNORECASE)
+TBNAME_PATTERN: re.Pattern = re.compile(r"\btbname\s+IN\s*\(([^)]*)\)", re.IGNORECASE)
+DAY_COUNT_PATTERN: re.Pattern = re.compile(
+    r"SELECT\s+CAST\(TIMETRUNCATE\(datetime, 1d\) AS BIGINT\), COUNT\(\*\)\s+FROM\s+(\w+)(.*)",
+    re.IGNORECASE | re.DOTALL
+)
+
+# 时间条件解析，时间值为字符串或毫秒时间戳
+TIME_VALUE: str = r"('[^']*'|\d+)"
+BETWEEN_PATTERN: re.Pattern = re.compile(rf"\bdatetime\s+BETWEEN\s+{TIME_VALUE}\s+AND\s+{TIME_VALUE}", re.IGNORECASE)
+COMPARE_PATTERN: re.Pattern = re.compile(rf"\bdatetime\s*(>=|<=|<|>|=)\s*{TIME_VALUE}", re.IGNORECASE)
+
+# 只统计数据量不返回结果的语句
+WRITE_KEYWORDS: tuple[str, ...] = ("INSERT", "CREATE", "ALTER", "DROP", "USE", "DELETE")
+
+# 超级表名
+STABLES: set[str] = {"s_bar", "s_tick"}
+
+# 结果集分块大小
+BLOCK_SIZE: int = 4096
+
+# 时间戳转换常量
+EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MILLISECOND: timedelta = timedelta(milliseconds=1)
+
+
+class FakeTable:
+    """内存中按列保存的数据表"""
+
+    def __init__(self, stable: str, columns: dict[str, list], tags: dict[str, Any]) -> None:
+        """构造函数，tags中需包含tbname"""
+        self.stable: str = stable
+        self.columns: dict[str, list] = columns
+        self.tags: dict[str, Any] = tags
+
+        self.size: int = len(next(iter(columns.values()))) if columns else 0
+
+
+class FakeServer:
+    """模拟的数据库服务，保存数据表并统计写入量"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.tables: dict[str, FakeTable] = {}
+
+        # 查询结果只生成一次，重复查询时不计入耗时
+        self.cache: dict[str, tuple[list[tuple], list[str]]] = {}
+
+        self.statements: int = 0
+        self.sql_bytes: int = 0
+        self.rows_bound: int = 0
+        self.lines: int = 0
+
+        # 不带时区的时间字符串按连接时区解析
+        self.timezone: tzinfo = timezone.utc
+
+        # 每条语句模拟的网络和服务端耗时（秒），等待期间释放GIL
+        self.latency: float = 0
+
+    def add_table(self, table: FakeTable) -> None:
+        """添加数据表"""
+        self.tables[table.tags["tbname"]] = table
+        self.cache.clear()
+
+    def clear(self) -> None:
+        """清空数据表和写入统计"""
+        self.tables.clear()
+        self.cache.clear()
+
+        self.statements = 0
+        self.sql_bytes = 0
+        self.rows_bound = 0
+        self.lines = 0
+        self.latency = 0
+
+    def execute(self, sql: str) -> tuple[list[tuple], list[str]]:
+        """执行SQL语句，返回结果行和列名"""
+        if self.latency:
+            sleep(self.latency)
+
+        if sql.lstrip()[:6].upper().startswith(WRITE_KEYWORDS):
+            self.statements += 1
+            self.sql_bytes += len(sql)
+            return [], []
+
+        cached: tuple[list[tuple], list[str]] | None = self.cache.get(sql)
+        if cached is None:
+            cached = self.query(sql)
+            self.cache[sql] = cached
+
+        return cached
+
+    def query(self, sql: str) -> tuple[list[tuple], list[str]]:
+        """按字段列表和数据表名生成查询结果"""
+        if "ins_tables" in sql:
+            return [(name,) for name in self.tables], ["table_name"]
+
+        day_count: re.Match | None = DAY_COUNT_PATTERN.match(sql.strip())
+        if day_count:
+            return self.count_days(day_count.group(1), day_count.group(2))
+
+        match: re.Match | None = SELECT_PATTERN.match(sql.strip())
+        if not match:
+            return [], []
+
+        fields: list[str] = [field.strip() for field in match.group(1).split(",")]
+        name: str = match.group(2)
+        clause: str = match.group(3)
+
+        # 超级表查询返回各子表的标签或按子表分区的数据
+        if name in STABLES:
+            return self.query_stable(name, fields, clause), fields
+
+        table: FakeTable | None = self.tables.get(name)
+        if not table:
+            return [], fields
+
+        if fields == ["*"]:
+            fields = list(table.columns)
+
+        # 子表查询标签时只返回一行
+        if all(field in table.tags for field in fields):
+            return [tuple(table.tags[field] for field in fields)], fields
+
+        start, end = self.get_range(table, clause)
+
+        if fields[0].upper() == "COUNT(*)":
+            return [(end - start,)], fields
+
+        first: re.Match | None = FIRST_PATTERN.fullmatch(fields[0])
+        if first and len(fields) == 1:
+            column: list = table.columns[first.group(1)][start:end]
+            return [(column[0],)] if column else [], fields
+
+        last: re.Match | None = LAST_PATTERN.fullmatch(fields[0])
+        if last:
+            column = table.columns[last.group(1)][start:end]
+            return [(column[-1],)] if column else [], fields
+
+        columns: list[list] = [self.get_column(table, field, start, end) for field in fields]
+        rows = list(zip(*columns, strict=True))
+
+        if "DESC" in clause.upper():
+            rows.reverse()
+
+        limit: re.Match | None = LIMIT_PATTERN.search(clause)
+        if limit:
+            rows = rows[:int(limit.group(1))]
+
+        return rows, fields
+
+    def query_stable(self, name: str, fields: list[str], clause: str) -> list[tuple]:
+        """查询超级表，只包含标签时每个子表返回一行，包含数据列时依次返回各子表的数据"""
+        tables: list[FakeTable] = [table for table in self.tables.values() if table.stable == name]
+
+        names: re.Match | None = TBNAME_PATTERN.search(clause)
+        if names:
+            table_names: set[str] = {value.strip().strip("'") for value in names.group(1).split(",")}
+            tables = [table for table in tables if table.tags["tbname"] in table_names]
+
+        rows: list[tuple] = []
+
+        for table in tables:
+            if all(field in table.tags for field in fields):
+                rows.append(tuple(table.tags[field] for field in fields))
+                continue
+
+            start, end = self.get_range(table, clause)
+
+            if "COUNT(*)" in (field.upper() for field in fields):
+                rows.append(tuple(
+                    end - start if field.upper() == "COUNT(*)" else table.tags[field]
+                    for field in fields
+                ))
+                continue
+
+            columns: list[list] = [self.get_column(table, field, start, end) for field in fields]
+            rows.extend(zip(*columns, strict=True))
+
+        return rows
+
+    def count_days(self, name: str, clause: str) -> tuple[list[tuple], list[str]]:
+        """按连接时区的自然日统计区间内的数据条数"""
+        fields: list[str] = ["day", "count"]
+
+        table: FakeTable | None = self.tables.get(name)
+        if not table:
+            return [], fields
+
+        start, end = self.get_range(table, clause)
+
+        counts: dict[int, int] = {}
+        for dt in table.columns["datetime"][start:end]:
+            local: datetime = dt.astimezone(self.timezone)
+            day: datetime = local.replace(hour=0, minute=0, second=0, microsecond=0)
+            day_ms: int = (day - EPOCH) // MILLISECOND
+            counts[day_ms] = counts.get(day_ms, 0) + 1
+
+        return list(counts.items()), fields
+
+    def get_range(self, table: FakeTable, clause: str) -> tuple[int, int]:
+        """按datetime列的条件计算查询的行区间"""
+        start: int = 0
+        end: int = table.size
+
+        times: list[datetime] | None = table.columns.get("datetime")
+        if not times:
+            return start, end
+
+        conditions: list[tuple[str, str]] = []
+        for match in BETWEEN_PATTERN.finditer(clause):
+            conditions.append((">=", match.group(1)))
+            conditions.append(("<=", match.group(2)))
+        for match in COMPARE_PATTERN.finditer(clause):
+            conditions.append((match.group(1), match.group(2)))
+
+        for operator, value in conditions:
+            dt: datetime = self.parse_time(value)
+
+            if operator in {">=", "="}:
+                start = max(start, bisect_left(times, dt))
+            elif operator == ">":
+                start = max(start, bisect_right(times, dt))
+
+            if operator in {"<=", "="}:
+                end = min(end, bisect_right(times, dt))
+            elif operator == "<":
+                end = min(end, bisect_left(times, dt))
+
+        return start, max(start, end)
+
+    def parse_time(self, value: str) -> datetime:
+        """解析条件中的时间字符串或毫秒时间戳"""
+        if not value.startswith("'"):
+            return EPOCH + int(value) * MILLISECOND
+
+        dt: datetime = datetime.fromisoformat(value.strip("'"))
+        if not dt.tzinfo:
+            dt = dt.replace(tzinfo=self.timezone)
+        return dt
+
+    def get_column(self, table: FakeTable, field: str, start: int, end: int) -> list:
+        """读取列数据，标签按行数重复，CAST为BIGINT的时间戳转换为毫秒"""
+        if field in table.tags:
+            return [table.tags[field]] * (end - start)
+
+        cast: re.Match | None = CAST_PATTERN.fullmatch(field)
+        if not cast:
+            return table.columns[field][start:end]
+
+        return [(dt - EPOCH) // MILLISECOND for dt in table.columns[cast.group(1)][start:end]]
+
+
+class FakeResult(list):
+    """查询结果集"""
+
+    def fetch_all(self) -> list[tuple]:
+        """读取全部结果"""
+        return list(self)
+
+    def blocks_iter(self) -> Iterator[tuple[list[tuple], int]]:
+        """分块读取结果"""
+        for i in range(0, len(self), BLOCK_SIZE):
+            rows: list[tuple] = self[i:i + BLOCK_SIZE]
+            yield rows, len(rows)
+
+
+class FakeCursor:
+    """游标，满足pandas读取所需的DB-API接口"""
+
+    def __init__(self, server: FakeServer) -> None:
+        """构造函数"""
+        self.server: FakeServer = server
+        self.rows: list[tuple] = []
+        self.description: list[tuple] | None = None
+
+    def execute(self, sql: str, *args: Any) -> int:
+        """执行SQL语句"""
+        rows, fields = self.server.execute(sql)
+
+        self.rows = rows
+        self.description = [(field, None, None, None, None, None, None) for field in fields]
+        return 0
+
+    def fetchall(self) -> list[tuple]:
+        """读取全部结果"""
+        return self.rows
+
+    def close(self) -> None:
+        """关闭游标"""
+        pass
+
+
+class FakeBind:
+    """参数绑定的列缓冲区"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.values: list = []
+
+    def timestamp(self, values: list) -> None:
+        """绑定时间戳列"""
+        self.values = values
+
+    def double(self, values: list) -> None:
+        """绑定浮点数列"""
+        self.values = values
+
+    def nchar(self, values: list) -> None:
+        """绑定字符串列"""
+        self.values = values
+
+
+class FakeStmt:
+    """参数绑定写入语句"""
+
+    def __init__(self, server: FakeServer) -> None:
+        """构造函数"""
+        self.server: FakeServer = server
+
+    def bind_param_batch(self, binds: list[FakeBind]) -> None:
+        """绑定一批数据"""
+        self.server.rows_bound += len(binds[0].values)
+
+    def execute(self) -> None:
+        """执行写入"""
+        self.server.statements += 1
+
+    def close(self) -> None:
+        """关闭语句"""
+        pass
+
+
+class FakeConnection:
+    """数据库连接"""
+
+    def __init__(self, server: FakeServer) -> None:
+        """构造函数"""
+        self.server: FakeServer = server
+
+    def cursor(self) -> FakeCursor:
+        """创建游标"""
+        return FakeCursor(self.server)
+
+    def query(self, sql: str) -> FakeResult:
+        """执行查询"""
+        rows, _ = self.server.execute(sql)
+        return FakeResult(rows)
+
+    def execute(self, sql: str) -> int:
+        """执行SQL语句"""
+        self.server.execute(sql)
+        return 0
+
+    def statement(self, sql: str) -> FakeStmt:
+        """创建参数绑定写入语句"""
+        return FakeStmt(self.server)
+
+    def schemaless_insert(self, lines: list[str], protocol: int, precision: int) -> int:
+        """行协议写入"""
+        self.server.statements += 1
+        self.server.lines += len(lines)
+        return len(lines)
+
+    def close(self) -> None:
+        """关闭连接"""
+        pass
+
+
+class SmlProtocol:
+    """无模式写入协议"""
+
+    LINE_PROTOCOL: int = 1
+
+
+class SmlPrecision:
+    """无模式写入时间精度"""
+
+    MILLI_SECONDS: int = 3
+
+
+def new_multi_binds(size: int) -> list[FakeBind]:
+    """创建参数绑定的列缓冲区"""
+    return [FakeBind() for _ in range(size)]
+
+
+def patch_vnpy() -> None:
+    """vnpy发布版本中没有MainContract时补充定义，与vnpy_taos的使用方式一致"""
+    import vnpy.trader.object as vnpy_object
+    from vnpy.trader.constant import Exchange
+
+    if hasattr(vnpy_object, "MainContract"):
+        return
+
+    @dataclass
+    class MainContract(vnpy_object.BaseData):
+        """主力合约数据"""
+
+        trade_date: datetime | None = None
+        product: str = ""
+        symbol: str = ""
+        exchange: Exchange | None = None
+
+    vnpy_object.MainContract = MainContract                         # type: ignore
+
+
+def install(server: FakeServer) -> None:
+    """替换taos模块，需要在导入vnpy_taos之前调用"""
+    if "vnpy_taos.taos_database" in sys.modules:
+        raise RuntimeError("vnpy_taos已导入，无法替换taos模块")
+
+    patch_vnpy()
+
+    def connect(**kwargs: Any) -> FakeConnection:
+        """创建连接，记录连接时区"""
+        if kwargs.get("timezone"):
+            server.timezone = ZoneInfo(kwargs["timezone"])
+        return FakeConnection(server)
+
+    module: ModuleType = ModuleType("taos")
+    module.connect = connect                                        # type: ignore
+    module.new_multi_binds = new_multi_binds                        # type: ignore
+    module.TaosConnection = FakeConnection                          # type: ignore
+    module.TaosCursor = FakeCursor                                  # type: ignore
+    module.TaosResult = FakeResult                                  # type: ignore
+    module.TaosStmt = FakeStmt                                      # type: ignore
+    module.SmlProtocol = SmlProtocol                                # type: ignore
+    module.SmlPrecision = SmlPrecision                              # type: ignore
+
+    sys.modules["taos"] = module
@@ -0,0 +1,164 @@
+"""
+测试函数的耗时和内存峰值统计，以及基准结果的保存和对比。
+"""
+
+import gc
+import json
+import platform
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from time import perf_counter
+from typing import Any
+
+
+# 内存峰值变化低于该字节数时不视为退化
+MEMORY_FLOOR: int = 64 * 1024
+
+# 每轮测试的最短耗时（秒）
+MIN_ROUND_TIME: float = 0.2
+
+
+@dataclass
+class BenchmarkResult:
+    """单项测试结果"""
+
+    name: str
+    rows: int
+    seconds: float
+    rows_per_second: float
+    peak_memory: int
+
+
+def count_rows(data: Any) -> int:
+    """统计测试函数返回的数据条数"""
+    if isinstance(data, int):
+        return data
+    elif isinstance(data, dict):
+        return len(data["datetime"])
+    elif data is None:
+        return 0
+
+    try:
+        return len(data)
+    except TypeError:
+        return 1
+
+
+def measure(name: str, func: Callable[[], Any], repeat: int) -> BenchmarkResult:
+    """多次执行取最短耗时，再单独执行一次统计内存峰值（内存跟踪会拖慢执行）"""
+    # 预先执行一次，并确定每轮的执行次数，使耗时较短的测试项结果稳定
+    start: float = perf_counter()
+    data: Any = func()
+    cost: float = perf_counter() - start
+
+    rows: int = count_rows(data)
+    number: int = max(1, int(MIN_ROUND_TIME / cost)) if cost else 1
+    best: float = float("inf")
+    del data
+
+    for _ in range(repeat):
+        gc.collect()
+
+        start = perf_counter()
+        for _ in range(number):
+            func()
+        cost = (perf_counter() - start) / number
+
+        best = min(best, cost)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        data = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del data
+
+    return BenchmarkResult(
+        name=name,
+        rows=rows,
+        seconds=best,
+        rows_per_second=rows / best if best else 0,
+        peak_memory=peak
+    )
+
+
+def print_results(results: list[BenchmarkResult], baseline: dict[str, dict] | None = None) -> None:
+    """输出测试结果，传入基准结果时同时输出变化比例"""
+    header: str = f"{'name':<32}{'rows':>10}{'rows/sec':>14}{'peak MB':>10}"
+    if baseline:
+        header += f"{'speed':>10}{'memory':>10}"
+    print(header)
+
+    for result in results:
+        line: str = (
+            f"{result.name:<32}{result.rows:>10}{result.rows_per_second:>14.0f}"
+            f"{result.peak_memory / 1024 / 1024:>10.2f}"
+        )
+
+        base: dict | None = baseline.get(result.name) if baseline else None
+        if base:
+            line += f"{get_change(result.rows_per_second, base['rows_per_second']):>10}"
+            line += f"{get_change(result.peak_memory, base['peak_memory']):>10}"
+
+        print(line)
+
+
+def get_change(value: float, base: float) -> str:
+    """计算相对基准的变化比例"""
+    if not base:
+        return "-"
+    return f"{(value / base - 1):+.1%}"
+
+
+def save_baseline(path: Path, results: list[BenchmarkResult], parameters: dict[str, int]) -> None:
+    """保存基准结果，同时记录数据规模和运行环境"""
+    data: dict = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": parameters,
+        "results": {result.name: asdict(result) for result in results},
+    }
+
+    with open(path, mode="w", encoding="UTF-8") as f:
+        json.dump(data, f, indent=4)
+
+
+def load_baseline(path: Path) -> dict:
+    """读取基准结果，文件不存在时返回空字典"""
+    if not path.exists():
+        return {}
+
+    with open(path, encoding="UTF-8") as f:
+        data: dict = json.load(f)
+    return data
+
+
+def compare_baseline(
+    results: list[BenchmarkResult],
+    baseline: dict[str, dict],
+    tolerance: float
+) -> list[str]:
+    """对比基准结果，返回速度下降或内存增加超过容忍比例的测试项"""
+    regressions: list[str] = []
+
+    for result in results:
+        base: dict | None = baseline.get(result.name)
+        if not base:
+            continue
+
+        if result.rows_per_second < base["rows_per_second"] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: rows/sec {base['rows_per_second']:.0f} -> {result.rows_per_second:.0f}"
+            )
+
+        memory_limit: float = max(base["peak_memory"] * (1 + tolerance), base["peak_memory"] + MEMORY_FLOOR)
+        if result.peak_memory > memory_limit:
+            regressions.append(
+                f"{result.name}: peak memory {base['peak_memory']} -> {result.peak_memory}"
+            )
+
+    return regressions
@@ -0,0 +1,228 @@
+"""
+基于进程内模拟连接的性能测试，覆盖SQL生成、批量写入、结果转换和汇总信息查询。
+
+python -m benchmark --bars 100000 --ticks 100000 --save
+python -m benchmark --only load_
+"""
+
+import sys
+import warnings
+from argparse import ArgumentParser, Namespace
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from .fake_taos import FakeServer, install
+
+# 在导入vnpy_taos之前替换taos模块
+server: FakeServer = FakeServer()
+install(server)
+
+from vnpy.trader.object import BarData, TickData     # noqa: E402
+from vnpy.trader.setting import SETTINGS             # noqa: E402
+
+from vnpy_taos.taos_database import (                # noqa: E402
+    TaosDatabase,
+    generate_bar,
+    generate_bar_table_name,
+    generate_tick,
+    generate_tick_table_name,
+)
+
+from .data import (                                  # noqa: E402
+    generate_bar_frame,
+    generate_bar_table,
+    generate_bars,
+    generate_overview_tables,
+    generate_tick_frame,
+    generate_tick_table,
+    generate_ticks,
+)
+from .measure import (                               # noqa: E402
+    BenchmarkResult,
+    compare_baseline,
+    load_baseline,
+    measure,
+    print_results,
+    save_baseline,
+)
+
+
+# 默认基准结果文件
+BASELINE_PATH: Path = Path(__file__).parent.joinpath("baseline.json")
+
+# 读取最近tick的调用次数
+LAST_CALLS: int = 1000
+
+# 测试时使用的数据库配置，关闭缓存和合成流以只测试数据处理本身
+BENCHMARK_SETTINGS: dict[str, Any] = {
+    "database.insert_mode": "sql",
+    "database.overview_registry": True,
+    "database.overview_mode": "sync",
+    "database.bar_cache_size": 0,
+    "database.disk_cache_size": 0,
+    "database.bar_streams": {},
+}
+
+
+def insert(database: TaosDatabase, mode: str, table_name: str, data_set: list) -> int:
+    """使用指定写入模式批量写入"""
+    database.insert_mode = mode
+    try:
+        database.insert_in_batch(table_name, data_set)
+    finally:
+        database.insert_mode = "sql"
+
+    return len(data_set)
+
+
+def save_frame(database: TaosDatabase, mode: str, func: Callable[[], bool], size: int) -> int:
+    """使用指定写入模式保存DataFrame"""
+    database.insert_mode = mode
+    try:
+        func()
+    finally:
+        database.insert_mode = "sql"
+
+    return size
+
+
+def load_last_tick(database: TaosDatabase, tick: TickData, start: datetime, end: datetime) -> int:
+    """多次读取区间最近的tick"""
+    for _ in range(LAST_CALLS):
+        database.load_last_tick_data(tick.symbol, tick.exchange, start, end)
+
+    return LAST_CALLS
+
+
+def get_sql_overview(database: TaosDatabase, func: Callable[[], list]) -> list:
+    """不使用内存注册表，从数据库查询汇总信息"""
+    overviews = database.overviews
+    database.overviews = None
+    try:
+        return func()
+    finally:
+        database.overviews = overviews
+
+
+def create_cases(
+    database: TaosDatabase,
+    bars: list[BarData],
+    ticks: list[TickData]
+) -> list[tuple[str, Callable[[], Any]]]:
+    """创建测试项"""
+    bar: BarData = bars[0]
+    tick: TickData = ticks[0]
+
+    bar_table: str = generate_bar_table_name(bar.symbol, bar.exchange, bar.interval)
+    tick_table: str = generate_tick_table_name(tick.symbol, tick.exchange)
+
+    bar_frame: pd.DataFrame = generate_bar_frame(bars)
+    tick_frame: pd.DataFrame = generate_tick_frame(ticks)
+
+    def save_bar_frame() -> bool:
+        return database.save_bar_dataframe(bar_frame, bar.symbol, bar.exchange, bar.interval)      # type: ignore
+
+    def save_tick_frame() -> bool:
+        return database.save_tick_dataframe(tick_frame, tick.symbol, tick.exchange)
+
+    start: datetime = bars[0].datetime - timedelta(days=1)
+    end: datetime = max(bars[-1].datetime, ticks[-1].datetime) + timedelta(days=1)
+
+    return [
+        ("generate_bar", lambda: [generate_bar(b) for b in bars]),
+        ("generate_tick", lambda: [generate_tick(t) for t in ticks]),
+        ("insert_in_batch[bar,sql]", lambda: insert(database, "sql", bar_table, bars)),
+        ("insert_in_batch[bar,stmt]", lambda: insert(database, "stmt", bar_table, bars)),
+        ("insert_in_batch[bar,schemaless]", lambda: insert(database, "schemaless", bar_table, bars)),
+        ("insert_in_batch[tick,sql]", lambda: insert(database, "sql", tick_table, ticks)),
+        ("insert_in_batch[tick,stmt]", lambda: insert(database, "stmt", tick_table, ticks)),
+        ("insert_in_batch[tick,schemaless]", lambda: insert(database, "schemaless", tick_table, ticks)),
+        ("save_bar_data", lambda: database.save_bar_data(bars) and len(bars)),
+        ("save_tick_data", lambda: database.save_tick_data(ticks) and len(ticks)),
+        ("save_bar_dataframe[sql]", lambda: save_frame(database, "sql", save_bar_frame, len(bars))),
+        ("save_bar_dataframe[stmt]", lambda: save_frame(database, "stmt", save_bar_frame, len(bars))),
+        ("save_tick_dataframe[sql]", lambda: save_frame(database, "sql", save_tick_frame, len(ticks))),
+        ("save_tick_dataframe[stmt]", lambda: save_frame(database, "stmt", save_tick_frame, len(ticks))),
+        ("load_bar_data", lambda: database.load_bar_data(bar.symbol, bar.exchange, bar.interval, start, end)),
+        ("load_bar_arrays", lambda: database.load_bar_arrays(bar.symbol, bar.exchange, bar.interval, start, end)),
+        ("load_tick_data", lambda: database.load_tick_data(tick.symbol, tick.exchange, start, end)),
+        ("load_tick_arrays", lambda: database.load_tick_arrays(tick.symbol, tick.exchange, start, end)),
+        ("load_last_tick_data", lambda: load_last_tick(database, tick, start, end)),
+        ("load_overview", lambda: database.load_overview() or len(database.get_bar_overview())),
+        ("get_bar_overview", database.get_bar_overview),
+        ("get_tick_overview", database.get_tick_overview),
+        ("get_bar_overview[sql]", lambda: get_sql_overview(database, database.get_bar_overview)),
+        ("get_tick_overview[sql]", lambda: get_sql_overview(database, database.get_tick_overview)),
+    ]
+
+
+def parse_args() -> Namespace:
+    """解析命令行参数"""
+    parser: ArgumentParser = ArgumentParser(description="vnpy_taos性能测试")
+    parser.add_argument("--bars", type=int, default=100_000, help="K线数据条数")
+    parser.add_argument("--ticks", type=int, default=100_000, help="tick数据条数")
+    parser.add_argument("--contracts", type=int, default=1000, help="汇总信息的合约数量")
+    parser.add_argument("--repeat", type=int, default=3, help="每项测试的执行次数")
+    parser.add_argument("--only", default="", help="只执行名称包含该字符串的测试项")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="基准结果文件")
+    parser.add_argument("--save", action="store_true", help="将本次结果保存为基准")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的性能退化比例")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """主函数"""
+    args: Namespace = parse_args()
+
+    # pandas对非SQLAlchemy连接的提示
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    SETTINGS.update(BENCHMARK_SETTINGS)
+
+    bars: list[BarData] = generate_bars(args.bars)
+    ticks: list[TickData] = generate_ticks(args.ticks)
+
+    server.add_table(generate_bar_table(bars))
+    server.add_table(generate_tick_table(ticks))
+    for table in generate_overview_tables(args.contracts):
+        server.add_table(table)
+
+    database: TaosDatabase = TaosDatabase()
+
+    results: list[BenchmarkResult] = [
+        measure(name, func, args.repeat)
+        for name, func in create_cases(database, bars, ticks)
+        if args.only in name
+    ]
+
+    database.close()
+
+    parameters: dict[str, int] = {"bars": args.bars, "ticks": args.ticks, "contracts": args.contracts}
+
+    # 数据规模不同时内存峰值无法比较
+    baseline: dict = load_baseline(args.baseline)
+    if baseline and baseline["parameters"] != parameters:
+        print(f"基准结果的数据规模{baseline['parameters']}与本次不同，跳过对比")
+        baseline = {}
+
+    print_results(results, baseline.get("results"))
+
+    if args.save:
+        save_baseline(args.baseline, results, parameters)
+        print(f"基准结果已保存到{args.baseline}")
+        return
+
+    regressions: list[str] = compare_baseline(results, baseline.get("results", {}), args.tolerance)
+    if regressions:
+        print("性能退化：")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
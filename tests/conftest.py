@@ -0,0 +1,84 @@
+"""
+测试使用benchmark中进程内模拟的taos连接器，在导入vnpy_taos之前替换taos模块。
+"""
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+import pytest
+
+from benchmark.fake_taos import FakeServer, install
+
+# 在导入vnpy_taos之前替换taos模块
+server: FakeServer = FakeServer()
+install(server)
+
+from vnpy.trader.setting import SETTINGS                # noqa: E402
+
+from vnpy_taos.taos_database import TaosDatabase        # noqa: E402
+
+
+# 测试时使用的数据库配置，关闭缓存、合成流和后台线程
+TEST_SETTINGS: dict[str, Any] = {
+    "database.overview_registry": True,
+    "database.overview_mode": "sync",
+    "database.bar_cache_size": 0,
+    "database.disk_cache_size": 0,
+    "database.bar_streams": {},
+    "database.metrics": False,
+    "database.slow_query_threshold": 0,
+    "database.max_sql_bytes": 1024 * 1024,
+}
+
+
+@pytest.fixture
+def fake_server() -> Iterator[FakeServer]:
+    """清空数据表和写入统计的模拟数据库服务"""
+    server.clear()
+    yield server
+    server.clear()
+
+
+@pytest.fixture
+def executed(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """记录模拟服务执行的全部SQL语句"""
+    statements: list[str] = []
+    execute: Callable = fake_server.execute
+
+    def record(sql: str) -> tuple[list[tuple], list[str]]:
+        statements.append(" ".join(sql.split()))
+        result: tuple[list[tuple], list[str]] = execute(sql)
+        return result
+
+    monkeypatch.setattr(fake_server, "execute", record)
+    return statements
+
+
+@pytest.fixture
+def create_database(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch) -> Iterator[Callable[..., TaosDatabase]]:
+    """按测试配置创建数据库，关键字参数覆盖配置项（省略database.前缀），测试结束后关闭"""
+    databases: list[TaosDatabase] = []
+
+    # 未设置的配置项使用TaosDatabase中的默认值
+    monkeypatch.delitem(SETTINGS, "database.insert_mode", raising=False)
+    for key, value in TEST_SETTINGS.items():
+        monkeypatch.setitem(SETTINGS, key, value)
+
+    def create(**settings: Any) -> TaosDatabase:
+        for key, value in settings.items():
+            monkeypatch.setitem(SETTINGS, f"database.{key}", value)
+
+        database: TaosDatabase = TaosDatabase()
+        databases.append(database)
+        return database
+
+    yield create
+
+    for database in databases:
+        database.close()
+
+
+@pytest.fixture
+def database(create_database: Callable[..., TaosDatabase]) -> TaosDatabase:
+    """使用默认配置的数据库"""
+    return create_database()
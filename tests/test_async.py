@@ -0,0 +1,102 @@
+"""
+异步数据库接口：使用带模拟延迟的连接，检查并发调用相互重叠、并发上限生效且事件循环不被阻塞。
+"""
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from time import perf_counter
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bar_table, generate_bars
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_async import AsyncTaosDatabase
+from vnpy_taos.taos_database import TaosDatabase
+
+
+# 每条语句的模拟延迟（秒）
+LATENCY: float = 0.05
+
+# 并发调用次数
+CALLS: int = 8
+
+
+@pytest.fixture
+def bars(fake_server: FakeServer) -> list[BarData]:
+    """写入模拟服务的K线数据，并开启模拟延迟"""
+    bars: list[BarData] = generate_bars(100)
+    fake_server.add_table(generate_bar_table(bars))
+    fake_server.latency = LATENCY
+    return bars
+
+
+async def load_many(database: TaosDatabase, bars: list[BarData], calls: int, concurrency: int) -> float:
+    """并发读取K线数据，返回总耗时"""
+    async_database: AsyncTaosDatabase = AsyncTaosDatabase(database, concurrency)
+
+    start: datetime = bars[0].datetime - timedelta(days=1)
+    end: datetime = bars[-1].datetime + timedelta(days=1)
+
+    begin: float = perf_counter()
+    results: list[list[BarData]] = await asyncio.gather(*[
+        async_database.load_bar_data("rb2410", Exchange.SHFE, Interval.MINUTE, start, end)
+        for _ in range(calls)
+    ])
+    elapsed: float = perf_counter() - begin
+
+    assert all(len(result) == len(bars) for result in results)
+    return elapsed
+
+
+def test_gather_overlaps(create_database: Callable[..., TaosDatabase], bars: list[BarData]) -> None:
+    """并发调用的总耗时接近单次调用，而不是各次之和"""
+    database: TaosDatabase = create_database(pool_size=CALLS)
+
+    single: float = asyncio.run(load_many(database, bars, 1, CALLS))
+    total: float = asyncio.run(load_many(database, bars, CALLS, CALLS))
+
+    assert single >= LATENCY
+    assert total < single * 3
+    assert total < single * CALLS / 2
+
+
+def test_concurrency_limit(create_database: Callable[..., TaosDatabase], bars: list[BarData]) -> None:
+    """并发上限为2时按两批执行"""
+    database: TaosDatabase = create_database(pool_size=CALLS)
+
+    single: float = asyncio.run(load_many(database, bars, 1, 2))
+    total: float = asyncio.run(load_many(database, bars, 4, 2))
+
+    assert total >= single * 1.8
+    assert total < single * 4
+
+
+def test_loop_not_blocked(create_database: Callable[..., TaosDatabase], bars: list[BarData]) -> None:
+    """数据库操作执行期间事件循环仍能调度其他协程"""
+    database: TaosDatabase = create_database(pool_size=CALLS)
+
+    async def main() -> tuple[int, float]:
+        ticks: int = 0
+        done: asyncio.Event = asyncio.Event()
+
+        async def ticker() -> None:
+            nonlocal ticks
+            while not done.is_set():
+                ticks += 1
+                await asyncio.sleep(0.005)
+
+        task: asyncio.Task = asyncio.create_task(ticker())
+        elapsed: float = await load_many(database, bars, CALLS, CALLS)
+        done.set()
+        await task
+
+        return ticks, elapsed
+
+    ticks, elapsed = asyncio.run(main())
+
+    # 同步阻塞时只能在开始和结束时各调度一次
+    assert ticks >= elapsed / 0.005 / 3
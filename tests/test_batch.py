@@ -0,0 +1,132 @@
+"""
+列数组容器：BarBatch和TickBatch的长度、下标、切片和分块遍历，结果与逐条读取的对象列表和写入的数据一致。
+"""
+
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData, TickData
+
+from benchmark.data import generate_bar_table, generate_bars, generate_tick_table, generate_ticks
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_batch import CHUNK_SIZE, BarBatch, TickBatch
+from vnpy_taos.taos_database import TaosDatabase
+
+
+START: datetime = datetime(2024, 1, 1, tzinfo=DB_TZ)
+END: datetime = datetime(2024, 1, 31, tzinfo=DB_TZ)
+
+# 超过一个转换分块的数据量
+COUNT: int = CHUNK_SIZE * 2 + 100
+
+
+def load_bars(database: TaosDatabase, fake_server: FakeServer) -> tuple[list[BarData], BarBatch]:
+    """添加K线数据表后分别读取对象列表和列数组容器"""
+    fake_server.add_table(generate_bar_table(generate_bars(COUNT)))
+
+    bars: list[BarData] = database.load_bar_data("rb2410", Exchange.SHFE, Interval.MINUTE, START, END)
+    batch: BarBatch = database.load_bar_data("rb2410", Exchange.SHFE, Interval.MINUTE, START, END, as_batch=True)
+    return bars, batch
+
+
+def load_ticks(database: TaosDatabase, fake_server: FakeServer) -> tuple[list[TickData], TickBatch]:
+    """添加tick数据表后读取列数组容器，返回写入的tick（本地时间转换为数据库时区）和容器"""
+    ticks: list[TickData] = generate_ticks(COUNT)
+    fake_server.add_table(generate_tick_table(ticks))
+
+    ticks = [replace(tick, localtime=tick.localtime.replace(tzinfo=DB_TZ)) for tick in ticks]       # type: ignore
+    batch: TickBatch = database.load_tick_data("rb2410", Exchange.SHFE, START, END, as_batch=True)
+    return ticks, batch
+
+
+def test_bar_iteration(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """跨越多个分块遍历的结果与对象列表一致"""
+    bars, batch = load_bars(database, fake_server)
+
+    assert isinstance(batch, BarBatch)
+    assert len(batch) == COUNT
+    assert batch.arrays["datetime"].dtype == np.int64
+
+    assert list(batch) == bars
+    assert batch.to_list() == bars
+
+
+def test_bar_index(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """按位置读取单条K线，支持负数下标，越界时报错"""
+    bars, batch = load_bars(database, fake_server)
+
+    assert batch[0] == bars[0]
+    assert batch[CHUNK_SIZE] == bars[CHUNK_SIZE]
+    assert batch[-1] == bars[-1]
+
+    with pytest.raises(IndexError):
+        batch[COUNT]
+    with pytest.raises(IndexError):
+        batch[-COUNT - 1]
+
+
+def test_bar_slice(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """切片返回共享数组内存的新容器，带步长的切片同样可以遍历"""
+    bars, batch = load_bars(database, fake_server)
+
+    part: BarBatch = batch[100:CHUNK_SIZE + 200]
+    assert isinstance(part, BarBatch)
+    assert part.interval == Interval.MINUTE
+    assert len(part) == CHUNK_SIZE + 100
+    assert list(part) == bars[100:CHUNK_SIZE + 200]
+    assert part[-1] == bars[CHUNK_SIZE + 199]
+
+    for field, array in part.arrays.items():
+        assert np.shares_memory(array, batch.arrays[field])
+
+    assert list(batch[::500]) == bars[::500]
+    assert len(batch[COUNT:]) == 0
+    assert list(batch[COUNT:]) == []
+
+
+def test_tick_iteration(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """tick容器的遍历结果与写入的tick一致，合约名称只保存一份"""
+    ticks, batch = load_ticks(database, fake_server)
+
+    assert isinstance(batch, TickBatch)
+    assert len(batch) == COUNT
+    assert batch.name == ticks[0].name
+    assert "name" not in batch.arrays
+
+    assert list(batch) == ticks
+    assert batch[-1].localtime == ticks[-1].localtime
+
+
+def test_tick_slice(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """tick切片保留合约名称，下标和切片的结果与写入的tick一致"""
+    ticks, batch = load_ticks(database, fake_server)
+
+    part: TickBatch = batch[CHUNK_SIZE - 10:CHUNK_SIZE + 10]
+    assert isinstance(part, TickBatch)
+    assert part.name == batch.name
+    assert list(part) == ticks[CHUNK_SIZE - 10:CHUNK_SIZE + 10]
+    assert part[0] == ticks[CHUNK_SIZE - 10]
+    assert batch[::7].to_list() == ticks[::7]
+
+
+def test_tick_optional_arrays() -> None:
+    """没有localtime和name数组时本地时间为空，名称使用统一的合约名称"""
+    dt: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+    ms: int = int(dt.timestamp() * 1000)
+
+    arrays: dict[str, np.ndarray] = {
+        "datetime": np.array([ms, ms + 500], dtype=np.int64),
+        "last_price": np.array([3500.0, 3501.0]),
+    }
+    batch: TickBatch = TickBatch("rb2410", Exchange.SHFE, arrays, "螺纹钢2410")
+
+    ticks: list[TickData] = batch.to_list()
+    assert [tick.last_price for tick in ticks] == [3500.0, 3501.0]
+    assert ticks[1].datetime == dt.replace(microsecond=500000)
+    assert ticks[1].name == "螺纹钢2410"
+    assert ticks[1].localtime is None
@@ -0,0 +1,137 @@
+"""
+K线读取缓存：不带时区的查询时间、重叠区间的合并、只加载缺失的边缘区间，以及写入和删除后的失效。
+"""
+
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bar_table, generate_bars
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_cache import CacheEntry
+from vnpy_taos.taos_database import TaosDatabase
+
+
+SYMBOL: str = "rb2410"
+EXCHANGE: Exchange = Exchange.SHFE
+INTERVAL: Interval = Interval.MINUTE
+
+
+def create_cached(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    bars: list[BarData]
+) -> TaosDatabase:
+    """添加K线数据表后创建启用缓存的数据库"""
+    fake_server.add_table(generate_bar_table(bars))
+    return create_database(bar_cache_size=16)
+
+
+def load(database: TaosDatabase, start: datetime, end: datetime) -> list[BarData]:
+    """读取测试合约的1分钟K线"""
+    return database.load_bar_data(SYMBOL, EXCHANGE, INTERVAL, start, end)
+
+
+def count_queries(statements: list[str]) -> int:
+    """统计K线数据表的查询次数"""
+    return sum(1 for sql in statements if sql.startswith("SELECT datetime") and "FROM bar_rb2410" in sql)
+
+
+def test_naive_datetime(create_database: Callable[..., TaosDatabase], fake_server: FakeServer) -> None:
+    """不带时区的查询时间视为数据库时区，结果与带时区的查询一致"""
+    database: TaosDatabase = create_cached(create_database, fake_server, generate_bars(100))
+
+    naive: list[BarData] = load(database, datetime(2024, 1, 2, 9, 10), datetime(2024, 1, 2, 9, 20))
+    assert len(naive) == 11
+    assert naive[0].datetime == datetime(2024, 1, 2, 9, 10, tzinfo=DB_TZ)
+
+    # 部分命中缓存时仍可以与缓存中的K线比较
+    aware: list[BarData] = load(
+        database,
+        datetime(2024, 1, 2, 9, 15, tzinfo=DB_TZ),
+        datetime(2024, 1, 2, 9, 30, tzinfo=DB_TZ)
+    )
+    assert [bar.datetime for bar in aware] == [bar.datetime for bar in generate_bars(31)[15:]]
+
+
+def test_overlapping_merge(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    executed: list[str]
+) -> None:
+    """重叠的区间合并为一个，覆盖范围内的查询不再访问数据库"""
+    database: TaosDatabase = create_cached(create_database, fake_server, generate_bars(100))
+
+    load(database, datetime(2024, 1, 2, 9, 10), datetime(2024, 1, 2, 9, 20))
+    load(database, datetime(2024, 1, 2, 9, 15), datetime(2024, 1, 2, 9, 30))
+    assert count_queries(executed) == 2
+
+    entry: CacheEntry = database.bar_cache.entries[(SYMBOL, EXCHANGE, INTERVAL)]       # type: ignore
+    assert entry.ranges == [(datetime(2024, 1, 2, 9, 10, tzinfo=DB_TZ), datetime(2024, 1, 2, 9, 30, tzinfo=DB_TZ))]
+
+    bars: list[BarData] = load(database, datetime(2024, 1, 2, 9, 12), datetime(2024, 1, 2, 9, 28))
+    assert count_queries(executed) == 2
+    assert len(bars) == 17
+
+    statistics: dict[str, int] = database.bar_cache.get_statistics()      # type: ignore
+    assert (statistics["misses"], statistics["partial_hits"], statistics["hits"]) == (1, 1, 1)
+
+
+def test_edge_fetch(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    executed: list[str]
+) -> None:
+    """请求区间两端超出缓存时只加载两端缺失的部分，边界K线不重复"""
+    database: TaosDatabase = create_cached(create_database, fake_server, generate_bars(100))
+
+    load(database, datetime(2024, 1, 2, 9, 20), datetime(2024, 1, 2, 9, 30))
+    executed.clear()
+
+    bars: list[BarData] = load(database, datetime(2024, 1, 2, 9, 10), datetime(2024, 1, 2, 9, 40))
+
+    queries: list[str] = [sql for sql in executed if sql.startswith("SELECT datetime")]
+    assert len(queries) == 2
+    assert "BETWEEN '2024-01-02 09:10:00' AND '2024-01-02 09:20:00'" in queries[0]
+    assert "BETWEEN '2024-01-02 09:30:00' AND '2024-01-02 09:40:00'" in queries[1]
+
+    times: list[datetime] = [bar.datetime for bar in bars]
+    assert len(times) == len(set(times)) == 31
+    assert times == sorted(times)
+
+
+def test_invalidate_on_save(create_database: Callable[..., TaosDatabase], fake_server: FakeServer) -> None:
+    """写入K线后缓存失效，重新读取数据库中的新数据"""
+    bars: list[BarData] = generate_bars(100)
+    database: TaosDatabase = create_cached(create_database, fake_server, bars)
+
+    start: datetime = datetime(2024, 1, 2, 9)
+    end: datetime = datetime(2024, 1, 2, 9, 59)
+    assert load(database, start, end)[10].close_price == bars[10].close_price
+
+    bars[10] = replace(bars[10], close_price=9999)
+    fake_server.add_table(generate_bar_table(bars))
+    database.save_bar_data([bars[10]])
+
+    assert load(database, start, end)[10].close_price == 9999
+
+
+def test_invalidate_on_delete(create_database: Callable[..., TaosDatabase], fake_server: FakeServer) -> None:
+    """删除K线后缓存失效"""
+    database: TaosDatabase = create_cached(create_database, fake_server, generate_bars(100))
+
+    start: datetime = datetime(2024, 1, 2, 9)
+    end: datetime = datetime(2024, 1, 2, 9, 59)
+    assert len(load(database, start, end)) == 60
+
+    assert database.delete_bar_data(SYMBOL, EXCHANGE, INTERVAL) == 100
+    assert not database.bar_cache.entries       # type: ignore
+
+    fake_server.tables.clear()
+    fake_server.cache.clear()
+
+    assert load(database, start, end) == []
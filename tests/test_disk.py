@@ -0,0 +1,156 @@
+"""
+本地磁盘缓存：按日期条数重新校验缓存、没有数据的日期不记录，以及多个进程共享目录时合并清单。
+"""
+
+import json
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bar_table, generate_bars
+from benchmark.fake_taos import FakeServer, FakeTable
+from vnpy_taos.taos_database import TaosDatabase
+from vnpy_taos.taos_disk import MANIFEST_NAME, DiskCache
+
+
+SYMBOL: str = "rb2410"
+EXCHANGE: Exchange = Exchange.SHFE
+INTERVAL: Interval = Interval.MINUTE
+
+# 查询区间覆盖两天，第二天没有数据
+START: datetime = datetime(2024, 1, 2)
+END: datetime = datetime(2024, 1, 3, 23, 59)
+
+
+def create_cached(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    path: Path,
+    bars: list[BarData]
+) -> TaosDatabase:
+    """添加K线数据表后创建启用磁盘缓存的数据库"""
+    fake_server.add_table(generate_bar_table(bars))
+    return create_database(disk_cache_size=16, disk_cache_path=str(path))
+
+
+def load(database: TaosDatabase) -> dict[str, np.ndarray]:
+    """读取测试合约的1分钟K线列数组"""
+    return database.load_bar_arrays(SYMBOL, EXCHANGE, INTERVAL, START, END)
+
+
+def count_fetches(statements: list[str]) -> int:
+    """统计按日期下载数据的查询次数"""
+    return sum(1 for sql in statements if sql.startswith("SELECT CAST(datetime AS BIGINT)"))
+
+
+def load_manifest(path: Path) -> dict:
+    """读取清单文件"""
+    with open(path.joinpath(MANIFEST_NAME), encoding="UTF-8") as f:
+        data: dict = json.load(f)
+    return data
+
+
+def test_cached_day_reused(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    executed: list[str],
+    tmp_path: Path
+) -> None:
+    """条数未变化的日期从缓存文件读取，没有数据的日期不记录也不下载"""
+    database: TaosDatabase = create_cached(create_database, fake_server, tmp_path, generate_bars(100))
+
+    assert len(load(database)["datetime"]) == 100
+    assert count_fetches(executed) == 1
+
+    entries: dict = load_manifest(tmp_path)["bar_rb2410_SHFE_1m"]
+    assert list(entries) == ["20240102"]
+    assert entries["20240102"][0] == 100
+
+    executed.clear()
+    assert len(load(database)["datetime"]) == 100
+    assert count_fetches(executed) == 0
+
+
+def test_backfill_revalidated(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    executed: list[str],
+    tmp_path: Path
+) -> None:
+    """其他进程补写数据后，条数变化的日期和之前没有数据的日期重新下载"""
+    bars: list[BarData] = generate_bars(100)
+    database: TaosDatabase = create_cached(create_database, fake_server, tmp_path, bars)
+    assert len(load(database)["datetime"]) == 100
+
+    # 补写当天更多的K线和第二天的K线，不经过当前进程
+    more: list[BarData] = generate_bars(200)
+    next_day: list[BarData] = [
+        BarData(
+            symbol=SYMBOL,
+            exchange=EXCHANGE,
+            datetime=datetime(2024, 1, 3, 9, tzinfo=DB_TZ) + timedelta(minutes=i),
+            interval=INTERVAL,
+            close_price=4000,
+            gateway_name="DB"
+        )
+        for i in range(10)
+    ]
+    fake_server.add_table(generate_bar_table(more + next_day))
+
+    executed.clear()
+    arrays: dict[str, np.ndarray] = load(database)
+    assert len(arrays["datetime"]) == 210
+    assert arrays["close_price"][-1] == 4000
+    assert count_fetches(executed) == 1
+
+    entries: dict = load_manifest(tmp_path)["bar_rb2410_SHFE_1m"]
+    assert entries["20240102"][0] == 200
+    assert entries["20240103"][0] == 10
+
+
+def test_deleted_day_removed(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    tmp_path: Path
+) -> None:
+    """数据库中的数据被删除后移除缓存"""
+    database: TaosDatabase = create_cached(create_database, fake_server, tmp_path, generate_bars(100))
+    assert len(load(database)["datetime"]) == 100
+
+    # 其他进程删除了全部数据
+    table: FakeTable = fake_server.tables["bar_rb2410_SHFE_1m"]
+    fake_server.add_table(FakeTable(table.stable, {field: [] for field in table.columns}, table.tags))
+
+    assert len(load(database)["datetime"]) == 0
+    assert load_manifest(tmp_path) == {}
+    assert not tmp_path.joinpath("bar_rb2410_SHFE_1m", "20240102.arrow").exists()
+
+
+def test_manifest_merged(tmp_path: Path) -> None:
+    """共享缓存目录的两个缓存实例写入清单时合并对方的记录"""
+    first: DiskCache = DiskCache(tmp_path, 1024 * 1024)
+    second: DiskCache = DiskCache(tmp_path, 1024 * 1024)
+
+    def fetch(table_name: str, start_ms: int, end_ms: int) -> dict[str, np.ndarray]:
+        times: np.ndarray = np.arange(start_ms, end_ms, 3_600_000, dtype=np.int64)
+        return {"datetime": times, "close_price": np.ones(len(times))}
+
+    def count(table_name: str, start_ms: int, end_ms: int) -> dict[int, int]:
+        return {day_ms: 24 for day_ms in range(start_ms, end_ms, 86_400_000)}
+
+    first.get("bar_a", START, START + timedelta(hours=23), fetch, count)
+    second.get("bar_b", START, START + timedelta(hours=23), fetch, count)
+
+    assert set(load_manifest(tmp_path)) == {"bar_a", "bar_b"}
+    assert set(second.manifest) == {"bar_a", "bar_b"}
+
+    # 删除只影响对应的记录
+    first.invalidate("bar_a")
+    assert set(load_manifest(tmp_path)) == {"bar_b"}
+    assert DiskCache(tmp_path, 1024 * 1024).get_statistics()["tables"] == 1
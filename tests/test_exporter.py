@@ -0,0 +1,161 @@
+"""
+批量导出工具：按日期分区写入的Parquet文件、清单中的行数与count_标签的核对，以及数据表的筛选和导出失败的记录。
+"""
+
+from collections.abc import Callable
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.object import BarData, TickData
+
+from benchmark.data import generate_bar_table, generate_bars, generate_tick_table, generate_ticks
+from benchmark.fake_taos import FakeServer, FakeTable
+from vnpy_taos.exporter import (
+    KIND_BAR,
+    KIND_TICK,
+    ExportTask,
+    check_manifest,
+    export_parquet,
+    list_tasks,
+    load_manifest,
+)
+from vnpy_taos.taos_database import TaosDatabase, generate_timestamp
+
+
+BAR_TABLE: str = "bar_rb2410_SHFE_1m"
+TICK_TABLE: str = "tick_rb2410_SHFE"
+
+# 1分钟K线跨越三个自然日
+BAR_COUNT: int = 3000
+
+
+def add_tables(fake_server: FakeServer) -> tuple[list[BarData], list[TickData]]:
+    """添加K线和tick数据表"""
+    bars: list[BarData] = generate_bars(BAR_COUNT)
+    ticks: list[TickData] = generate_ticks(1000)
+
+    fake_server.add_table(generate_bar_table(bars))
+    fake_server.add_table(generate_tick_table(ticks))
+    return bars, ticks
+
+
+def read_times(folder: Path, files: dict[str, int]) -> list[int]:
+    """按文件顺序读取导出数据的毫秒时间戳"""
+    times: list[int] = []
+
+    for path in sorted(files):
+        column: np.ndarray = pq.read_table(folder.joinpath(path)).column("datetime").to_numpy()
+        times.extend(column.astype("datetime64[ms]").astype(np.int64).tolist())
+
+    return times
+
+
+def test_export_partitions(database: TaosDatabase, fake_server: FakeServer, tmp_path: Path) -> None:
+    """按日期拆分写入分区文件，完整导出的行数与count_标签一致"""
+    bars, ticks = add_tables(fake_server)
+
+    manifest: dict[str, Any] = export_parquet(database, tmp_path, window_days=1, workers=2)
+
+    assert manifest["failed"] == []
+    assert check_manifest(manifest) == []
+    assert load_manifest(tmp_path) == manifest
+
+    entry: dict[str, Any] = manifest["tables"][BAR_TABLE]
+    assert entry["complete"]
+    assert entry["rows"] == entry["count_"] == BAR_COUNT
+    assert list(entry["files"]) == [
+        f"bar/symbol=rb2410/exchange=SHFE/interval=1m/date=2024-01-0{day}/data.parquet" for day in (2, 3, 4)
+    ]
+    assert sum(entry["files"].values()) == BAR_COUNT
+    assert read_times(tmp_path, entry["files"]) == [generate_timestamp(bar.datetime) for bar in bars]
+
+    tick_entry: dict[str, Any] = manifest["tables"][TICK_TABLE]
+    assert list(tick_entry["files"]) == ["tick/symbol=rb2410/exchange=SHFE/date=2024-01-02/data.parquet"]
+    assert tick_entry["rows"] == len(ticks)
+
+
+def test_count_mismatch(database: TaosDatabase, fake_server: FakeServer, tmp_path: Path) -> None:
+    """完整导出的行数与count_标签不一致时报告，部分导出时不核对"""
+    bars: list[BarData] = generate_bars(BAR_COUNT)
+    table: FakeTable = generate_bar_table(bars)
+    table.tags["count_"] = float(BAR_COUNT + 1)
+    fake_server.add_table(table)
+
+    manifest: dict[str, Any] = export_parquet(database, tmp_path, kinds=[KIND_BAR])
+    assert check_manifest(manifest) == [f"{BAR_TABLE}: count_ {BAR_COUNT + 1} -> rows {BAR_COUNT}"]
+
+    partial: dict[str, Any] = export_parquet(database, tmp_path / "partial", kinds=[KIND_BAR], end=date(2024, 1, 3))
+    entry: dict[str, Any] = partial["tables"][BAR_TABLE]
+    assert not entry["complete"]
+    assert entry["end"] == "2024-01-03"
+    assert entry["rows"] < BAR_COUNT
+    assert check_manifest(partial) == []
+
+
+def test_list_tasks(create_database: Callable[..., TaosDatabase], fake_server: FakeServer) -> None:
+    """按本地代码、周期、数据类型和日期范围筛选数据表，跳过没有数据的数据表"""
+    add_tables(fake_server)
+    fake_server.add_table(generate_bar_table(generate_bars(10, "i2409", Exchange.DCE)))
+
+    empty: FakeTable = generate_bar_table(generate_bars(10, "hc2410"))
+    empty.tags["count_"] = 0.0
+    fake_server.add_table(empty)
+
+    database: TaosDatabase = create_database()
+
+    def names(tasks: list[ExportTask]) -> list[str]:
+        return sorted(task.table_name for task in tasks)
+
+    assert names(list_tasks(database, [KIND_BAR, KIND_TICK])) == ["bar_i2409_DCE_1m", BAR_TABLE, TICK_TABLE]
+    assert names(list_tasks(database, [KIND_BAR, KIND_TICK], pattern="rb*.SHFE")) == [BAR_TABLE, TICK_TABLE]
+    assert names(list_tasks(database, [KIND_BAR, KIND_TICK], interval="1m")) == ["bar_i2409_DCE_1m", BAR_TABLE]
+    assert names(list_tasks(database, [KIND_TICK])) == [TICK_TABLE]
+
+    tasks: list[ExportTask] = list_tasks(database, [KIND_BAR], pattern="rb*", start=date(2024, 1, 3))
+    assert (tasks[0].start, tasks[0].end, tasks[0].complete) == (date(2024, 1, 3), date(2024, 1, 4), False)
+
+    assert not list_tasks(database, [KIND_BAR], start=date(2024, 2, 1))
+
+
+def test_manifest_merge(database: TaosDatabase, fake_server: FakeServer, tmp_path: Path) -> None:
+    """再次导出时保留清单中其他数据表的记录"""
+    add_tables(fake_server)
+
+    export_parquet(database, tmp_path, kinds=[KIND_BAR])
+    manifest: dict[str, Any] = export_parquet(database, tmp_path, kinds=[KIND_TICK])
+
+    assert set(manifest["tables"]) == {BAR_TABLE, TICK_TABLE}
+    assert set(load_manifest(tmp_path)["tables"]) == {BAR_TABLE, TICK_TABLE}
+
+
+def test_failed_table(
+    database: TaosDatabase,
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path
+) -> None:
+    """导出失败的数据表记录在清单中，不影响其他数据表"""
+    add_tables(fake_server)
+
+    fetch_arrays: Callable = database.fetch_arrays
+
+    def fail_ticks(table_name: str, *args: Any) -> dict[str, np.ndarray]:
+        if table_name == TICK_TABLE:
+            raise ConnectionError("database unavailable")
+
+        arrays: dict[str, np.ndarray] = fetch_arrays(table_name, *args)
+        return arrays
+
+    monkeypatch.setattr(database, "fetch_arrays", fail_ticks)
+
+    manifest: dict[str, Any] = export_parquet(database, tmp_path)
+
+    assert manifest["failed"] == [TICK_TABLE]
+    assert set(manifest["tables"]) == {BAR_TABLE}
+    assert load_manifest(tmp_path)["failed"] == [TICK_TABLE]
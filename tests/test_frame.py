@@ -0,0 +1,144 @@
+"""
+DataFrame写入：按列生成的写入语句（NaN写入为NULL，缺少的数值列写入0），以及由时间列的最小值、最大值和行数计算的汇总信息。
+"""
+
+import re
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ, BarOverview, TickOverview
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bar_frame, generate_bars, generate_tick_frame, generate_ticks
+from vnpy_taos.taos_database import INSERT_PREFIX, TaosDatabase, generate_timestamp
+from vnpy_taos.taos_frame import generate_bind_column
+from vnpy_taos.taos_tuner import MIN_BUDGET
+
+
+ROW_PATTERN: re.Pattern = re.compile(r"\(([^()]*)\)")
+
+
+def get_rows(statements: list[str], table_name: str) -> list[list[str]]:
+    """解析写入语句中各行的值"""
+    rows: list[list[str]] = []
+
+    for sql in statements:
+        if sql.startswith(f"{INSERT_PREFIX} {table_name} VALUES"):
+            rows.extend(values.split(",") for values in ROW_PATTERN.findall(sql))
+
+    return rows
+
+
+def test_bar_frame_values(database: TaosDatabase, executed: list[str]) -> None:
+    """时间列写入毫秒时间戳，NaN写入为NULL，缺少的数值列写入0"""
+    bars: list[BarData] = generate_bars(10)
+    df: pd.DataFrame = generate_bar_frame(bars).drop(columns=["open_interest"])
+    df.loc[3, "close_price"] = np.nan
+
+    assert database.save_bar_dataframe(df, "rb2410", Exchange.SHFE, Interval.MINUTE)
+
+    assert executed.count(
+        "CREATE TABLE IF NOT EXISTS bar_rb2410_SHFE_1m USING s_bar(symbol, exchange, interval_, count_) "
+        "TAGS('rb2410', 'SHFE', '1m', '0')"
+    ) == 1
+
+    rows: list[list[str]] = get_rows(executed, "bar_rb2410_SHFE_1m")
+    assert len(rows) == 10
+
+    # datetime, volume, turnover, open_interest, open_price, high_price, low_price, close_price
+    assert rows[0] == [
+        str(generate_timestamp(bars[0].datetime)),
+        repr(float(bars[0].volume)),
+        repr(float(bars[0].turnover)),
+        "0.0",
+        repr(float(bars[0].open_price)),
+        repr(float(bars[0].high_price)),
+        repr(float(bars[0].low_price)),
+        repr(float(bars[0].close_price)),
+    ]
+    assert rows[3][7] == "NULL"
+    assert all(row[3] == "0.0" for row in rows)
+
+
+def test_bar_frame_overview(database: TaosDatabase) -> None:
+    """汇总信息的起止时间为时间列的最小值和最大值，数量为行数"""
+    bars: list[BarData] = generate_bars(100)
+    df: pd.DataFrame = generate_bar_frame(bars).sample(frac=1, random_state=0)
+
+    database.save_bar_dataframe(df, "rb2410", Exchange.SHFE, Interval.MINUTE)
+
+    overview: BarOverview = database.get_bar_overview()[0]
+    assert overview.symbol == "rb2410"
+    assert overview.interval == Interval.MINUTE
+    assert overview.count == 100
+    assert overview.start == bars[0].datetime
+    assert overview.end == bars[-1].datetime
+
+
+def test_time_column_types(database: TaosDatabase, executed: list[str]) -> None:
+    """不带时区的时间视为数据库时区，整数列视为毫秒时间戳"""
+    dt: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+    ms: int = generate_timestamp(dt)
+
+    naive: pd.DataFrame = pd.DataFrame({"datetime": [dt.replace(tzinfo=None)], "close_price": [3500.0]})
+    database.save_bar_dataframe(naive, "rb2410", Exchange.SHFE, Interval.MINUTE)
+    assert database.get_bar_overview()[0].start == dt
+
+    integer: pd.DataFrame = pd.DataFrame({"datetime": [ms + 60_000], "close_price": [3501.0]})
+    database.save_bar_dataframe(integer, "rb2410", Exchange.SHFE, Interval.MINUTE)
+    assert database.get_bar_overview()[0].end == dt + timedelta(minutes=1)
+
+    rows: list[list[str]] = get_rows(executed, "bar_rb2410_SHFE_1m")
+    assert [row[0] for row in rows] == [str(ms), str(ms + 60_000)]
+
+
+def test_budget_split(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """按列生成的语句不超过字节预算，全部行都写入"""
+    database: TaosDatabase = create_database(max_sql_bytes=MIN_BUDGET)
+
+    df: pd.DataFrame = generate_bar_frame(generate_bars(2000))
+    database.save_bar_dataframe(df, "rb2410", Exchange.SHFE, Interval.MINUTE)
+
+    inserts: list[str] = [sql for sql in executed if sql.startswith(INSERT_PREFIX)]
+    assert len(inserts) > 1
+    assert all(len(sql.encode()) <= MIN_BUDGET for sql in inserts)
+    assert len(get_rows(executed, "bar_rb2410_SHFE_1m")) == 2000
+
+
+def test_tick_frame(database: TaosDatabase, executed: list[str]) -> None:
+    """合约名称转义引号，不带时区的本地时间视为数据库时区，缺少的本地时间使用datetime，汇总信息按行数计算"""
+    df: pd.DataFrame = generate_tick_frame(generate_ticks(10))
+    df["name"] = "rb'2410"
+    df["localtime"] = df["datetime"].dt.tz_localize(None)
+    df.loc[5, "localtime"] = pd.NaT
+
+    assert database.save_tick_dataframe(df, "rb2410", Exchange.SHFE)
+
+    rows: list[list[str]] = get_rows(executed, "tick_rb2410_SHFE")
+    assert len(rows) == 10
+    assert rows[0][1] == "'rb\\'2410'"
+    assert all(row[-1] == row[0] for row in rows)
+
+    overview: TickOverview = database.get_tick_overview()[0]
+    assert overview.count == 10
+    assert overview.start == df["datetime"].min()
+    assert overview.end == df["datetime"].max()
+
+
+def test_empty_frame(database: TaosDatabase, executed: list[str]) -> None:
+    """空DataFrame不写入"""
+    executed.clear()
+
+    assert not database.save_bar_dataframe(pd.DataFrame(), "rb2410", Exchange.SHFE, Interval.MINUTE)
+    assert not database.save_tick_dataframe(pd.DataFrame(), "rb2410", Exchange.SHFE)
+    assert not executed
+
+
+def test_bind_nan() -> None:
+    """参数绑定时NaN绑定为空值"""
+    assert generate_bind_column(np.array([1.0, np.nan, 3.0]), "double") == [1.0, None, 3.0]
+    assert generate_bind_column(np.array([1, 2], dtype=np.int64), "timestamp") == [1, 2]
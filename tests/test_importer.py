@@ -0,0 +1,77 @@
+"""
+历史K线批量导入工具：断点文件的保存时机和K线周期参数的检查。
+"""
+
+import json
+from argparse import Namespace
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+
+from vnpy_taos.importer import Checkpoint, parse_args, parse_file_name
+
+
+START: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+
+
+def load_rows(path: Path, data_path: Path) -> int:
+    """读取断点文件中记录的文件已写入行数"""
+    with open(path, encoding="UTF-8") as f:
+        data: dict = json.load(f)
+
+    rows: int = data["files"][str(data_path)]["rows"]
+    return rows
+
+
+def test_checkpoint_saved_at_file_end(tmp_path: Path) -> None:
+    """数据块写入后不立即保存断点文件，文件写完时保存"""
+    data_path: Path = tmp_path.joinpath("rb2410_SHFE_1m.csv")
+    data_path.write_text("datetime\n")
+    checkpoint_path: Path = tmp_path.joinpath("checkpoint.json")
+
+    checkpoint: Checkpoint = Checkpoint(checkpoint_path, save_interval=3600)
+    for _ in range(3):
+        checkpoint.add_rows(data_path, "bar_rb2410_SHFE_1m", 100, START, START)
+
+    assert not checkpoint_path.exists()
+
+    checkpoint.finish_file(data_path)
+    assert load_rows(checkpoint_path, data_path) == 300
+    assert not checkpoint_path.with_suffix(".tmp").exists()
+
+    # 重新加载后文件已全部写入
+    assert Checkpoint(checkpoint_path).get_rows(data_path) is None
+
+
+def test_checkpoint_saved_on_timer(tmp_path: Path) -> None:
+    """距上次保存超过间隔时在数据块写入后保存"""
+    data_path: Path = tmp_path.joinpath("rb2410_SHFE_1m.csv")
+    data_path.write_text("datetime\n")
+    checkpoint_path: Path = tmp_path.joinpath("checkpoint.json")
+
+    checkpoint: Checkpoint = Checkpoint(checkpoint_path, save_interval=0)
+    checkpoint.add_rows(data_path, "bar_rb2410_SHFE_1m", 100, START, START)
+    checkpoint.add_rows(data_path, "bar_rb2410_SHFE_1m", 100, START, START)
+
+    assert load_rows(checkpoint_path, data_path) == 200
+    assert Checkpoint(checkpoint_path).get_rows(data_path) == 200
+
+
+def test_interval_rejects_tick(capsys: pytest.CaptureFixture) -> None:
+    """命令行参数只接受K线周期"""
+    with pytest.raises(SystemExit):
+        parse_args(["data", "--interval", Interval.TICK.value])
+    assert "invalid choice" in capsys.readouterr().err
+
+    args: Namespace = parse_args(["data", "--interval", Interval.MINUTE.value])
+    assert args.interval == Interval.MINUTE.value
+
+
+def test_file_name_ignores_tick() -> None:
+    """文件名中的tick不会被识别为K线周期"""
+    assert parse_file_name(Path("rb2410_SHFE_tick.csv")) is None
+    assert parse_file_name(Path("rb2410_SHFE_1m_2015.parquet")) == ("rb2410", Exchange.SHFE, Interval.MINUTE)
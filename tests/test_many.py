@@ -0,0 +1,92 @@
+"""
+多合约写入：多个数据表合并为一条写入语句，未知的数据表通过USING子句自动创建，超出字节预算时拆分为多条语句。
+"""
+
+from collections.abc import Callable
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.database import BarOverview
+from vnpy.trader.object import BarData, TickData
+
+from benchmark.data import generate_bars, generate_ticks
+from vnpy_taos.taos_database import INSERT_PREFIX, TaosDatabase
+from vnpy_taos.taos_tuner import MIN_BUDGET
+
+
+def get_inserts(statements: list[str]) -> list[str]:
+    """筛选写入语句"""
+    return [sql for sql in statements if sql.startswith(INSERT_PREFIX)]
+
+
+def count_rows(sql: str) -> int:
+    """统计写入语句中的行数"""
+    return sql.count("('2024-")
+
+
+def test_single_statement(database: TaosDatabase, executed: list[str]) -> None:
+    """多个合约的K线合并为一条写入语句，汇总信息一次性查询"""
+    bars: list[BarData] = generate_bars(100) + generate_bars(100, "hc2410")
+    assert database.save_bar_data_many(bars)
+
+    inserts: list[str] = get_inserts(executed)
+    assert len(inserts) == 1
+    assert "bar_rb2410_SHFE_1m USING s_bar(symbol, exchange, interval_, count_)" in inserts[0]
+    assert "bar_hc2410_SHFE_1m USING s_bar(symbol, exchange, interval_, count_)" in inserts[0]
+    assert count_rows(inserts[0]) == 200
+
+    assert sum(1 for sql in executed if sql.startswith("SELECT DISTINCT tbname")) == 1
+
+    overviews: dict[str, BarOverview] = {overview.symbol: overview for overview in database.get_bar_overview()}
+    assert overviews.keys() == {"rb2410", "hc2410"}
+    assert overviews["hc2410"].count == 100
+    assert overviews["hc2410"].start == bars[100].datetime
+    assert overviews["hc2410"].end == bars[-1].datetime
+
+
+def test_known_tables(database: TaosDatabase, executed: list[str]) -> None:
+    """已写入过的数据表不再带USING子句"""
+    database.save_bar_data_many(generate_bars(10) + generate_bars(10, "hc2410"))
+    executed.clear()
+
+    database.save_bar_data_many(generate_bars(10) + generate_bars(10, "i2409", Exchange.DCE))
+
+    inserts: list[str] = get_inserts(executed)
+    assert len(inserts) == 1
+    assert "bar_rb2410_SHFE_1m VALUES" in inserts[0]
+    assert "bar_rb2410_SHFE_1m USING" not in inserts[0]
+    assert "bar_i2409_DCE_1m USING" in inserts[0]
+
+
+def test_budget_split(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """超出字节预算时拆分为多条语句，拆分后续写的数据表保留表名"""
+    database: TaosDatabase = create_database(max_sql_bytes=MIN_BUDGET)
+
+    bars: list[BarData] = generate_bars(1000) + generate_bars(1000, "hc2410")
+    database.save_bar_data_many(bars)
+
+    inserts: list[str] = get_inserts(executed)
+    assert len(inserts) > 1
+    assert all(len(sql.encode()) <= MIN_BUDGET for sql in inserts)
+    assert sum(count_rows(sql) for sql in inserts) == 2000
+
+    # 每条语句都以数据表名开头
+    assert all(sql.startswith(f"{INSERT_PREFIX} bar_") for sql in inserts)
+
+
+def test_tick_many(database: TaosDatabase, executed: list[str]) -> None:
+    """多个合约的tick合并为一条写入语句"""
+    ticks: list[TickData] = generate_ticks(50) + generate_ticks(50, "hc2410")
+    assert database.save_tick_data_many(ticks)
+
+    inserts: list[str] = get_inserts(executed)
+    assert len(inserts) == 1
+    assert "tick_rb2410_SHFE USING s_tick(symbol, exchange, count_)" in inserts[0]
+    assert "tick_hc2410_SHFE USING s_tick(symbol, exchange, count_)" in inserts[0]
+    assert count_rows(inserts[0]) == 100
+
+
+def test_empty(database: TaosDatabase, executed: list[str]) -> None:
+    """没有数据时不执行任何语句"""
+    assert not database.save_bar_data_many([])
+    assert not database.save_tick_data_many([])
+    assert not executed
@@ -0,0 +1,86 @@
+"""
+性能指标：导出失败时记录日志，日志摘要按导出区间统计最大耗时，参数绑定写入不统计SQL字节数。
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from vnpy_taos import taos_metrics
+from vnpy_taos.taos_metrics import (
+    KIND_METHOD,
+    LogSink,
+    MetricsSink,
+    OperationKey,
+    OperationStats,
+    TaosMetrics,
+    generate_prometheus_text,
+)
+
+
+class FailingSink(MetricsSink):
+    """导出时抛出异常的输出接口"""
+
+    def export(self, snapshot: dict[OperationKey, OperationStats]) -> None:
+        """导出失败"""
+        raise OSError("disk full")
+
+
+def test_export_error_logged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """导出失败时输出到vnpy日志，不影响其他输出接口"""
+    messages: list[str] = []
+    monkeypatch.setattr(taos_metrics.logger, "bind", lambda **kwargs: SimpleNamespace(error=messages.append))
+
+    exported: list[dict[OperationKey, OperationStats]] = []
+
+    class RecordingSink(MetricsSink):
+        def export(self, snapshot: dict[OperationKey, OperationStats]) -> None:
+            exported.append(snapshot)
+
+    metrics: TaosMetrics = TaosMetrics([FailingSink(), RecordingSink()], 0)
+    metrics.record("method", "load_bar_data", 0.01)
+    metrics.export()
+
+    assert messages == ["性能指标导出失败: disk full"]
+    assert len(exported) == 1
+
+
+def test_log_interval_max(monkeypatch: pytest.MonkeyPatch) -> None:
+    """日志摘要的最大耗时只统计上次导出以来的操作"""
+    messages: list[str] = []
+    monkeypatch.setattr(taos_metrics.logger, "bind", lambda **kwargs: SimpleNamespace(info=messages.append))
+
+    metrics: TaosMetrics = TaosMetrics([LogSink()], 0)
+
+    metrics.record(KIND_METHOD, "load_bar_data", 0.5)
+    metrics.export()
+    assert messages == ["method load_bar_data: count=1 avg=500.00ms max=500.00ms"]
+
+    metrics.record(KIND_METHOD, "load_bar_data", 0.01)
+    metrics.record(KIND_METHOD, "load_bar_data", 0.03)
+    metrics.export()
+    assert messages[1] == "method load_bar_data: count=2 avg=20.00ms max=30.00ms"
+
+    # 累计的最大耗时不受影响
+    assert metrics.snapshot()[(KIND_METHOD, "load_bar_data")].max_time == 0.5
+
+
+def test_stmt_without_sql_bytes(monkeypatch: pytest.MonkeyPatch) -> None:
+    """参数绑定写入不输出SQL字节数"""
+    messages: list[str] = []
+    monkeypatch.setattr(taos_metrics.logger, "bind", lambda **kwargs: SimpleNamespace(info=messages.append))
+
+    metrics: TaosMetrics = TaosMetrics([LogSink()], 0)
+    metrics.record_statement("INSERT INTO t VALUES(?, ?)", "stmt", 0.01, 100, 0)
+    metrics.record_statement("INSERT INTO t VALUES(1, 2)", "insert", 0.01, 1, 26)
+    metrics.export()
+
+    assert messages == [
+        "statement insert: count=1 avg=10.00ms max=10.00ms rows=1 sql_bytes=26",
+        "statement stmt: count=1 avg=10.00ms max=10.00ms rows=100",
+    ]
+
+    text: str = generate_prometheus_text(metrics.snapshot())
+    assert 'vnpy_taos_statement_rows_total{operation="stmt"} 100' in text
+    assert 'vnpy_taos_statement_sql_bytes_total{operation="insert"} 26' in text
+    assert 'vnpy_taos_statement_sql_bytes_total{operation="stmt"}' not in text
@@ -0,0 +1,106 @@
+"""
+多合约读取：在超级表上按数据表名过滤并以PARTITION BY tbname一次查询，结果按本地代码拆分，分组后可以并行查询。
+"""
+
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData, TickData
+
+from benchmark.data import generate_bar_table, generate_bars, generate_tick_table, generate_ticks
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_database import TaosDatabase
+
+
+START: datetime = datetime(2024, 1, 2, 9, 10, tzinfo=DB_TZ)
+END: datetime = datetime(2024, 1, 2, 9, 39, tzinfo=DB_TZ)
+
+
+def add_bars(fake_server: FakeServer, symbols: list[str]) -> dict[str, list[BarData]]:
+    """添加各合约的K线数据表，返回以本地代码为键的K线"""
+    data: dict[str, list[BarData]] = {}
+
+    for symbol in symbols:
+        bars: list[BarData] = generate_bars(100, symbol)
+        fake_server.add_table(generate_bar_table(bars))
+        data[f"{symbol}.SHFE"] = bars
+
+    return data
+
+
+def get_multi_queries(statements: list[str]) -> list[str]:
+    """筛选超级表上的分区查询"""
+    return [sql for sql in statements if sql.endswith("PARTITION BY tbname") and "tbname IN" in sql]
+
+
+def test_load_bar_multi(database: TaosDatabase, fake_server: FakeServer, executed: list[str]) -> None:
+    """一次查询读取多个合约，结果与逐个合约读取一致"""
+    data: dict[str, list[BarData]] = add_bars(fake_server, ["rb2410", "hc2410", "ag2412"])
+    vt_symbols: list[str] = ["rb2410.SHFE", "hc2410.SHFE"]
+
+    results: dict[str, list[BarData]] = database.load_bar_data_multi(vt_symbols, Interval.MINUTE, START, END)
+
+    queries: list[str] = get_multi_queries(executed)
+    assert len(queries) == 1
+    assert queries[0].startswith("SELECT tbname, datetime")
+    assert "FROM s_bar WHERE tbname IN ('bar_rb2410_SHFE_1m', 'bar_hc2410_SHFE_1m')" in queries[0]
+
+    assert results.keys() == set(vt_symbols)
+    for vt_symbol in vt_symbols:
+        bars: list[BarData] = results[vt_symbol]
+        assert len(bars) == 30
+        assert bars[0].datetime == START
+        assert bars[-1].datetime == END
+        assert [bar.close_price for bar in bars] == [bar.close_price for bar in data[vt_symbol][10:40]]
+
+        single: list[BarData] = database.load_bar_data(bars[0].symbol, Exchange.SHFE, Interval.MINUTE, START, END)
+        assert bars == single
+
+
+def test_missing_contract(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """没有数据的合约返回空列表，没有合约时不查询"""
+    add_bars(fake_server, ["rb2410"])
+
+    results: dict[str, list[BarData]] = database.load_bar_data_multi(
+        ["rb2410.SHFE", "i2409.DCE"], Interval.MINUTE, START, END
+    )
+    assert len(results["rb2410.SHFE"]) == 30
+    assert results["i2409.DCE"] == []
+
+    assert database.load_bar_data_multi([], Interval.MINUTE, START, END) == {}
+
+
+def test_parallel_workers(database: TaosDatabase, fake_server: FakeServer, executed: list[str]) -> None:
+    """合约分组后并行查询，结果与单次查询一致"""
+    symbols: list[str] = ["rb2410", "hc2410", "ag2412", "cu2410", "al2410"]
+    add_bars(fake_server, symbols)
+    vt_symbols: list[str] = [f"{symbol}.SHFE" for symbol in symbols]
+
+    single: dict[str, list[BarData]] = database.load_bar_data_multi(vt_symbols, Interval.MINUTE, START, END)
+    executed.clear()
+
+    parallel: dict[str, list[BarData]] = database.load_bar_data_multi(
+        vt_symbols, Interval.MINUTE, START, END, workers=2
+    )
+    assert len(get_multi_queries(executed)) == 2
+    assert parallel == single
+
+
+def test_load_tick_multi(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """一次查询读取多个合约的tick"""
+    data: dict[str, list[TickData]] = {}
+    for symbol in ["rb2410", "hc2410"]:
+        ticks: list[TickData] = generate_ticks(100, symbol)
+        fake_server.add_table(generate_tick_table(ticks))
+        data[f"{symbol}.SHFE"] = ticks
+
+    # 查询条件精确到秒，tick间隔500毫秒
+    start: datetime = data["rb2410.SHFE"][10].datetime
+    end: datetime = data["rb2410.SHFE"][50].datetime
+
+    results: dict[str, list[TickData]] = database.load_tick_data_multi(list(data), start, end)
+
+    for vt_symbol, ticks in data.items():
+        assert [tick.last_price for tick in results[vt_symbol]] == [tick.last_price for tick in ticks[10:51]]
+        assert all(tick.vt_symbol == vt_symbol for tick in results[vt_symbol])
@@ -0,0 +1,121 @@
+"""
+延迟更新的汇总信息：合并数据表的变化后批量写入标签，写入失败时记录日志并等待重试。
+"""
+
+from collections.abc import Callable
+from types import SimpleNamespace
+
+import pytest
+from vnpy.trader.database import BarOverview
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bars
+from vnpy_taos import taos_overview
+from vnpy_taos.taos_database import TaosDatabase
+from vnpy_taos.taos_overview import OverviewState, OverviewUpdater
+
+
+TABLE_NAME: str = "bar_rb2410_SHFE_1m"
+
+
+def create_deferred(create_database: Callable[..., TaosDatabase]) -> TaosDatabase:
+    """创建延迟更新汇总信息的数据库，定时写入间隔足够长以免测试中自动写入"""
+    return create_database(overview_mode="deferred", overview_flush_interval=3600)
+
+
+def get_tag_updates(statements: list[str]) -> list[str]:
+    """筛选汇总信息标签的更新语句"""
+    return [sql for sql in statements if sql.startswith("ALTER TABLE")]
+
+
+def test_deferred_accumulate(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """多次写入的汇总信息在内存中累加，写入时不查询也不更新标签"""
+    database: TaosDatabase = create_deferred(create_database)
+    executed.clear()
+
+    bars: list[BarData] = generate_bars(100)
+    database.save_bar_data(bars[50:])
+    database.save_bar_data(bars[:50])
+
+    assert not get_tag_updates(executed)
+    assert not any(sql.startswith("SELECT start_time") for sql in executed)
+
+    assert database.overview_updater.get_state(TABLE_NAME) == (bars[0].datetime, bars[-1].datetime, 100)     # type: ignore
+
+    overview: BarOverview = database.get_bar_overview()[0]
+    assert overview.count == 100
+    assert overview.start == bars[0].datetime
+    assert overview.end == bars[-1].datetime
+
+
+def test_deferred_flush(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """立即写入时每个数据表只写入最终的汇总信息，没有变化时不再写入"""
+    database: TaosDatabase = create_deferred(create_database)
+
+    bars: list[BarData] = generate_bars(100)
+    database.save_bar_data(bars[:50])
+    database.save_bar_data(bars[50:])
+    database.save_bar_data_many(generate_bars(10, "hc2410"))
+    executed.clear()
+
+    database.flush_overview()
+
+    updates: list[str] = get_tag_updates(executed)
+    assert len(updates) == 6
+    assert f"ALTER TABLE {TABLE_NAME} SET TAG count_='100';" in updates
+    assert f"ALTER TABLE {TABLE_NAME} SET TAG start_time='{bars[0].datetime}';" in updates
+    assert f"ALTER TABLE {TABLE_NAME} SET TAG end_time='{bars[-1].datetime}';" in updates
+    assert "ALTER TABLE bar_hc2410_SHFE_1m SET TAG count_='10';" in updates
+
+    executed.clear()
+    database.flush_overview()
+    assert not executed
+
+
+def test_close_flush(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """关闭数据库时写入剩余的汇总信息"""
+    database: TaosDatabase = create_deferred(create_database)
+    database.save_bar_data(generate_bars(10))
+    executed.clear()
+
+    database.close()
+
+    assert f"ALTER TABLE {TABLE_NAME} SET TAG count_='10';" in get_tag_updates(executed)
+    assert not database.overview_updater
+
+
+def test_updater_states() -> None:
+    """只更新已有数据表的数据条数，移除后不再写入"""
+    written: list[dict[str, OverviewState]] = []
+    updater: OverviewUpdater = OverviewUpdater(written.append, 3600)
+
+    updater.set_count(TABLE_NAME, 10)
+    updater.flush()
+    assert not written
+
+    updater.set_state(TABLE_NAME, None, None, 10)
+    updater.set_count(TABLE_NAME, 20)
+    updater.set_state("bar_hc2410_SHFE_1m", None, None, 5)
+    updater.remove("bar_hc2410_SHFE_1m")
+    updater.close()
+
+    assert written == [{TABLE_NAME: (None, None, 20)}]
+
+
+def test_flush_error_logged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """写入失败时输出到vnpy日志，数据表保留在待写入集合中"""
+    messages: list[str] = []
+    monkeypatch.setattr(taos_overview.logger, "bind", lambda **kwargs: SimpleNamespace(error=messages.append))
+
+    def fail(pending: dict[str, OverviewState]) -> None:
+        raise ConnectionError("database unavailable")
+
+    updater: OverviewUpdater = OverviewUpdater(fail, 3600)
+    updater.set_state("bar_rb2410_SHFE_1m", None, None, 10)
+    updater.flush()
+
+    assert messages == ["更新汇总信息失败: database unavailable"]
+    assert updater.dirty == {"bar_rb2410_SHFE_1m"}
+
+    updater.remove("bar_rb2410_SHFE_1m")
+    updater.close()
@@ -0,0 +1,115 @@
+"""
+K线合成：检查时间窗口聚合语句的字段、查询区间和INTERVAL子句，以及合成结果的K线周期。
+"""
+
+from collections.abc import Callable
+from datetime import datetime
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bars
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_database import TaosDatabase
+
+
+START: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+END: datetime = datetime(2024, 1, 2, 15, tzinfo=DB_TZ)
+
+
+def generate_sql(database: TaosDatabase, window: str, offset: str = "") -> str:
+    """生成测试合约1分钟K线的合成语句"""
+    sql: str = database.generate_resample_sql("rb2410", Exchange.SHFE, Interval.MINUTE, window, START, END, offset)
+    return " ".join(sql.split())
+
+
+def resample(bars: list[BarData], size: int) -> list[tuple]:
+    """按固定根数合成K线，返回与合成语句结果列一致的行"""
+    rows: list[tuple] = []
+
+    for i in range(0, len(bars), size):
+        window: list[BarData] = bars[i:i + size]
+        rows.append((
+            window[0].datetime,
+            sum(bar.volume for bar in window),
+            sum(bar.turnover for bar in window),
+            window[-1].open_interest,
+            window[0].open_price,
+            max(bar.high_price for bar in window),
+            min(bar.low_price for bar in window),
+            window[-1].close_price,
+        ))
+
+    return rows
+
+
+def test_resample_sql(database: TaosDatabase) -> None:
+    """开高低收取FIRST/MAX/MIN/LAST，成交量和成交额求和，持仓量取最后一个值"""
+    sql: str = generate_sql(database, "5m")
+
+    assert sql == (
+        "SELECT _wstart, SUM(volume), SUM(turnover), LAST(open_interest), "
+        "FIRST(open_price), MAX(high_price), MIN(low_price), LAST(close_price) "
+        "FROM bar_rb2410_SHFE_1m "
+        "WHERE datetime BETWEEN '2024-01-02 09:00:00' AND '2024-01-02 15:00:00' "
+        "INTERVAL(5m)"
+    )
+
+
+def test_resample_offset(database: TaosDatabase) -> None:
+    """窗口偏移写入INTERVAL子句"""
+    assert generate_sql(database, "1d", "21h").endswith("INTERVAL(1d, 21h)")
+
+
+@pytest.mark.parametrize("window, offset", [("5", ""), ("5min", ""), ("1d", "21")])
+def test_invalid_window(database: TaosDatabase, window: str, offset: str) -> None:
+    """不支持的时间窗口和窗口偏移在执行前报错"""
+    with pytest.raises(ValueError):
+        generate_sql(database, window, offset)
+
+
+@pytest.mark.parametrize("window, interval", [("5m", Interval.MINUTE), ("1h", Interval.HOUR), ("1d", Interval.DAILY)])
+def test_load_resampled(
+    database: TaosDatabase,
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch,
+    window: str,
+    interval: Interval
+) -> None:
+    """按时间窗口单位确定合成K线的周期，结果列依次转换为K线字段"""
+    bars: list[BarData] = generate_bars(15)
+    rows: list[tuple] = resample(bars, 5)
+
+    queries: list[str] = []
+    execute: Callable = fake_server.execute
+
+    def respond(sql: str) -> tuple[list[tuple], list[str]]:
+        if "INTERVAL(" in sql:
+            queries.append(" ".join(sql.split()))
+            return rows, []
+
+        result: tuple[list[tuple], list[str]] = execute(sql)
+        return result
+
+    monkeypatch.setattr(fake_server, "execute", respond)
+
+    results: list[BarData] = database.load_resampled_bar_data(
+        "rb2410", Exchange.SHFE, Interval.MINUTE, window, START, END
+    )
+
+    assert queries == [generate_sql(database, window)]
+    assert len(results) == 3
+
+    bar: BarData = results[1]
+    assert bar.interval == interval
+    assert bar.gateway_name == "DB"
+    assert bar.datetime == bars[5].datetime
+    assert bar.volume == sum(b.volume for b in bars[5:10])
+    assert bar.open_price == bars[5].open_price
+    assert bar.high_price == max(b.high_price for b in bars[5:10])
+    assert bar.low_price == min(b.low_price for b in bars[5:10])
+    assert bar.close_price == bars[9].close_price
+    assert bar.open_interest == bars[9].open_interest
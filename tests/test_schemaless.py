@@ -0,0 +1,86 @@
+"""
+无模式写入：检查超级表标签类型和自动创建的子表名。
+"""
+
+from collections.abc import Callable
+
+import pytest
+
+from vnpy.trader.object import BarData
+
+from benchmark.data import generate_bar_table, generate_bars
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_database import TaosDatabase
+
+
+def describe(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch, tag_type: str) -> None:
+    """模拟DESCRIBE超级表返回的字符串标签类型"""
+    execute: Callable = fake_server.execute
+
+    def execute_describe(sql: str) -> tuple[list[tuple], list[str]]:
+        if sql.startswith("DESCRIBE"):
+            rows: list[tuple] = [
+                ("datetime", "TIMESTAMP", 8, ""),
+                ("symbol", tag_type, 20, "TAG"),
+                ("exchange", tag_type, 10, "TAG"),
+                ("start_time", "TIMESTAMP", 8, "TAG"),
+            ]
+            return rows, ["field", "type", "length", "note"]
+
+        result: tuple[list[tuple], list[str]] = execute(sql)
+        return result
+
+    monkeypatch.setattr(fake_server, "execute", execute_describe)
+
+
+def test_nchar_stables(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """无模式写入时创建的超级表使用NCHAR字符串标签"""
+    create_database(insert_mode="schemaless")
+
+    stables: list[str] = [sql for sql in executed if sql.startswith("CREATE STABLE IF NOT EXISTS s_")]
+    assert "symbol NCHAR(20), exchange NCHAR(10), interval_ NCHAR(5)" in stables[0]
+    assert "symbol NCHAR(20), exchange NCHAR(10)" in stables[1]
+
+
+def test_binary_stables(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """其他写入模式的超级表与之前一致使用BINARY标签"""
+    create_database()
+
+    stables: list[str] = [sql for sql in executed if sql.startswith("CREATE STABLE IF NOT EXISTS s_")]
+    assert "symbol BINARY(20), exchange BINARY(10), interval_ BINARY(5)" in stables[0]
+    assert not [sql for sql in executed if sql.startswith("DESCRIBE")]
+
+
+def test_binary_tags_rejected(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """已有超级表的字符串标签不是NCHAR时无法无模式写入"""
+    describe(fake_server, monkeypatch, "VARCHAR")
+
+    with pytest.raises(RuntimeError, match="VARCHAR"):
+        create_database(insert_mode="schemaless")
+
+
+def test_table_name_checked(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """首次写入后数据表不存在时提示配置smlChildTableName"""
+    describe(fake_server, monkeypatch, "NCHAR")
+    database: TaosDatabase = create_database(insert_mode="schemaless")
+
+    bars: list[BarData] = generate_bars(10)
+
+    with pytest.raises(RuntimeError, match="smlChildTableName tname"):
+        database.save_bar_data(bars)
+
+    assert fake_server.lines == 10
+    assert "bar_rb2410_SHFE_1m" not in database.known_tables
+
+    # 按命名规则创建数据表后正常写入
+    fake_server.add_table(generate_bar_table(bars))
+    assert database.save_bar_data(bars)
+    assert "bar_rb2410_SHFE_1m" in database.known_tables
@@ -0,0 +1,192 @@
+"""
+参数绑定写入模式：记录绑定的各列数据，检查列顺序、时间戳和数值。
+"""
+
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import BarData, TickData
+
+from benchmark.fake_taos import FakeConnection, FakeServer, FakeStmt
+from vnpy_taos.taos_database import (
+    BAR_FIELD_TYPES,
+    TICK_DOUBLE_FIELDS,
+    TICK_FIELD_TYPES,
+    TaosDatabase,
+)
+
+
+START: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+
+
+class RecordingStmt(FakeStmt):
+    """记录每批绑定的列类型和数据"""
+
+    def __init__(self, server: FakeServer, sql: str) -> None:
+        """构造函数"""
+        super().__init__(server)
+
+        self.sql: str = sql
+        self.batches: list[list[tuple[str, list]]] = []
+        self.closed: bool = False
+
+    def bind_param_batch(self, binds: list) -> None:
+        """记录一批绑定的数据"""
+        self.batches.append([(bind.field_type, bind.values) for bind in binds])
+
+    def close(self) -> None:
+        """关闭语句"""
+        self.closed = True
+
+
+class RecordingBind:
+    """记录绑定类型的列缓冲区"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.field_type: str = ""
+        self.values: list = []
+
+    def __getattr__(self, field_type: str) -> Callable[[list], None]:
+        """timestamp/double/nchar等绑定函数"""
+        def bind(values: list) -> None:
+            self.field_type = field_type
+            self.values = values
+
+        return bind
+
+
+@pytest.fixture
+def statements(monkeypatch: pytest.MonkeyPatch) -> list[RecordingStmt]:
+    """记录创建的参数绑定写入语句"""
+    import taos
+
+    created: list[RecordingStmt] = []
+
+    def statement(self: FakeConnection, sql: str) -> RecordingStmt:
+        stmt: RecordingStmt = RecordingStmt(self.server, sql)
+        created.append(stmt)
+        return stmt
+
+    monkeypatch.setattr(FakeConnection, "statement", statement)
+    monkeypatch.setattr(taos, "new_multi_binds", lambda size: [RecordingBind() for _ in range(size)])
+    return created
+
+
+def make_bars(count: int) -> list[BarData]:
+    """生成K线数据"""
+    return [
+        BarData(
+            symbol="rb2410",
+            exchange=Exchange.SHFE,
+            interval=Interval.MINUTE,
+            datetime=START + timedelta(minutes=n),
+            volume=100.0 + n,
+            turnover=3500000.5 + n,
+            open_interest=20000.0,
+            open_price=3500.0 + n,
+            high_price=3510.25 + n,
+            low_price=3490.5 + n,
+            close_price=3505.125 + n,
+            gateway_name="DB"
+        )
+        for n in range(count)
+    ]
+
+
+def test_bar_columns(create_database: Callable[..., TaosDatabase], statements: list[RecordingStmt]) -> None:
+    """K线按表结构顺序绑定列，时间为毫秒时间戳"""
+    database: TaosDatabase = create_database(insert_mode="stmt")
+    bars: list[BarData] = make_bars(3)
+
+    database.insert_in_batch("bar_rb2410_SHFE_1m", bars)
+
+    assert len(statements) == 1
+    stmt: RecordingStmt = statements[0]
+    assert stmt.sql == "INSERT INTO bar_rb2410_SHFE_1m VALUES(?, ?, ?, ?, ?, ?, ?, ?)"
+    assert stmt.closed
+
+    assert len(stmt.batches) == 1
+    columns: list[tuple[str, list]] = stmt.batches[0]
+    assert [field_type for field_type, _ in columns] == BAR_FIELD_TYPES
+
+    start_ms: int = int(START.timestamp() * 1000)
+    assert columns[0][1] == [start_ms, start_ms + 60_000, start_ms + 120_000]
+    assert columns[1][1] == [100.0, 101.0, 102.0]
+    assert columns[2][1] == [3500000.5, 3500001.5, 3500002.5]
+    assert columns[3][1] == [20000.0] * 3
+    assert columns[4][1] == [3500.0, 3501.0, 3502.0]
+    assert columns[5][1] == [3510.25, 3511.25, 3512.25]
+    assert columns[6][1] == [3490.5, 3491.5, 3492.5]
+    assert columns[7][1] == [3505.125, 3506.125, 3507.125]
+
+
+def test_batch_size(create_database: Callable[..., TaosDatabase], statements: list[RecordingStmt]) -> None:
+    """按stmt_batch_size分批绑定"""
+    database: TaosDatabase = create_database(insert_mode="stmt", stmt_batch_size=2)
+
+    database.insert_in_batch("bar_rb2410_SHFE_1m", make_bars(5))
+
+    assert [len(batch[0][1]) for batch in statements[0].batches] == [2, 2, 1]
+
+
+def test_tick_columns(create_database: Callable[..., TaosDatabase], statements: list[RecordingStmt]) -> None:
+    """tick绑定名称列，不带localtime时使用datetime"""
+    database: TaosDatabase = create_database(insert_mode="stmt")
+
+    utc_time: datetime = datetime(2024, 1, 2, 1, 0, 0, 500000, tzinfo=timezone.utc)
+    ticks: list[TickData] = [
+        TickData(
+            symbol="rb2410",
+            exchange=Exchange.SHFE,
+            datetime=utc_time,
+            name="螺纹钢2410",
+            volume=1000.0,
+            last_price=3500.5,
+            bid_price_1=3500.0,
+            ask_volume_5=7.0,
+            localtime=None,
+            gateway_name="DB"
+        )
+    ]
+
+    database.insert_in_batch("tick_rb2410_SHFE", ticks)
+
+    columns: list[tuple[str, list]] = statements[0].batches[0]
+    assert [field_type for field_type, _ in columns] == TICK_FIELD_TYPES
+
+    values: dict[str, object] = dict(zip(
+        ["datetime", "name"] + TICK_DOUBLE_FIELDS + ["localtime"],
+        [column[1][0] for column in columns],
+        strict=True
+    ))
+    assert values["datetime"] == 1704157200500
+    assert values["localtime"] == 1704157200500
+    assert values["name"] == "螺纹钢2410"
+    assert values["volume"] == 1000.0
+    assert values["last_price"] == 3500.5
+    assert values["bid_price_1"] == 3500.0
+    assert values["ask_volume_5"] == 7.0
+    assert values["turnover"] == 0
+
+
+def test_default_sql_mode(
+    database: TaosDatabase,
+    statements: list[RecordingStmt],
+    executed: list[str]
+) -> None:
+    """未设置database.insert_mode时使用SQL字符串写入"""
+    assert database.insert_mode == "sql"
+
+    database.insert_in_batch("bar_rb2410_SHFE_1m", make_bars(3))
+
+    assert not statements
+
+    inserts: list[str] = [sql for sql in executed if sql.startswith("INSERT")]
+    assert len(inserts) == 1
+    assert inserts[0].startswith("INSERT INTO bar_rb2410_SHFE_1m VALUES (")
+    assert inserts[0].count("(") == 3
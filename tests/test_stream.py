@@ -0,0 +1,117 @@
+"""
+K线合成流：检查生成的CREATE STREAM、DROP STREAM和补算语句，以及合成结果的数据表名。
+"""
+
+from collections.abc import Callable
+from typing import Any
+from datetime import datetime
+
+import pytest
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import DB_TZ
+
+from vnpy_taos.taos_database import TaosDatabase
+from vnpy_taos.taos_stream import SOURCE_BAR, SOURCE_TICK, generate_stream_table_name
+
+
+def find(statements: list[str], prefix: str) -> list[str]:
+    """查找指定开头的语句"""
+    return [sql for sql in statements if sql.startswith(prefix)]
+
+
+def test_create_from_settings(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """按database.bar_streams创建合成流"""
+    database: TaosDatabase = create_database(bar_streams={"5m": "", "1h": "30m"})
+
+    streams: list[str] = find(executed, "CREATE STREAM")
+    assert len(streams) == 2
+
+    ddl: str = streams[0]
+    assert ddl.startswith("CREATE STREAM IF NOT EXISTS stream_bar_5m TRIGGER WINDOW_CLOSE WATERMARK 10s FILL_HISTORY 1")
+    assert "INTO s_bar_5m TAGS( symbol BINARY(20), exchange BINARY(10) )" in ddl
+    assert "SUBTABLE(CONCAT('s_bar_5m_', REPLACE(symbol, '-', '_'), '_', exchange))" in ddl
+    assert "SUM(volume) AS volume" in ddl
+    assert "FIRST(open_price) AS open_price" in ddl
+    assert "FROM s_bar WHERE interval_ = '1m' PARTITION BY symbol, exchange INTERVAL(5m)" in ddl
+
+    assert streams[1].startswith("CREATE STREAM IF NOT EXISTS stream_bar_1h ")
+    assert streams[1].endswith("INTERVAL(1h, 30m)")
+
+    assert database.streams.stream_names == {"stream_bar_5m", "stream_bar_1h"}
+
+
+def test_invalid_stream(database: TaosDatabase, executed: list[str]) -> None:
+    """不支持由tick数据创建合成流，时间窗口格式错误时不执行语句"""
+    with pytest.raises(ValueError):
+        database.streams.create_stream(SOURCE_TICK, "1m")
+
+    with pytest.raises(ValueError):
+        database.streams.create_stream(SOURCE_BAR, "5min")
+
+    with pytest.raises(ValueError):
+        database.streams.backfill(SOURCE_TICK, "1m", datetime(2024, 1, 2), datetime(2024, 1, 3))
+
+    assert not find(executed, "CREATE STREAM")
+
+
+def test_drop_stream(database: TaosDatabase, executed: list[str]) -> None:
+    """删除合成流及输出的超级表"""
+    database.streams.create_stream(SOURCE_BAR, "5m", fill_history=False, watermark="1m")
+    assert "FILL_HISTORY 0" in find(executed, "CREATE STREAM")[0]
+    assert "WATERMARK 1m" in find(executed, "CREATE STREAM")[0]
+
+    database.streams.drop_stream(SOURCE_BAR, "5m", drop_table=True)
+
+    assert find(executed, "DROP") == ["DROP STREAM IF EXISTS stream_bar_5m", "DROP STABLE IF EXISTS s_bar_5m"]
+    assert not database.streams.stream_names
+
+
+def test_table_name() -> None:
+    """合成结果的子表名与K线数据表名相同地替换合约代码中的特殊字符"""
+    assert generate_stream_table_name("s_bar_5m", "rb-2410", Exchange.SHFE) == "s_bar_5m_rb_2410_SHFE"
+
+
+def test_backfill(database: TaosDatabase, executed: list[str]) -> None:
+    """补算语句写入与流计算相同的子表"""
+    start: datetime = datetime(2024, 1, 2, tzinfo=DB_TZ)
+    end: datetime = datetime(2024, 1, 3, tzinfo=DB_TZ)
+
+    count: int = database.streams.backfill(SOURCE_BAR, "5m", start, end, vt_symbols=["rb-2410.SHFE"])
+    assert count == 1
+
+    inserts: list[str] = find(executed, "INSERT INTO s_bar_5m_rb_2410_SHFE USING s_bar_5m TAGS('rb-2410', 'SHFE')")
+    assert len(inserts) == 1
+    assert "FROM bar_rb_2410_SHFE_1m" in inserts[0]
+    assert "INTERVAL(5m)" in inserts[0]
+
+
+def test_load_from_stream(create_database: Callable[..., TaosDatabase], executed: list[str]) -> None:
+    """没有对应周期的K线数据表时读取合成结果"""
+    database: TaosDatabase = create_database(bar_streams={"1h": ""})
+
+    start: datetime = datetime(2024, 1, 2, tzinfo=DB_TZ)
+    end: datetime = datetime(2024, 1, 3, tzinfo=DB_TZ)
+    database.load_bar_data("rb-2410", Exchange.SHFE, Interval.HOUR, start, end)
+
+    assert find(executed, "SELECT datetime, volume, turnover, open_interest, open_price, high_price, low_price, close_price FROM s_bar_1h_rb_2410_SHFE ")
+
+
+def test_pooled_connection(database: TaosDatabase, monkeypatch: pytest.MonkeyPatch) -> None:
+    """合成流管理操作从连接池借出连接，不使用默认连接"""
+    def fail(sql: str, *args: Any) -> None:
+        raise AssertionError(f"使用了默认连接：{sql}")
+
+    monkeypatch.setattr(database.default_cursor, "execute", fail)
+
+    start: datetime = datetime(2024, 1, 2, tzinfo=DB_TZ)
+    end: datetime = datetime(2024, 1, 3, tzinfo=DB_TZ)
+
+    database.streams.create_stream(SOURCE_BAR, "5m")
+    database.streams.list_streams()
+    database.streams.backfill(SOURCE_BAR, "5m", start, end)
+    database.streams.drop_stream(SOURCE_BAR, "5m", drop_table=True)
+
+    # 连接已归还连接池
+    assert database.pool.get_connection() is None
+    assert database.pool.idle
@@ -0,0 +1,59 @@
+"""
+tick合成K线：以区间开始前的最后一条tick作为成交量增量的基准，区间从数据表的第一条tick开始时单独加入该tick。
+"""
+
+from datetime import datetime
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import TickData
+
+from benchmark.data import generate_tick_table, generate_ticks
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_database import TaosDatabase, generate_timestamp
+
+
+def generate_sql(database: TaosDatabase, start: datetime, end: datetime) -> str:
+    """生成1分钟窗口的合成语句，去除多余的空白"""
+    sql: str = database.generate_tick_bar_sql("rb2410", Exchange.SHFE, "1m", start, end, "")
+    return " ".join(sql.split())
+
+
+def test_first_tick_included(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """区间之前没有tick时，第一条tick以累计值作为增量，与DIFF的结果合并后按时间排序"""
+    ticks: list[TickData] = generate_ticks(1000)
+    fake_server.add_table(generate_tick_table(ticks))
+
+    sql: str = generate_sql(database, datetime(2024, 1, 2), datetime(2024, 1, 2, 10))
+    first_ms: int = generate_timestamp(ticks[0].datetime)
+
+    assert (
+        "SELECT datetime, volume, turnover, open_interest, last_price, "
+        "volume AS volume_delta, turnover AS turnover_delta "
+        f"FROM tick_rb2410_SHFE WHERE datetime = {first_ms} UNION ALL"
+    ) in sql
+    assert "DIFF(volume) AS volume_delta" in sql
+    assert "WHERE datetime >= '2024-01-02 00:00:00' AND datetime <= '2024-01-02 10:00:00' ORDER BY datetime )" in sql
+    assert sql.endswith("INTERVAL(1m)")
+
+
+def test_baseline_tick(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """区间之前有tick时以最后一条作为基准，不单独加入第一条tick"""
+    ticks: list[TickData] = generate_ticks(1000)
+    fake_server.add_table(generate_tick_table(ticks))
+
+    start: datetime = datetime(2024, 1, 2, 9, 1, tzinfo=DB_TZ)
+    sql: str = generate_sql(database, start, datetime(2024, 1, 2, 10, tzinfo=DB_TZ))
+
+    # 09:01:00前的最后一条tick为第119条（间隔500毫秒）
+    assert f"WHERE datetime >= {generate_timestamp(ticks[119].datetime)} AND datetime <=" in sql
+    assert "UNION ALL" not in sql
+
+
+def test_empty_range(database: TaosDatabase, fake_server: FakeServer) -> None:
+    """区间内没有tick时只生成DIFF查询"""
+    fake_server.add_table(generate_tick_table(generate_ticks(10)))
+
+    sql: str = generate_sql(database, datetime(2024, 1, 3), datetime(2024, 1, 3, 10))
+    assert "UNION ALL" not in sql
+    assert "DIFF(volume)" in sql
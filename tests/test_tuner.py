@@ -0,0 +1,140 @@
+"""
+写入语句的字节预算：超长错误的识别、多表写入语句的拆分，以及被拒绝后拆分重试和断线时不拆分。
+"""
+
+from collections.abc import Callable
+
+import pytest
+
+from benchmark.fake_taos import FakeServer
+from vnpy_taos.taos_database import INSERT_PREFIX, TaosDatabase, split_segments
+from vnpy_taos.taos_tuner import MIN_BUDGET, SQL_TOO_LONG_ERRNO, is_sql_too_long
+
+
+# TSDB_CODE_TSC_DISCONNECTED
+DISCONNECTED_ERRNO: int = 0x0213
+
+# 错误码的高位标志，taospy中的错误码为有符号整数
+ERRNO_FLAG: int = -0x80000000
+
+# 每行值的长度（字节）
+VALUE: str = "(1704157200000, 1.0)"
+
+
+class TaosError(Exception):
+    """带有错误码的数据库错误"""
+
+    def __init__(self, msg: str, errno: int) -> None:
+        """构造函数"""
+        super().__init__(msg)
+        self.errno: int = errno
+
+
+def generate_segments(counts: list[int]) -> list[tuple[str, list[str]]]:
+    """生成各数据表指定行数的写入段"""
+    return [(f"t{i} VALUES", [VALUE] * count) for i, count in enumerate(counts)]
+
+
+def count_values(sql: str) -> int:
+    """统计语句中写入的行数"""
+    return sql.count(VALUE)
+
+
+def reject_over(fake_server: FakeServer, monkeypatch: pytest.MonkeyPatch, limit: int, errno: int) -> list[str]:
+    """超过limit字节的写入语句按errno报错，返回执行成功的写入语句"""
+    executed: list[str] = []
+    execute: Callable = fake_server.execute
+
+    def check(sql: str) -> tuple[list[tuple], list[str]]:
+        if sql.startswith(INSERT_PREFIX):
+            if len(sql.encode()) > limit:
+                raise TaosError("SQL statement too long", ERRNO_FLAG | errno)
+            executed.append(sql)
+
+        result: tuple[list[tuple], list[str]] = execute(sql)
+        return result
+
+    monkeypatch.setattr(fake_server, "execute", check)
+    return executed
+
+
+def test_is_sql_too_long() -> None:
+    """带错误码时只按错误码判断，没有错误码时按错误信息判断"""
+    assert is_sql_too_long(TaosError("SQL statement too long", ERRNO_FLAG | SQL_TOO_LONG_ERRNO))
+    assert is_sql_too_long(TaosError("", SQL_TOO_LONG_ERRNO))
+    assert is_sql_too_long(Exception("SQL statement too long, check maxSQLLength config"))
+
+    assert not is_sql_too_long(TaosError("Disconnected from service", ERRNO_FLAG | DISCONNECTED_ERRNO))
+    assert not is_sql_too_long(TaosError("message too long", ERRNO_FLAG | DISCONNECTED_ERRNO))
+    assert not is_sql_too_long(Exception("Disconnected from service"))
+
+
+def test_split_segments() -> None:
+    """按行数拆分，跨越数据表边界时拆开该表的值，各部分保持原有顺序"""
+    segments: list[tuple[str, list[str]]] = [("a VALUES", ["1", "2"]), ("b VALUES", ["3", "4", "5"]), ("c VALUES", ["6"])]
+
+    first, second = split_segments(segments, 3)
+    assert first == [("a VALUES", ["1", "2"]), ("b VALUES", ["3"])]
+    assert second == [("b VALUES", ["4", "5"]), ("c VALUES", ["6"])]
+
+    # 正好在数据表边界拆分
+    first, second = split_segments(segments, 2)
+    assert first == [("a VALUES", ["1", "2"])]
+    assert second == [("b VALUES", ["3", "4", "5"]), ("c VALUES", ["6"])]
+
+    first, second = split_segments(segments, 6)
+    assert first == segments
+    assert second == []
+
+
+def test_split_retry(
+    database: TaosDatabase,
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """语句被拒绝时拆分为两半重试，全部行按顺序写入，并降低单条语句上限"""
+    limit: int = MIN_BUDGET * 3
+    executed: list[str] = reject_over(fake_server, monkeypatch, limit, SQL_TOO_LONG_ERRNO)
+    max_bytes: int = database.batch_tuner.max_bytes
+
+    counts: list[int] = [1500, 2000, 500]
+    database.execute_segments(generate_segments(counts))
+
+    assert len(executed) > 1
+    assert all(len(sql.encode()) <= limit for sql in executed)
+    assert sum(count_values(sql) for sql in executed) == sum(counts)
+
+    # 各数据表的值按原顺序出现
+    heads: list[str] = [head for sql in executed for head in ("t0", "t1", "t2") if f" {head} VALUES" in sql]
+    assert heads == sorted(heads)
+
+    assert MIN_BUDGET <= database.batch_tuner.max_bytes < max_bytes
+    assert database.batch_tuner.budget <= database.batch_tuner.max_bytes
+
+
+def test_disconnect_not_split(
+    database: TaosDatabase,
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """断线错误直接抛出，不拆分语句也不降低上限"""
+    executed: list[str] = reject_over(fake_server, monkeypatch, 0, DISCONNECTED_ERRNO)
+    max_bytes: int = database.batch_tuner.max_bytes
+
+    with pytest.raises(TaosError):
+        database.execute_segments(generate_segments([100, 100]))
+
+    assert executed == []
+    assert database.batch_tuner.max_bytes == max_bytes
+
+
+def test_single_row_not_split(
+    database: TaosDatabase,
+    fake_server: FakeServer,
+    monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """只有一行时无法拆分，直接抛出超长错误"""
+    reject_over(fake_server, monkeypatch, 0, SQL_TOO_LONG_ERRNO)
+
+    with pytest.raises(TaosError):
+        database.execute_segments(generate_segments([1]))
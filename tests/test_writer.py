@@ -0,0 +1,217 @@
+"""
+tick数据后台写入器：队列满时的处理策略、重试和溢出数据的写入顺序，以及流式写入的汇总信息。
+"""
+
+import pickle
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from vnpy.trader.constant import Exchange
+from vnpy.trader.database import DB_TZ
+from vnpy.trader.object import TickData
+
+from benchmark.data import generate_tick_table
+from benchmark.fake_taos import FakeServer
+from vnpy_taos import taos_writer
+from vnpy_taos.taos_database import TaosDatabase
+from vnpy_taos.taos_writer import POLICY_BLOCK, POLICY_SPILL, TickWriter
+
+
+START: datetime = datetime(2024, 1, 2, 9, tzinfo=DB_TZ)
+
+
+class FakeDatabase:
+    """记录每次写入的数据和是否流式写入，可以指定失败次数"""
+
+    def __init__(self, failures: int = 0) -> None:
+        """构造函数"""
+        self.failures: int = failures
+        self.calls: list[tuple[list[TickData], bool]] = []
+
+    def save_tick_data_many(self, ticks: list[TickData], stream: bool = False) -> bool:
+        """保存tick数据"""
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+
+        self.calls.append((ticks, stream))
+        return True
+
+    @property
+    def ticks(self) -> list[TickData]:
+        """按写入顺序排列的全部数据"""
+        return [tick for ticks, _ in self.calls for tick in ticks]
+
+
+def make_ticks(count: int, start: datetime = START) -> list[TickData]:
+    """生成tick数据"""
+    return [
+        TickData(
+            symbol="rb2410",
+            exchange=Exchange.SHFE,
+            datetime=start + timedelta(seconds=n),
+            name="rb2410",
+            volume=float(n),
+            last_price=3500.0 + n,
+            localtime=(start + timedelta(seconds=n)).replace(tzinfo=None),
+            gateway_name="DB"
+        )
+        for n in range(count)
+    ]
+
+
+def test_block_before_start() -> None:
+    """block策略下写入器未运行时队列满则报错，而不是继续增长"""
+    writer: TickWriter = TickWriter(FakeDatabase(), max_size=2, policy=POLICY_BLOCK)  # type: ignore
+
+    ticks: list[TickData] = make_ticks(3)
+    writer.put(ticks[0])
+    writer.put(ticks[1])
+
+    with pytest.raises(RuntimeError):
+        writer.put(ticks[2])
+
+    assert len(writer.queue) == 2
+
+
+def test_retry_recounts() -> None:
+    """写入失败的数据放回队列，重试时使用非流式写入重新统计数据量"""
+    database: FakeDatabase = FakeDatabase(failures=1)
+    writer: TickWriter = TickWriter(database, batch_size=2)     # type: ignore
+
+    ticks: list[TickData] = make_ticks(4)
+    for tick in ticks:
+        writer.put(tick)
+
+    assert not writer.flush()
+    assert writer.flush()
+    assert writer.flush()
+
+    assert database.ticks == ticks
+    assert [stream for _, stream in database.calls] == [False, True]
+
+
+def test_spill_order(tmp_path: Path) -> None:
+    """溢出文件中的数据在队列之后、更新的数据之前写入"""
+    database: FakeDatabase = FakeDatabase()
+    writer: TickWriter = TickWriter(
+        database,                                               # type: ignore
+        max_size=2,
+        batch_size=2,
+        policy=POLICY_SPILL,
+        spill_path=str(tmp_path.joinpath("spill.pkl"))
+    )
+
+    ticks: list[TickData] = make_ticks(6)
+
+    # 队列满后的数据写入溢出文件，溢出未补写前即使队列有空间也继续溢出
+    for tick in ticks[:3]:
+        writer.put(tick)
+    assert writer.flush()
+    for tick in ticks[3:]:
+        writer.put(tick)
+
+    assert writer.rows_spilled == 4
+    assert not writer.queue
+
+    writer.replay_spill()
+
+    assert [tick.datetime for tick in database.ticks] == [tick.datetime for tick in ticks]
+    assert all(not stream for _, stream in database.calls[1:])
+    assert not list(tmp_path.iterdir())
+
+    # 补写完成后恢复使用队列
+    assert writer.put(make_ticks(1, START + timedelta(minutes=1))[0])
+
+
+def test_stream_overview_monotonic(
+    create_database: Callable[..., TaosDatabase],
+    fake_server: FakeServer,
+    executed: list[str]
+) -> None:
+    """流式写入较早的数据时汇总信息的结束时间不回退"""
+    ticks: list[TickData] = make_ticks(10)
+    fake_server.add_table(generate_tick_table(ticks))
+
+    database: TaosDatabase = create_database()
+    database.save_tick_data_many(ticks[2:5], stream=True)
+
+    tags: list[str] = [sql for sql in executed if "SET TAG" in sql]
+    assert f"SET TAG start_time='{ticks[0].datetime}'" in tags[0]
+    assert f"SET TAG end_time='{ticks[-1].datetime}'" in tags[1]
+
+
+def test_stop_saves_remaining(tmp_path: Path) -> None:
+    """停止时数据库无法写入，队列和溢出文件中的数据按顺序保存，下次启动时先于新数据补写"""
+    spill_path: Path = tmp_path.joinpath("spill.pkl")
+    ticks: list[TickData] = make_ticks(6)
+
+    failing: FakeDatabase = FakeDatabase(failures=1000)
+    writer: TickWriter = TickWriter(
+        failing,                                                # type: ignore
+        max_size=3,
+        batch_size=100,
+        flush_interval=10_000,
+        policy=POLICY_SPILL,
+        spill_path=str(spill_path)
+    )
+    writer.start()
+    for tick in ticks[:5]:
+        writer.put(tick)
+    writer.stop()
+
+    assert not failing.calls
+    assert not writer.queue
+    assert [path.name for path in tmp_path.iterdir()] == [f"spill.pkl.{writer.replay_index}"]
+
+    # 新的写入器启动时补写遗留数据，之后放入的数据排在后面
+    database: FakeDatabase = FakeDatabase()
+    writer = TickWriter(database, policy=POLICY_SPILL, spill_path=str(spill_path))   # type: ignore
+    writer.start()
+    writer.put(ticks[5])
+    writer.stop()
+
+    assert [tick.datetime for tick in database.ticks] == [tick.datetime for tick in ticks]
+    assert not database.calls[0][1]
+    assert not list(tmp_path.iterdir())
+
+
+def test_start_replays_crash_files(tmp_path: Path) -> None:
+    """启动时按编号顺序补写崩溃遗留的溢出文件，未转移的溢出文件最后补写"""
+    spill_path: Path = tmp_path.joinpath("spill.pkl")
+    ticks: list[TickData] = make_ticks(6)
+
+    for path, part in [
+        (tmp_path.joinpath("spill.pkl.10"), ticks[2:4]),
+        (tmp_path.joinpath("spill.pkl.2"), ticks[:2]),
+        (spill_path, ticks[4:5]),
+    ]:
+        with open(path, "wb") as f:
+            for tick in part:
+                pickle.dump(tick, f)
+
+    database: FakeDatabase = FakeDatabase()
+    writer: TickWriter = TickWriter(database, policy=POLICY_BLOCK, spill_path=str(spill_path))  # type: ignore
+
+    writer.put(ticks[5])
+    writer.start()
+    writer.stop()
+
+    assert [tick.datetime for tick in database.ticks] == [tick.datetime for tick in ticks]
+    assert not list(tmp_path.iterdir())
+
+
+def test_error_logged(monkeypatch: pytest.MonkeyPatch) -> None:
+    """后台线程中的写入错误输出到vnpy日志"""
+    messages: list[str] = []
+    monkeypatch.setattr(taos_writer.logger, "bind", lambda **kwargs: SimpleNamespace(error=messages.append))
+
+    writer: TickWriter = TickWriter(FakeDatabase(failures=1))      # type: ignore
+    writer.put(make_ticks(1)[0])
+
+    assert not writer.flush()
+    assert messages == ["tick数据写入失败: database unavailable"]
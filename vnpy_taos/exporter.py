@@ -0,0 +1,361 @@
+"""
+K线和tick数据批量导出工具，从s_bar/s_tick超级表枚举数据表后多线程按时间窗口分块读取，写入按日期分区的Parquet文件。
+
+输出目录结构为bar/symbol=<symbol>/exchange=<exchange>/interval=<interval>/date=<YYYY-MM-DD>/data.parquet
+（tick数据没有interval一级），目录下的manifest.json记录各数据表导出的行数，可与count_标签核对。
+
+python -m vnpy_taos.exporter ./export --pattern "rb*.SHFE" --start 2024-01-01 --end 2024-12-31
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from vnpy.trader.database import DB_TZ
+
+from .taos_database import (
+    BAR_ARRAY_FIELDS,
+    TICK_QUERY_FIELDS,
+    TIMESTAMP_FIELDS,
+    TaosDatabase,
+    generate_timestamp,
+)
+from .taos_progress import Progress
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+
+# 数据类型
+KIND_BAR: str = "bar"
+KIND_TICK: str = "tick"
+
+# 清单文件名
+MANIFEST_NAME: str = "manifest.json"
+
+# 分区中的数据文件名
+FILE_NAME: str = "data.parquet"
+
+
+@dataclass
+class ExportTask:
+    """单个数据表的导出任务"""
+
+    kind: str
+    table_name: str
+    symbol: str
+    exchange: str
+    interval: str
+    start: date
+    end: date
+    count: int
+
+    # 导出区间是否覆盖数据表的全部数据，只有覆盖时导出行数才能与count_标签核对
+    complete: bool
+
+    @property
+    def fields(self) -> list[str]:
+        """导出的字段"""
+        return BAR_ARRAY_FIELDS if self.kind == KIND_BAR else TICK_QUERY_FIELDS
+
+    def get_folder(self, day: date) -> Path:
+        """分区目录（相对于导出目录）"""
+        folder: Path = Path(self.kind, f"symbol={self.symbol}", f"exchange={self.exchange}")
+        if self.kind == KIND_BAR:
+            folder = folder.joinpath(f"interval={self.interval}")
+
+        return folder.joinpath(f"date={day.isoformat()}")
+
+
+def convert_date(dt: datetime) -> date:
+    """将数据库返回的时间转换为数据库时区的日期"""
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=DB_TZ)
+
+    return dt.astimezone(DB_TZ).date()
+
+
+def list_tasks(
+    database: TaosDatabase,
+    kinds: list[str],
+    pattern: str = "*",
+    interval: str = "",
+    start: date | None = None,
+    end: date | None = None
+) -> list[ExportTask]:
+    """从超级表标签枚举需要导出的数据表，按本地代码（symbol.exchange）匹配pattern"""
+    # 延迟模式下先写入未完成的汇总信息，保证标签中的数据范围和条数最新
+    database.flush_overview()
+
+    rows: list[tuple] = []
+
+    with database.pool.connection():
+        if KIND_BAR in kinds:
+            database.cursor.execute(
+                "SELECT TAGS tbname, symbol, exchange, interval_, start_time, end_time, count_ FROM s_bar"
+            )
+            rows.extend((KIND_BAR, *row) for row in database.cursor.fetchall())
+
+        if KIND_TICK in kinds:
+            database.cursor.execute("SELECT TAGS tbname, symbol, exchange, start_time, end_time, count_ FROM s_tick")
+            rows.extend((KIND_TICK, row[0], row[1], row[2], "", *row[3:]) for row in database.cursor.fetchall())
+
+    tasks: list[ExportTask] = []
+
+    for kind, table_name, symbol, exchange, table_interval, start_time, end_time, count in rows:
+        if not fnmatch(f"{symbol}.{exchange}", pattern):
+            continue
+
+        if interval and table_interval != interval:
+            continue
+
+        # 没有数据的数据表
+        if not start_time or not end_time or not count:
+            continue
+
+        table_start: date = convert_date(start_time)
+        table_end: date = convert_date(end_time)
+
+        export_start: date = max(table_start, start) if start else table_start
+        export_end: date = min(table_end, end) if end else table_end
+        if export_start > export_end:
+            continue
+
+        tasks.append(ExportTask(
+            kind=kind,
+            table_name=table_name,
+            symbol=symbol,
+            exchange=exchange,
+            interval=table_interval,
+            start=export_start,
+            end=export_end,
+            count=int(count),
+            complete=export_start == table_start and export_end == table_end
+        ))
+
+    return tasks
+
+
+def write_parquet(path: Path, arrays: dict[str, np.ndarray], fields: list[str]) -> None:
+    """写入Parquet文件（先写临时文件再替换，避免中断时留下不完整的文件）"""
+    columns: dict[str, pa.Array] = {}
+
+    for field in fields:
+        if field in TIMESTAMP_FIELDS:
+            columns[field] = pa.array(arrays[field], type=pa.timestamp("ms", tz=str(DB_TZ)))
+        else:
+            columns[field] = pa.array(arrays[field])
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    temp_path: Path = path.with_suffix(".tmp")
+    pq.write_table(pa.table(columns), temp_path)
+    os.replace(temp_path, path)
+
+
+def export_task(
+    database: TaosDatabase,
+    task: ExportTask,
+    folder: Path,
+    window_days: int,
+    progress: Progress
+) -> dict[str, int]:
+    """按时间窗口分块导出单个数据表，每个窗口内按日期拆分写入，返回各文件的行数"""
+    files: dict[str, int] = {}
+    day: date = task.start
+
+    # 整个导出过程使用同一个连接
+    with database.pool.connection():
+        while day <= task.end:
+            window_end: date = min(day + timedelta(days=window_days), task.end + timedelta(days=1))
+
+            days: list[date] = [day + timedelta(days=n) for n in range((window_end - day).days)]
+            bounds: list[int] = [
+                generate_timestamp(datetime.combine(d, time(), tzinfo=DB_TZ)) for d in days + [window_end]
+            ]
+
+            arrays: dict[str, np.ndarray] = database.fetch_arrays(task.table_name, task.fields, bounds[0], bounds[-1])
+
+            # 数据按时间排序，按各日期的起始时间拆分
+            positions: np.ndarray = np.searchsorted(arrays["datetime"], bounds)
+
+            for i, d in enumerate(days):
+                a: int = int(positions[i])
+                b: int = int(positions[i + 1])
+                if a == b:
+                    continue
+
+                path: Path = task.get_folder(d).joinpath(FILE_NAME)
+                write_parquet(
+                    folder.joinpath(path),
+                    {field: array[a:b] for field, array in arrays.items()},
+                    task.fields
+                )
+
+                files[path.as_posix()] = b - a
+                progress.add_rows(b - a)
+
+            day = window_end
+
+    progress.add_table()
+    return files
+
+
+def export_parquet(
+    database: TaosDatabase,
+    folder: Path,
+    kinds: list[str] | None = None,
+    pattern: str = "*",
+    interval: str = "",
+    start: date | None = None,
+    end: date | None = None,
+    workers: int = 0,
+    window_days: int = 7,
+    report_interval: float = 0
+) -> dict[str, Any]:
+    """并行导出数据表为按日期分区的Parquet文件，更新并返回清单，report_interval大于0时定时输出进度"""
+    if pa is None:
+        raise ImportError('导出Parquet文件需要安装pyarrow：pip install "vnpy_taos[arrow]"')
+
+    tasks: list[ExportTask] = list_tasks(database, kinds or [KIND_BAR, KIND_TICK], pattern, interval, start, end)
+
+    manifest: dict[str, Any] = load_manifest(folder)
+    progress: Progress = Progress()
+    failed: list[str] = []
+
+    with ThreadPoolExecutor(max_workers=workers or database.pool.size, thread_name_prefix="TaosExporter") as executor:
+        futures: dict[Future, ExportTask] = {
+            executor.submit(export_task, database, task, folder, window_days, progress): task
+            for task in tasks
+        }
+
+        pending: set[Future] = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=report_interval or None, return_when=FIRST_EXCEPTION)
+
+            for future in done:
+                task: ExportTask = futures[future]
+
+                e: BaseException | None = future.exception()
+                if e:
+                    failed.append(task.table_name)
+                    print(f"{task.table_name}导出失败：{e!r}")
+                    continue
+
+                files: dict[str, int] = future.result()
+                manifest["tables"][task.table_name] = {
+                    "kind": task.kind,
+                    "symbol": task.symbol,
+                    "exchange": task.exchange,
+                    "interval": task.interval,
+                    "start": task.start.isoformat(),
+                    "end": task.end.isoformat(),
+                    "complete": task.complete,
+                    "count_": task.count,
+                    "rows": sum(files.values()),
+                    "files": files,
+                }
+
+            if report_interval:
+                print(progress.report(len(tasks)))
+
+    manifest["failed"] = failed
+    save_manifest(folder, manifest)
+
+    return manifest
+
+
+def load_manifest(folder: Path) -> dict[str, Any]:
+    """读取导出目录中的清单，不存在时返回空清单"""
+    path: Path = folder.joinpath(MANIFEST_NAME)
+    if not path.exists():
+        return {"tables": {}, "failed": []}
+
+    with open(path, encoding="UTF-8") as f:
+        manifest: dict[str, Any] = json.load(f)
+    return manifest
+
+
+def save_manifest(folder: Path, manifest: dict[str, Any]) -> None:
+    """写入清单"""
+    folder.mkdir(parents=True, exist_ok=True)
+    manifest["time"] = datetime.now().isoformat()
+
+    with open(folder.joinpath(MANIFEST_NAME), mode="w", encoding="UTF-8") as f:
+        json.dump(manifest, f, indent=4, ensure_ascii=False)
+
+
+def check_manifest(manifest: dict[str, Any]) -> list[str]:
+    """核对完整导出的数据表行数与count_标签，返回不一致的数据表"""
+    mismatches: list[str] = []
+
+    for table_name, entry in manifest["tables"].items():
+        if entry["complete"] and entry["rows"] != entry["count_"]:
+            mismatches.append(f"{table_name}: count_ {entry['count_']} -> rows {entry['rows']}")
+
+    return mismatches
+
+
+def parse_args() -> Namespace:
+    """解析命令行参数"""
+    parser: ArgumentParser = ArgumentParser(description="vnpy_taos数据批量导出为Parquet")
+    parser.add_argument("folder", type=Path, help="导出目录")
+    parser.add_argument("--kind", choices=[KIND_BAR, KIND_TICK, "all"], default="all", help="导出的数据类型")
+    parser.add_argument("--pattern", default="*", help="本地代码（symbol.exchange）匹配模式，如rb*.SHFE")
+    parser.add_argument("--interval", default="", help="只导出该周期的K线")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="起始日期（YYYY-MM-DD）")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="结束日期（YYYY-MM-DD，包含当日）")
+    parser.add_argument("--workers", type=int, default=0, help="并行读取的线程数（默认为连接池大小）")
+    parser.add_argument("--window-days", type=int, default=7, help="每次查询的天数")
+    parser.add_argument("--report", type=float, default=10, help="进度输出间隔（秒）")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """主函数"""
+    args: Namespace = parse_args()
+
+    kinds: list[str] = [KIND_BAR, KIND_TICK] if args.kind == "all" else [args.kind]
+
+    database: TaosDatabase = TaosDatabase()
+
+    try:
+        manifest: dict[str, Any] = export_parquet(
+            database,
+            args.folder,
+            kinds,
+            args.pattern,
+            args.interval,
+            args.start,
+            args.end,
+            args.workers,
+            args.window_days,
+            args.report
+        )
+    finally:
+        database.close()
+
+    mismatches: list[str] = check_manifest(manifest)
+    for mismatch in mismatches:
+        print(f"行数与count_标签不一致：{mismatch}")
+
+    if manifest["failed"] or mismatches:
+        sys.exit(1)
+
+    print(f"导出完成，清单已保存到{args.folder.joinpath(MANIFEST_NAME)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+历史K线批量导入工具，扫描目录中的CSV/Parquet文件，按文件名映射到K线数据表后多线程分块写入。
+
+文件名格式为<symbol>_<exchange>_<interval>[_<任意后缀>]，如rb2410_SHFE_1m.csv、rb2410_SHFE_1m_2015.parquet，
+同一数据表的多个文件按文件名顺序依次写入。文件中的列名与BarData字段一致，需要包含datetime列。
+
+python -m vnpy_taos.importer ./data --workers 8
+"""
+
+import json
+import os
+import sys
+from argparse import ArgumentParser, Namespace
+from collections.abc import Iterator
+from concurrent.futures import FIRST_EXCEPTION, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from time import monotonic
+from typing import Any
+
+import pandas as pd
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+from vnpy.trader.setting import SETTINGS
+
+from .taos_batch import convert_ms
+from .taos_database import TaosDatabase, generate_bar_table_name, generate_timestamp
+from .taos_progress import Progress
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+
+# 支持的文件类型
+CSV_SUFFIXES: tuple[str, ...] = (".csv", ".csv.gz")
+PARQUET_SUFFIXES: tuple[str, ...] = (".parquet",)
+
+# 默认的断点文件名（位于导入目录下）
+CHECKPOINT_NAME: str = ".taos_import_checkpoint.json"
+
+EXCHANGE_VALUES: set[str] = {exchange.value for exchange in Exchange}
+# K线周期（tick数据不能写入K线数据表）
+INTERVAL_VALUES: list[str] = [interval.value for interval in Interval if interval != Interval.TICK]
+
+
+@dataclass
+class ImportTask:
+    """单个数据表的导入任务"""
+
+    symbol: str
+    exchange: Exchange
+    interval: Interval
+    files: list[Path] = field(default_factory=list)
+
+    @property
+    def table_name(self) -> str:
+        """数据表名"""
+        return generate_bar_table_name(self.symbol, self.exchange, self.interval)
+
+
+class Checkpoint:
+    """
+    导入进度断点，记录各文件已写入的行数和各数据表已写入数据的时间范围。
+
+    数据块写入后只在距上次保存超过save_interval秒时写入断点文件，文件和数据表完成时立即写入。
+    中断后最多重复写入save_interval秒内的数据块，相同时间戳的数据会被覆盖。
+    """
+
+    def __init__(self, path: Path, save_interval: float = 10) -> None:
+        """构造函数，文件存在时加载已有进度"""
+        self.path: Path = path
+        self.save_interval: float = save_interval
+        self.lock: Lock = Lock()
+        self.save_time: float = monotonic()
+
+        self.files: dict[str, dict[str, Any]] = {}
+        self.tables: dict[str, dict[str, Any]] = {}
+
+        if path.exists():
+            with open(path, encoding="UTF-8") as f:
+                data: dict = json.load(f)
+
+            self.files = data["files"]
+            self.tables = data["tables"]
+
+    def get_rows(self, path: Path) -> int | None:
+        """查询文件已写入的行数，文件已全部写入时返回None，文件内容变化时从头写入"""
+        with self.lock:
+            state: dict[str, Any] | None = self.files.get(str(path))
+
+        stat: os.stat_result = path.stat()
+        if not state or state["size"] != stat.st_size or state["mtime"] != stat.st_mtime:
+            return 0
+
+        if state["done"]:
+            return None
+
+        rows: int = state["rows"]
+        return rows
+
+    def add_rows(self, path: Path, table_name: str, rows: int, start: datetime, end: datetime) -> None:
+        """记录一个数据块写入完成"""
+        start_ms: int = generate_timestamp(start)
+        end_ms: int = generate_timestamp(end)
+
+        with self.lock:
+            file_state: dict[str, Any] | None = self.files.get(str(path))
+            stat: os.stat_result = path.stat()
+
+            if not file_state or file_state["size"] != stat.st_size or file_state["mtime"] != stat.st_mtime:
+                file_state = {"size": stat.st_size, "mtime": stat.st_mtime, "rows": 0, "done": False}
+                self.files[str(path)] = file_state
+
+            file_state["rows"] += rows
+
+            # 数据表有新写入的数据时需要重新更新汇总信息
+            table_state: dict[str, Any] | None = self.tables.get(table_name)
+            if not table_state:
+                table_state = {"start": start_ms, "end": end_ms, "rows": 0, "done": False}
+                self.tables[table_name] = table_state
+
+            table_state["start"] = min(table_state["start"], start_ms)
+            table_state["end"] = max(table_state["end"], end_ms)
+            table_state["rows"] += rows
+            table_state["done"] = False
+
+            if monotonic() - self.save_time >= self.save_interval:
+                self.save()
+
+    def finish_file(self, path: Path) -> None:
+        """记录文件全部写入完成"""
+        with self.lock:
+            state: dict[str, Any] | None = self.files.get(str(path))
+
+            # 空文件没有写入任何数据块
+            if not state:
+                stat: os.stat_result = path.stat()
+                state = {"size": stat.st_size, "mtime": stat.st_mtime, "rows": 0}
+                self.files[str(path)] = state
+
+            state["done"] = True
+            self.save()
+
+    def get_range(self, table_name: str) -> tuple[datetime, datetime, int] | None:
+        """查询数据表需要更新汇总信息的时间范围和写入行数，无需更新时返回None"""
+        with self.lock:
+            state: dict[str, Any] | None = self.tables.get(table_name)
+
+        if not state or state["done"]:
+            return None
+
+        return convert_ms(state["start"]), convert_ms(state["end"]), state["rows"]
+
+    def finish_table(self, table_name: str) -> None:
+        """记录数据表汇总信息更新完成"""
+        with self.lock:
+            self.tables[table_name]["done"] = True
+            self.save()
+
+    def save(self) -> None:
+        """写入断点文件（先写临时文件再替换，避免中断时文件损坏），需要在持有锁时调用"""
+        temp_path: Path = self.path.with_suffix(".tmp")
+
+        with open(temp_path, mode="w", encoding="UTF-8") as f:
+            json.dump({"files": self.files, "tables": self.tables}, f)
+
+        os.replace(temp_path, self.path)
+        self.save_time = monotonic()
+
+
+def parse_file_name(
+    path: Path,
+    exchange: Exchange | None = None,
+    interval: Interval | None = None
+) -> tuple[str, Exchange, Interval] | None:
+    """从文件名解析合约代码、交易所和K线周期，文件名中没有时使用传入的默认值"""
+    stem: str = path.name
+    for suffix in CSV_SUFFIXES + PARQUET_SUFFIXES:
+        if stem.endswith(suffix):
+            stem = stem[:-len(suffix)]
+            break
+
+    parts: list[str] = stem.split("_")
+    if parts[0] == "bar" and len(parts) > 1:
+        parts = parts[1:]
+
+    # 从后向前查找交易所和周期，合约代码中可能包含下划线
+    for i in range(len(parts) - 2, 0, -1):
+        if parts[i] in EXCHANGE_VALUES and parts[i + 1] in INTERVAL_VALUES:
+            return "_".join(parts[:i]), Exchange(parts[i]), Interval(parts[i + 1])
+
+    if exchange and interval:
+        return stem, exchange, interval
+
+    return None
+
+
+def scan_tasks(
+    folder: Path,
+    exchange: Exchange | None = None,
+    interval: Interval | None = None
+) -> tuple[list[ImportTask], list[Path]]:
+    """扫描目录生成导入任务，返回任务列表和无法识别的文件"""
+    tasks: dict[str, ImportTask] = {}
+    unknown: list[Path] = []
+
+    for path in sorted(folder.rglob("*")):
+        if not path.is_file() or not path.name.endswith(CSV_SUFFIXES + PARQUET_SUFFIXES):
+            continue
+
+        result: tuple[str, Exchange, Interval] | None = parse_file_name(path, exchange, interval)
+        if not result:
+            unknown.append(path)
+            continue
+
+        task: ImportTask = ImportTask(*result)
+        task = tasks.setdefault(task.table_name, task)
+        task.files.append(path)
+
+    return list(tasks.values()), unknown
+
+
+def read_chunks(path: Path, chunk_size: int, skip: int) -> Iterator[pd.DataFrame]:
+    """分块读取文件，跳过已写入的行"""
+    if path.name.endswith(PARQUET_SUFFIXES):
+        if pq is None:
+            raise ImportError('导入Parquet文件需要安装pyarrow：pip install "vnpy_taos[arrow]"')
+
+        parquet: pq.ParquetFile = pq.ParquetFile(path)
+
+        for batch in parquet.iter_batches(batch_size=chunk_size):
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+
+            df: pd.DataFrame = batch.slice(skip).to_pandas()
+            skip = 0
+            yield df
+    else:
+        # 先读取表头，再跳过表头和已写入的数据行
+        columns: pd.Index = pd.read_csv(path, nrows=0).columns
+
+        reader: Iterator[pd.DataFrame] = pd.read_csv(
+            path,
+            chunksize=chunk_size,
+            skiprows=skip + 1,
+            header=None,
+            names=columns
+        )
+        yield from reader
+
+
+def import_task(
+    database: TaosDatabase,
+    task: ImportTask,
+    checkpoint: Checkpoint,
+    progress: Progress,
+    chunk_size: int
+) -> None:
+    """导入单个数据表的全部文件，完成后更新一次汇总信息"""
+    for path in task.files:
+        skip: int | None = checkpoint.get_rows(path)
+        if skip is None:
+            continue
+
+        for df in read_chunks(path, chunk_size, skip):
+            if df.empty:
+                continue
+
+            start, end = database.write_bar_dataframe(df, task.symbol, task.exchange, task.interval)
+
+            checkpoint.add_rows(path, task.table_name, len(df), start, end)
+            progress.add_rows(len(df))
+
+        checkpoint.finish_file(path)
+
+    # 全部文件写入后统一更新汇总信息
+    data_range: tuple[datetime, datetime, int] | None = checkpoint.get_range(task.table_name)
+    if data_range:
+        start, end, rows = data_range
+
+        bar: BarData = BarData(
+            symbol=task.symbol,
+            exchange=task.exchange,
+            datetime=start,
+            interval=task.interval,
+            gateway_name="DB"
+        )
+        database.update_overview_range(task.table_name, bar, start, end, rows, False)
+        checkpoint.finish_table(task.table_name)
+
+    progress.add_table()
+
+
+def run_tasks(
+    database: TaosDatabase,
+    tasks: list[ImportTask],
+    checkpoint: Checkpoint,
+    workers: int,
+    chunk_size: int,
+    report_interval: float
+) -> list[str]:
+    """使用线程池并行导入各数据表，定时输出进度，返回失败的数据表"""
+    progress: Progress = Progress()
+    failed: list[str] = []
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="TaosImporter") as executor:
+        futures: dict[Future, ImportTask] = {
+            executor.submit(import_task, database, task, checkpoint, progress, chunk_size): task
+            for task in tasks
+        }
+
+        pending: set[Future] = set(futures)
+        while pending:
+            done, pending = wait(pending, timeout=report_interval, return_when=FIRST_EXCEPTION)
+
+            for future in done:
+                e: BaseException | None = future.exception()
+                if e:
+                    table_name: str = futures[future].table_name
+                    failed.append(table_name)
+                    print(f"{table_name}导入失败：{e!r}")
+
+            print(progress.report(len(tasks)))
+
+    return failed
+
+
+def parse_args(args: list[str] | None = None) -> Namespace:
+    """解析命令行参数"""
+    parser: ArgumentParser = ArgumentParser(description="vnpy_taos历史K线批量导入")
+    parser.add_argument("folder", type=Path, help="CSV/Parquet文件所在目录")
+    parser.add_argument("--exchange", default="", help="文件名中没有交易所时使用的默认值")
+    parser.add_argument(
+        "--interval",
+        default="",
+        choices=INTERVAL_VALUES,
+        help="文件名中没有K线周期时使用的默认值"
+    )
+    parser.add_argument("--workers", type=int, default=0, help="并行写入的线程数（默认为连接池大小）")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="每次读取和写入的行数")
+    parser.add_argument("--checkpoint", type=Path, default=None, help="断点文件路径")
+    parser.add_argument("--checkpoint-interval", type=float, default=10, help="断点文件的最短保存间隔（秒）")
+    parser.add_argument("--restart", action="store_true", help="忽略已有断点，从头导入")
+    parser.add_argument("--report", type=float, default=10, help="进度输出间隔（秒）")
+    return parser.parse_args(args)
+
+
+def main() -> None:
+    """主函数"""
+    args: Namespace = parse_args()
+
+    exchange: Exchange | None = Exchange(args.exchange) if args.exchange else None
+    interval: Interval | None = Interval(args.interval) if args.interval else None
+
+    tasks, unknown = scan_tasks(args.folder, exchange, interval)
+    for path in unknown:
+        print(f"无法从文件名识别合约信息，已跳过：{path}")
+
+    if not tasks:
+        print("没有需要导入的文件")
+        return
+
+    checkpoint_path: Path = args.checkpoint or args.folder.joinpath(CHECKPOINT_NAME)
+    if args.restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    checkpoint: Checkpoint = Checkpoint(checkpoint_path, args.checkpoint_interval)
+
+    # 导入结束时按实际数据量更新汇总信息，不使用延迟更新
+    SETTINGS["database.overview_mode"] = "sync"
+    database: TaosDatabase = TaosDatabase()
+
+    workers: int = args.workers or database.pool.size
+    print(f"共{len(tasks)}张数据表，使用{workers}个线程导入")
+
+    try:
+        failed: list[str] = run_tasks(database, tasks, checkpoint, workers, args.chunk_size, args.report)
+    finally:
+        database.close()
+
+    if failed:
+        print(f"{len(failed)}张数据表导入失败，重新运行将从断点继续")
+        sys.exit(1)
+
+    print("导入完成")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+TDengine异步数据库接口，在独立的线程池中执行TaosDatabase的读写操作。
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from typing import Any, Literal, TypeVar, overload
+
+import numpy as np
+import pandas as pd
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.database import BarOverview, TickOverview
+from vnpy.trader.setting import SETTINGS
+
+from .taos_batch import BarBatch, TickBatch
+from .taos_database import TaosDatabase
+
+
+T = TypeVar("T")
+
+
+class AsyncTaosDatabase:
+    """基于asyncio的TDengine数据库接口"""
+
+    def __init__(self, database: TaosDatabase | None = None, concurrency: int = 0) -> None:
+        """构造函数，可传入已创建的数据库接口"""
+        self.database: TaosDatabase = database or TaosDatabase()
+
+        # 工作线程数与连接池大小一致，每个线程借出独立的连接
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(
+            max_workers=self.database.pool.size,
+            thread_name_prefix="TaosAsync"
+        )
+
+        # 同时执行的数据库操作上限
+        self.concurrency: int = (
+            concurrency
+            or SETTINGS.get("database.async_concurrency", 0)
+            or self.database.pool.size
+        )
+        self.semaphore: asyncio.Semaphore = asyncio.Semaphore(self.concurrency)
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """在线程池中执行同步函数"""
+        async with self.semaphore:
+            loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, partial(func, *args, **kwargs))
+
+    async def save_bar_data(self, bars: list[BarData], stream: bool = False) -> bool:
+        """保存K线数据"""
+        return await self.run(self.database.save_bar_data, bars, stream)
+
+    async def save_tick_data(self, ticks: list[TickData], stream: bool = False) -> bool:
+        """保存tick数据"""
+        return await self.run(self.database.save_tick_data, ticks, stream)
+
+    async def save_bar_data_many(self, bars: list[BarData], stream: bool = False) -> bool:
+        """合并保存多个合约的K线数据"""
+        return await self.run(self.database.save_bar_data_many, bars, stream)
+
+    async def save_tick_data_many(self, ticks: list[TickData], stream: bool = False) -> bool:
+        """合并保存多个合约的tick数据"""
+        return await self.run(self.database.save_tick_data_many, ticks, stream)
+
+    async def save_bar_dataframe(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """保存DataFrame格式的K线数据"""
+        return await self.run(self.database.save_bar_dataframe, df, symbol, exchange, interval, stream)
+
+    async def save_tick_dataframe(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        stream: bool = False
+    ) -> bool:
+        """保存DataFrame格式的tick数据"""
+        return await self.run(self.database.save_tick_dataframe, df, symbol, exchange, stream)
+
+    @overload
+    async def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[False] = False
+    ) -> list[BarData]: ...
+
+    @overload
+    async def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[True]
+    ) -> BarBatch: ...
+
+    async def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        as_batch: bool = False
+    ) -> list[BarData] | BarBatch:
+        """读取K线数据"""
+        return await self.run(self.database.load_bar_data, symbol, exchange, interval, start, end, as_batch)
+
+    @overload
+    async def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[False] = False
+    ) -> list[TickData]: ...
+
+    @overload
+    async def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[True]
+    ) -> TickBatch: ...
+
+    async def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        as_batch: bool = False
+    ) -> list[TickData] | TickBatch:
+        """读取tick数据"""
+        return await self.run(self.database.load_tick_data, symbol, exchange, start, end, as_batch)
+
+    async def load_bar_arrays(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """读取K线数据为列数组"""
+        return await self.run(self.database.load_bar_arrays, symbol, exchange, interval, start, end)
+
+    async def load_tick_arrays(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """读取tick数据为列数组"""
+        return await self.run(self.database.load_tick_arrays, symbol, exchange, start, end)
+
+    async def load_bar_data_many(
+        self,
+        contracts: Iterable[tuple[str, Exchange]],
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> dict[tuple[str, Exchange], list[BarData]]:
+        """并发读取多个合约的K线数据"""
+        keys: list[tuple[str, Exchange]] = list(contracts)
+
+        results: list[list[BarData]] = await asyncio.gather(*[
+            self.load_bar_data(symbol, exchange, interval, start, end)
+            for symbol, exchange in keys
+        ])
+
+        return dict(zip(keys, results, strict=True))
+
+    async def load_tick_data_many(
+        self,
+        contracts: Iterable[tuple[str, Exchange]],
+        start: datetime,
+        end: datetime
+    ) -> dict[tuple[str, Exchange], list[TickData]]:
+        """并发读取多个合约的tick数据"""
+        keys: list[tuple[str, Exchange]] = list(contracts)
+
+        results: list[list[TickData]] = await asyncio.gather(*[
+            self.load_tick_data(symbol, exchange, start, end)
+            for symbol, exchange in keys
+        ])
+
+        return dict(zip(keys, results, strict=True))
+
+    async def load_last_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> BarData:
+        """读取区间最近的K线数据"""
+        return await self.run(self.database.load_last_bar_data, symbol, exchange, interval, start, end)
+
+    async def load_last_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> TickData:
+        """读取区间最近的tick数据"""
+        return await self.run(self.database.load_last_tick_data, symbol, exchange, start, end)
+
+    async def delete_bar_data(self, symbol: str, exchange: Exchange, interval: Interval) -> int:
+        """删除K线数据"""
+        return await self.run(self.database.delete_bar_data, symbol, exchange, interval)
+
+    async def delete_tick_data(self, symbol: str, exchange: Exchange) -> int:
+        """删除tick数据"""
+        return await self.run(self.database.delete_tick_data, symbol, exchange)
+
+    async def get_bar_overview(self) -> list[BarOverview]:
+        """查询数据库中的K线汇总信息"""
+        return await self.run(self.database.get_bar_overview)
+
+    async def get_tick_overview(self) -> list[TickOverview]:
+        """查询数据库中的tick汇总信息"""
+        return await self.run(self.database.get_tick_overview)
+
+    async def close(self) -> None:
+        """等待执行中的操作完成后关闭"""
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.executor.shutdown)
+
+        self.database.close()
@@ -0,0 +1,191 @@
+"""
+以列数组保存的K线和tick数据容器，遍历时逐条生成BarData和TickData。
+"""
+
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import overload
+
+import numpy as np
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData, TickData
+from vnpy.trader.database import DB_TZ
+
+
+# 遍历时每次转换的数据条数
+CHUNK_SIZE: int = 1024
+
+# K线数值字段
+BAR_VALUE_FIELDS: list[str] = [
+    "volume", "turnover", "open_interest",
+    "open_price", "high_price", "low_price", "close_price"
+]
+
+# tick中非数值类型的字段
+TICK_OBJECT_FIELDS: set[str] = {"datetime", "localtime", "name"}
+
+
+class BarBatch(Sequence[BarData]):
+    """单个合约周期的K线数据，datetime为毫秒时间戳数组"""
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        arrays: dict[str, np.ndarray]
+    ) -> None:
+        """构造函数"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.interval: Interval = interval
+        self.arrays: dict[str, np.ndarray] = arrays
+
+    def __len__(self) -> int:
+        """数据条数"""
+        return len(self.arrays["datetime"])
+
+    @overload
+    def __getitem__(self, index: int) -> BarData: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "BarBatch": ...
+
+    def __getitem__(self, index: int | slice) -> "BarData | BarBatch":
+        """按位置读取单条K线，切片时返回新的容器（共享数组内存）"""
+        if isinstance(index, slice):
+            arrays: dict[str, np.ndarray] = {field: array[index] for field, array in self.arrays.items()}
+            return BarBatch(self.symbol, self.exchange, self.interval, arrays)
+
+        return next(self.iter_range(*get_range(index, len(self))))
+
+    def __iter__(self) -> Iterator[BarData]:
+        """逐条生成BarData"""
+        return self.iter_range(0, None)
+
+    def iter_range(self, start: int, end: int | None) -> Iterator[BarData]:
+        """分块转换指定区间的数据"""
+        times: np.ndarray = self.arrays["datetime"][start:end]
+        values: list[np.ndarray] = [self.arrays[field][start:end] for field in BAR_VALUE_FIELDS]
+
+        for i in range(0, len(times), CHUNK_SIZE):
+            columns: list[list] = [array[i:i + CHUNK_SIZE].tolist() for array in values]
+
+            for ms, *row in zip(times[i:i + CHUNK_SIZE].tolist(), *columns, strict=True):
+                yield BarData(
+                    symbol=self.symbol,
+                    exchange=self.exchange,
+                    datetime=convert_ms(ms),
+                    interval=self.interval,
+                    gateway_name="DB",
+                    **dict(zip(BAR_VALUE_FIELDS, row, strict=True))
+                )
+
+    def to_list(self) -> list[BarData]:
+        """转换为BarData列表"""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """数组占用内存"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+
+class TickBatch(Sequence[TickData]):
+    """单个合约的tick数据，datetime和localtime为毫秒时间戳数组"""
+
+    def __init__(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        arrays: dict[str, np.ndarray],
+        name: str = ""
+    ) -> None:
+        """构造函数，数组中没有name字段时使用统一的合约名称"""
+        self.symbol: str = symbol
+        self.exchange: Exchange = exchange
+        self.arrays: dict[str, np.ndarray] = arrays
+        self.name: str = name
+
+        self.value_fields: list[str] = [field for field in arrays if field not in TICK_OBJECT_FIELDS]
+
+    def __len__(self) -> int:
+        """数据条数"""
+        return len(self.arrays["datetime"])
+
+    @overload
+    def __getitem__(self, index: int) -> TickData: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "TickBatch": ...
+
+    def __getitem__(self, index: int | slice) -> "TickData | TickBatch":
+        """按位置读取单条tick，切片时返回新的容器（共享数组内存）"""
+        if isinstance(index, slice):
+            arrays: dict[str, np.ndarray] = {field: array[index] for field, array in self.arrays.items()}
+            return TickBatch(self.symbol, self.exchange, arrays, self.name)
+
+        return next(self.iter_range(*get_range(index, len(self))))
+
+    def __iter__(self) -> Iterator[TickData]:
+        """逐条生成TickData"""
+        return self.iter_range(0, None)
+
+    def iter_range(self, start: int, end: int | None) -> Iterator[TickData]:
+        """分块转换指定区间的数据"""
+        times: np.ndarray = self.arrays["datetime"][start:end]
+        values: list[np.ndarray] = [self.arrays[field][start:end] for field in self.value_fields]
+
+        localtimes: np.ndarray | None = self.arrays.get("localtime")
+        names: np.ndarray | None = self.arrays.get("name")
+
+        for i in range(0, len(times), CHUNK_SIZE):
+            chunk: slice = slice(i, i + CHUNK_SIZE)
+            columns: list[list] = [array[chunk].tolist() for array in values]
+
+            chunk_times: list[int] = times[chunk].tolist()
+            chunk_localtimes: list = (
+                localtimes[start:end][chunk].tolist() if localtimes is not None else [None] * len(chunk_times)
+            )
+            chunk_names: list = (
+                names[start:end][chunk].tolist() if names is not None else [self.name] * len(chunk_times)
+            )
+
+            for j, ms in enumerate(chunk_times):
+                local_ms: int | None = chunk_localtimes[j]
+
+                yield TickData(
+                    symbol=self.symbol,
+                    exchange=self.exchange,
+                    datetime=convert_ms(ms),
+                    name=chunk_names[j],
+                    localtime=convert_ms(local_ms) if local_ms is not None else None,
+                    gateway_name="DB",
+                    **{field: column[j] for field, column in zip(self.value_fields, columns, strict=True)}
+                )
+
+    def to_list(self) -> list[TickData]:
+        """转换为TickData列表"""
+        return list(self)
+
+    @property
+    def nbytes(self) -> int:
+        """数组占用内存"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+
+def convert_ms(ms: int) -> datetime:
+    """将毫秒时间戳转换为数据库时区的datetime"""
+    return datetime.fromtimestamp(ms / 1000, DB_TZ)
+
+
+def get_range(index: int, size: int) -> tuple[int, int]:
+    """将可能为负数的位置转换为[index, index + 1)区间"""
+    if index < 0:
+        index += size
+
+    if not 0 <= index < size:
+        raise IndexError("数据索引超出范围")
+
+    return index, index + 1
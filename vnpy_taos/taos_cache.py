@@ -0,0 +1,209 @@
+"""
+K线数据读取缓存，按合约和周期缓存已加载的时间区间。
+"""
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import datetime
+from threading import Lock
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.object import BarData
+
+from .taos_disk import convert_tz
+
+
+# 单根K线对象占用内存的估算值（字节）
+BAR_BYTES: int = 1024
+
+
+CacheKey = tuple[str, Exchange, Interval]
+
+
+class CacheEntry:
+    """单个合约周期的缓存数据"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.ranges: list[tuple[datetime, datetime]] = []
+        self.bars: list[BarData] = []
+        self.times: list[datetime] = []
+
+    def get_missing(self, start: datetime, end: datetime) -> list[tuple[datetime, datetime]]:
+        """计算请求区间中未被缓存覆盖的部分"""
+        missing: list[tuple[datetime, datetime]] = []
+        cursor: datetime = start
+        covered: bool = False
+
+        for range_start, range_end in self.ranges:
+            if range_end < cursor:
+                continue
+            if range_start > end:
+                break
+
+            if range_start > cursor:
+                missing.append((cursor, range_start))
+
+            cursor = max(cursor, range_end)
+            covered = True
+
+        if cursor < end or not covered:
+            missing.append((cursor, end))
+
+        return missing
+
+    def add(self, start: datetime, end: datetime, bars: list[BarData]) -> None:
+        """合并新加载的区间和数据"""
+        # 合并数据，相同时间的K线以新数据为准
+        merged: dict[datetime, BarData] = {bar.datetime: bar for bar in self.bars}
+        for bar in bars:
+            merged[bar.datetime] = bar
+
+        self.bars = [merged[dt] for dt in sorted(merged)]
+        self.times = [bar.datetime for bar in self.bars]
+
+        # 合并重叠或相接的区间
+        ranges: list[tuple[datetime, datetime]] = sorted(self.ranges + [(start, end)])
+        self.ranges = [ranges[0]]
+
+        for range_start, range_end in ranges[1:]:
+            last_start, last_end = self.ranges[-1]
+
+            if range_start <= last_end:
+                self.ranges[-1] = (last_start, max(last_end, range_end))
+            else:
+                self.ranges.append((range_start, range_end))
+
+    def slice(self, start: datetime, end: datetime) -> list[BarData]:
+        """截取请求区间内的数据"""
+        left: int = bisect_left(self.times, start)
+        right: int = bisect_right(self.times, end)
+        return self.bars[left:right]
+
+    @property
+    def size(self) -> int:
+        """估算占用内存"""
+        return len(self.bars) * BAR_BYTES
+
+
+class BarCache:
+    """按内存上限淘汰的K线LRU缓存"""
+
+    def __init__(self, max_bytes: int) -> None:
+        """构造函数"""
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+
+        self.entries: OrderedDict[CacheKey, CacheEntry] = OrderedDict()
+        self.lock: Lock = Lock()
+
+        # 缓存失效时递增，用于识别加载期间发生的失效
+        self.version: int = 0
+
+        self.hits: int = 0
+        self.partial_hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def get(
+        self,
+        key: CacheKey,
+        start: datetime,
+        end: datetime,
+        loader: Callable[[datetime, datetime], list[BarData]]
+    ) -> list[BarData]:
+        """读取区间数据，缺失部分通过loader从数据库加载，不带时区的时间视为数据库时区"""
+        # 缓存中K线时间带有数据库时区，统一时区后才能比较
+        start = convert_tz(start)
+        end = convert_tz(end)
+
+        with self.lock:
+            entry: CacheEntry | None = self.entries.get(key)
+
+            if entry:
+                self.entries.move_to_end(key)
+                missing: list[tuple[datetime, datetime]] = entry.get_missing(start, end)
+
+                if not missing:
+                    self.hits += 1
+                    return entry.slice(start, end)
+
+                self.partial_hits += 1
+            else:
+                entry = CacheEntry()
+                missing = [(start, end)]
+
+                self.misses += 1
+
+            version: int = self.version
+
+        # 在锁外加载缺失的区间
+        loaded: list[tuple[datetime, datetime, list[BarData]]] = [
+            (missing_start, missing_end, loader(missing_start, missing_end))
+            for missing_start, missing_end in missing
+        ]
+
+        with self.lock:
+            # 加载期间缓存已被失效，则不写入缓存直接重新加载
+            if version != self.version:
+                stale: bool = True
+            else:
+                stale = False
+
+                # 其他线程可能已写入同一合约周期的缓存
+                current: CacheEntry | None = self.entries.pop(key, None)
+                if current:
+                    self.size -= current.size
+                    entry = current
+
+                for missing_start, missing_end, bars in loaded:
+                    entry.add(missing_start, missing_end, bars)
+
+                self.entries[key] = entry
+                self.size += entry.size
+
+                data: list[BarData] = entry.slice(start, end)
+
+                self.evict()
+
+        if stale:
+            return loader(start, end)
+
+        return data
+
+    def invalidate(self, key: CacheKey) -> None:
+        """移除合约周期的缓存"""
+        with self.lock:
+            self.version += 1
+
+            entry: CacheEntry | None = self.entries.pop(key, None)
+            if entry:
+                self.size -= entry.size
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self.lock:
+            self.version += 1
+
+            self.entries.clear()
+            self.size = 0
+
+    def evict(self) -> None:
+        """按最近最少使用淘汰超出内存上限的缓存"""
+        while self.entries and self.size > self.max_bytes:
+            _, entry = self.entries.popitem(last=False)
+            self.size -= entry.size
+            self.evictions += 1
+
+    def get_statistics(self) -> dict[str, int]:
+        """查询缓存统计信息"""
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "partial_hits": self.partial_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self.entries),
+                "size": self.size,
+            }
@@ -1,7 +1,13 @@
-from datetime import datetime
-from collections.abc import Callable
+import atexit
+from time import perf_counter
+from pathlib import Path
+from typing import Literal, overload
+from datetime import datetime, timedelta, timezone
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import taos
+import numpy as np
 import pandas as pd
 
 from vnpy.trader.constant import Exchange, Interval
@@ -13,7 +19,33 @@ from vnpy.trader.database import (
     DB_TZ,
 )
 from vnpy.trader.setting import SETTINGS
-
+from vnpy.trader.utility import extract_vt_symbol, get_file_path, get_folder_path
+
+from .taos_batch import BarBatch, TickBatch, convert_ms
+from .taos_cache import BarCache
+from .taos_disk import DiskCache
+from .taos_frame import (
+    CHUNK_SIZE as FRAME_CHUNK_SIZE,
+    convert_timestamps,
+    generate_bind_column,
+    generate_rows,
+    generate_sql_column,
+    get_double_column,
+    get_string_column,
+    split_rows,
+)
+from .taos_metrics import LogSink, MetricsConnection, MetricsSink, PrometheusSink, TaosMetrics, timed
+from .taos_slowlog import SlowQueryLog
+from .taos_overview import OverviewRegistry, OverviewUpdater, OverviewState
+from .taos_pool import ConnectionPool, pooled
+from .taos_tuner import BatchTuner, is_sql_too_long
+from .taos_stream import (
+    SOURCE_BAR,
+    WINDOW_INTERVALS,
+    StreamManager,
+    generate_interval_clause,
+    get_window_interval,
+)
 from .taos_script import (
     CREATE_DATABASE_SCRIPT,
     CREATE_BAR_TABLE_SCRIPT,
@@ -22,6 +54,48 @@ from .taos_script import (
 )
 
 
+# 时间戳转换常量
+EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MILLISECOND: timedelta = timedelta(milliseconds=1)
+
+# tick表中DOUBLE类型的字段（按建表顺序）
+TICK_DOUBLE_FIELDS: list[str] = [
+    "volume", "turnover", "open_interest", "last_price", "last_volume",
+    "limit_up", "limit_down", "open_price", "high_price", "low_price", "pre_close",
+    "bid_price_1", "bid_price_2", "bid_price_3", "bid_price_4", "bid_price_5",
+    "ask_price_1", "ask_price_2", "ask_price_3", "ask_price_4", "ask_price_5",
+    "bid_volume_1", "bid_volume_2", "bid_volume_3", "bid_volume_4", "bid_volume_5",
+    "ask_volume_1", "ask_volume_2", "ask_volume_3", "ask_volume_4", "ask_volume_5",
+]
+
+# 逐行读取时tick表的字段（与建表顺序一致）
+TICK_QUERY_FIELDS: list[str] = ["datetime", "name"] + TICK_DOUBLE_FIELDS + ["localtime"]
+
+# 列式读取时的字段（datetime和localtime读取为毫秒时间戳）
+BAR_ARRAY_FIELDS: list[str] = [
+    "datetime", "volume", "turnover", "open_interest",
+    "open_price", "high_price", "low_price", "close_price"
+]
+TICK_ARRAY_FIELDS: list[str] = ["datetime"] + TICK_DOUBLE_FIELDS + ["localtime"]
+TIMESTAMP_FIELDS: set[str] = {"datetime", "localtime"}
+
+# 无模式写入的超级表字符串标签
+SCHEMALESS_TAGS: dict[str, list[str]] = {
+    "s_bar": ["symbol", "exchange", "interval_"],
+    "s_tick": ["symbol", "exchange"],
+}
+
+# 多表写入语句的前缀
+INSERT_PREFIX: str = "INSERT INTO"
+
+# TDengine默认的SQL语句最大长度
+DEFAULT_MAX_SQL_BYTES: int = 1024 * 1024
+
+# 参数绑定时各列的数据类型
+BAR_FIELD_TYPES: list[str] = ["timestamp"] + ["double"] * 7
+TICK_FIELD_TYPES: list[str] = ["timestamp", "nchar"] + ["double"] * len(TICK_DOUBLE_FIELDS) + ["timestamp"]
+
+
 class TaosDatabase(BaseDatabase):
     """TDengine数据库接口"""
 
@@ -34,8 +108,89 @@ class TaosDatabase(BaseDatabase):
         self.timezone: str = SETTINGS["database.timezone"]
         self.database: str = SETTINGS["database.database"]
 
-        # 连接数据库
-        self.conn: taos.TaosConnection = taos.connect(
+        # 写入模式：sql为拼接SQL字符串，stmt为参数绑定，schemaless为行协议无模式写入
+        self.insert_mode: str = SETTINGS.get("database.insert_mode", "sql")
+        self.stmt_batch_size: int = SETTINGS.get("database.stmt_batch_size", 10000)
+        self.sml_batch_size: int = SETTINGS.get("database.sml_batch_size", 10000)
+
+        # 无模式写入时用于指定子表名的标签（需与客户端smlChildTableName配置一致）
+        self.sml_table_tag: str = SETTINGS.get("database.sml_table_tag", "tname")
+
+        # 单条SQL语句的最大字节数（为0时连接后从客户端配置读取）
+        self.max_sql_bytes: int = SETTINGS.get("database.max_sql_bytes", 0)
+
+        # 内存中维护的汇总信息，查询时无需访问数据库
+        self.overviews: OverviewRegistry | None = None
+
+        if SETTINGS.get("database.overview_registry", True):
+            self.overviews = OverviewRegistry()
+
+        # 汇总信息维护模式：sync为每次写入后同步更新，deferred为增量计算后定时批量更新
+        self.overview_mode: str = SETTINGS.get("database.overview_mode", "sync")
+        self.overview_updater: OverviewUpdater | None = None
+
+        # K线读取缓存（单位MB，为0时不启用）
+        self.bar_cache: BarCache | None = None
+
+        bar_cache_size: int = SETTINGS.get("database.bar_cache_size", 0)
+        if bar_cache_size:
+            self.bar_cache = BarCache(bar_cache_size * 1024 * 1024)
+
+        # 本地磁盘缓存（单位MB，为0时不启用）
+        self.disk_cache: DiskCache | None = None
+
+        disk_cache_size: int = SETTINGS.get("database.disk_cache_size", 0)
+        if disk_cache_size:
+            disk_cache_path: str = SETTINGS.get("database.disk_cache_path", "")
+            self.disk_cache = DiskCache(
+                Path(disk_cache_path) if disk_cache_path else get_folder_path("taos_disk_cache"),
+                disk_cache_size * 1024 * 1024
+            )
+
+        # 性能指标统计（和慢查询日志都不启用时连接不经过代理，没有额外开销）
+        self.metrics: TaosMetrics | None = None
+
+        if SETTINGS.get("database.metrics", False):
+            sinks: list[MetricsSink] = []
+
+            for name in SETTINGS.get("database.metrics_sinks", ["prometheus"]):
+                if name == "prometheus":
+                    metrics_path: str = SETTINGS.get("database.metrics_path", "")
+                    sinks.append(PrometheusSink(Path(metrics_path) if metrics_path else get_file_path("taos_metrics.prom")))
+                elif name == "log":
+                    sinks.append(LogSink())
+                else:
+                    raise ValueError(f"不支持的性能指标输出：{name}")
+
+            self.metrics = TaosMetrics(sinks, SETTINGS.get("database.metrics_interval", 60))
+
+        # 慢查询日志（阈值单位为毫秒，为0时不启用）
+        self.slow_log: SlowQueryLog | None = None
+
+        slow_query_threshold: float = SETTINGS.get("database.slow_query_threshold", 0)
+        if slow_query_threshold:
+            slow_query_path: str = SETTINGS.get("database.slow_query_path", "")
+            self.slow_log = SlowQueryLog(
+                slow_query_threshold / 1000,
+                Path(slow_query_path) if slow_query_path else get_file_path("taos_slow_query.log"),
+                SETTINGS.get("database.slow_query_max_size", 10) * 1024 * 1024,
+                self.connect if SETTINGS.get("database.slow_query_explain", False) else None
+            )
+
+            # 未启用性能指标时只统计不导出
+            if not self.metrics:
+                self.metrics = TaosMetrics([], 0)
+            self.metrics.add_listener(self.slow_log.on_statement)
+
+        # 创建连接池，各线程的数据库操作使用独立的连接
+        self.pool: ConnectionPool = ConnectionPool(
+            self.create_connection,
+            SETTINGS.get("database.pool_size", 8),
+            SETTINGS.get("database.pool_check_interval", 60)
+        )
+
+        # 连接数据库（未从连接池借出连接时使用）
+        self.default_conn: taos.TaosConnection = taos.connect(
             host=self.host,
             user=self.user,
             password=self.password,
@@ -43,15 +198,156 @@ class TaosDatabase(BaseDatabase):
             timezone=self.timezone
         )
 
-        self.cursor: taos.TaosCursor = self.conn.cursor()
+        if self.metrics:
+            self.default_conn = MetricsConnection(self.default_conn, self.metrics)
+
+        self.default_cursor: taos.TaosCursor = self.default_conn.cursor()
+
+        # 写入语句的字节预算，设置目标耗时（毫秒）后根据语句执行耗时自动调整
+        if not self.max_sql_bytes:
+            self.max_sql_bytes = self.probe_max_sql_bytes()
+
+        self.batch_tuner: BatchTuner = BatchTuner(
+            self.max_sql_bytes,
+            SETTINGS.get("database.batch_target_latency", 0) / 1000
+        )
 
         # 初始化创建数据库和数据表
         self.cursor.execute(CREATE_DATABASE_SCRIPT.format(self.database))
         self.cursor.execute(f"use {self.database}")
-        self.cursor.execute(CREATE_BAR_TABLE_SCRIPT)
-        self.cursor.execute(CREATE_TICK_TABLE_SCRIPT)
+        # 行协议中的标签值均为NCHAR类型，无模式写入时超级表的字符串标签需使用NCHAR
+        tag_type: str = "NCHAR" if self.insert_mode == "schemaless" else "BINARY"
+        self.cursor.execute(CREATE_BAR_TABLE_SCRIPT.format(tag_type=tag_type))
+        self.cursor.execute(CREATE_TICK_TABLE_SCRIPT.format(tag_type=tag_type))
         self.cursor.execute(CREATE_MAIN_CONTRACT_TABLE_SCRIPT)
 
+        if self.insert_mode == "schemaless":
+            self.check_schemaless_tags()
+
+        # 加载已存在的数据表名
+        self.known_tables: set[str] = set()
+        self.load_known_tables()
+
+        # 加载汇总信息注册表
+        self.load_overview()
+
+        # 加载已存在的K线合成流，并按配置创建（键为时间窗口，值为窗口偏移）
+        self.streams: StreamManager = StreamManager(self)
+        self.streams.load()
+
+        for window, offset in SETTINGS.get("database.bar_streams", {}).items():
+            self.streams.create_stream(SOURCE_BAR, window, offset)
+
+        # 启动汇总信息定时更新
+        if self.overview_mode == "deferred":
+            self.overview_updater = OverviewUpdater(
+                self.write_overview_tags,
+                SETTINGS.get("database.overview_flush_interval", 5)
+            )
+            atexit.register(self.close)
+
+    @property
+    def conn(self) -> taos.TaosConnection:
+        """当前线程从连接池借出的连接"""
+        conn: taos.TaosConnection | None = self.pool.get_connection()
+        if conn:
+            return conn
+        return self.default_conn
+
+    @property
+    def cursor(self) -> taos.TaosCursor:
+        """当前线程从连接池借出连接的游标"""
+        cursor: taos.TaosCursor | None = self.pool.get_cursor()
+        if cursor:
+            return cursor
+        return self.default_cursor
+
+    def create_connection(self) -> taos.TaosConnection:
+        """创建连接池中的新连接"""
+        conn: taos.TaosConnection = self.connect()
+
+        if self.metrics:
+            return MetricsConnection(conn, self.metrics)
+
+        return conn
+
+    def connect(self) -> taos.TaosConnection:
+        """创建不记录性能指标的数据库连接"""
+        conn: taos.TaosConnection = taos.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database,
+            port=self.port,
+            timezone=self.timezone
+        )
+        return conn
+
+    def probe_max_sql_bytes(self) -> int:
+        """从客户端配置读取SQL语句最大长度，无法读取时使用TDengine的默认值"""
+        try:
+            self.cursor.execute("SHOW LOCAL VARIABLES")
+            for row in self.cursor.fetchall():
+                if str(row[0]).lower() == "maxsqllength":
+                    return int(row[1])
+        except Exception:
+            pass
+
+        return DEFAULT_MAX_SQL_BYTES
+
+    @pooled
+    def load_known_tables(self) -> None:
+        """从数据库加载已存在的数据表名"""
+        self.cursor.execute(
+            f"SELECT table_name FROM information_schema.ins_tables WHERE db_name='{self.database}'"
+        )
+        self.known_tables = {row[0] for row in self.cursor.fetchall()}
+
+    @pooled
+    def check_schemaless_tags(self) -> None:
+        """检查已存在的超级表能否无模式写入，行协议写入的字符串标签需为NCHAR类型"""
+        for stable, tags in SCHEMALESS_TAGS.items():
+            self.cursor.execute(f"DESCRIBE {stable}")
+
+            for row in self.cursor.fetchall():
+                field, field_type = row[0], str(row[1]).upper()
+                if field in tags and field_type != "NCHAR":
+                    raise RuntimeError(
+                        f"超级表{stable}的{field}标签类型为{field_type}，无模式写入的标签值为NCHAR类型，"
+                        "无法写入已有的超级表，请改用sql或stmt写入模式"
+                    )
+
+    @pooled
+    def check_schemaless_table(self, table_name: str) -> None:
+        """检查无模式写入自动创建的子表名是否与vnpy_taos的命名规则一致"""
+        self.cursor.execute(
+            "SELECT table_name FROM information_schema.ins_tables "
+            f"WHERE db_name='{self.database}' AND table_name='{table_name}'"
+        )
+        if self.cursor.fetchall():
+            return
+
+        raise RuntimeError(
+            f"无模式写入后未找到数据表{table_name}，请在TDengine客户端配置文件taos.cfg中添加"
+            f"smlChildTableName {self.sml_table_tag}（与database.sml_table_tag一致）"
+        )
+
+    def close(self) -> None:
+        """写入未完成的汇总信息并关闭连接"""
+        if self.overview_updater:
+            self.overview_updater.close()
+            self.overview_updater = None
+
+        self.pool.close()
+        self.default_conn.close()
+
+        if self.metrics:
+            self.metrics.close()
+
+        if self.slow_log:
+            self.slow_log.close()
+
+    @pooled
     def save_bar_data(self, bars: list[BarData], stream: bool = False) -> bool:
         """保存k线数据"""
         # 缓存字段参数
@@ -69,10 +365,23 @@ class TaosDatabase(BaseDatabase):
             "USING s_bar(symbol, exchange, interval_, count_) "
             f"TAGS('{symbol}', '{exchange.value}', '{interval.value}', '{count}')"
         )
-        self.cursor.execute(create_table_script)
+        # 无模式写入时由数据库自动建表，已知的数据表无需重复创建
+        if self.insert_mode != "schemaless" and table_name not in self.known_tables:
+            self.cursor.execute(create_table_script)
 
         # 写入k线数据
-        self.insert_in_batch(table_name, bars, 1000)
+        self.insert_in_batch(table_name, bars)
+
+        self.known_tables.add(table_name)
+        self.invalidate_disk_cache(table_name, bars)
+
+        if self.bar_cache:
+            self.bar_cache.invalidate((symbol, exchange, interval))
+
+        # 延迟模式下根据写入数据增量计算汇总信息
+        if self.overview_updater:
+            self.accumulate_overview(table_name, bars)
+            return True
 
         # 查询汇总信息
         self.cursor.execute(f"SELECT start_time, end_time, count_ FROM {table_name}")
@@ -81,7 +390,7 @@ class TaosDatabase(BaseDatabase):
         overview: tuple = results[0]
         overview_start: datetime = overview[0]
         overview_end: datetime = overview[1]
-        overview_count: int = int(overview[2])
+        overview_count: int = int(overview[2] or 0)
 
         # 没有该合约
         if not overview_count:
@@ -103,12 +412,11 @@ class TaosDatabase(BaseDatabase):
             overview_count = bar_count
 
         # 更新汇总信息
-        self.cursor.execute(f"ALTER TABLE {table_name} SET TAG start_time='{overview_start}';")
-        self.cursor.execute(f"ALTER TABLE {table_name} SET TAG end_time='{overview_end}';")
-        self.cursor.execute(f"ALTER TABLE {table_name} SET TAG count_='{overview_count}';")
+        self.update_overview_tags(table_name, bar, overview_start, overview_end, overview_count)
 
         return True
 
+    @pooled
     def save_tick_data(self, ticks: list[TickData], stream: bool = False) -> bool:
         """保存tick数据"""
         tick: TickData = ticks[0]
@@ -124,10 +432,20 @@ class TaosDatabase(BaseDatabase):
             "USING s_tick(symbol, exchange, count_) "
             f"TAGS ( '{symbol}', '{exchange.value}', '{count}')"
         )
-        self.cursor.execute(create_table_script)
+        # 无模式写入时由数据库自动建表，已知的数据表无需重复创建
+        if self.insert_mode != "schemaless" and table_name not in self.known_tables:
+            self.cursor.execute(create_table_script)
 
         # 写入tick数据
-        self.insert_in_batch(table_name, ticks, 1000)
+        self.insert_in_batch(table_name, ticks)
+
+        self.known_tables.add(table_name)
+        self.invalidate_disk_cache(table_name, ticks)
+
+        # 延迟模式下根据写入数据增量计算汇总信息
+        if self.overview_updater:
+            self.accumulate_overview(table_name, ticks)
+            return True
 
         # 查询汇总信息
         self.cursor.execute(f"SELECT start_time, end_time, count_ FROM {table_name}")
@@ -136,7 +454,7 @@ class TaosDatabase(BaseDatabase):
         overview: tuple = results[0]
         overview_start: datetime = overview[0]
         overview_end: datetime = overview[1]
-        overview_count: int = int(overview[2])
+        overview_count: int = int(overview[2] or 0)
 
         # 没有该合约
         if not overview_count:
@@ -158,13 +476,595 @@ class TaosDatabase(BaseDatabase):
             overview_count = tick_count
 
         # 更新汇总信息
-        self.cursor.execute(f"ALTER TABLE {table_name} SET TAG start_time='{overview_start}';")
-        self.cursor.execute(f"ALTER TABLE {table_name} SET TAG end_time='{overview_end}';")
-        self.cursor.execute(f"ALTER TABLE {table_name} SET TAG count_='{overview_count}';")
+        self.update_overview_tags(table_name, tick, overview_start, overview_end, overview_count)
+
+        return True
+
+    @pooled
+    def save_bar_data_many(self, bars: list[BarData], stream: bool = False) -> bool:
+        """保存多合约k线数据"""
+        if not bars:
+            return False
+
+        # 按数据表分组
+        groups: dict[str, list[BarData]] = {}
+        heads: dict[str, str] = {}
+
+        for bar in bars:
+            table_name: str = generate_bar_table_name(bar.symbol, bar.exchange, bar.interval)       # type: ignore
+
+            if table_name not in groups:
+                groups[table_name] = []
+                heads[table_name] = table_name
+
+                # 未知的数据表通过USING子句自动创建
+                if table_name not in self.known_tables:
+                    heads[table_name] = (
+                        f"{table_name} USING s_bar(symbol, exchange, interval_, count_) "
+                        f"TAGS('{bar.symbol}', '{bar.exchange.value}', '{bar.interval.value}', '0')"     # type: ignore
+                    )
+
+            groups[table_name].append(bar)
+
+        # 写入k线数据
+        if self.insert_mode == "schemaless":
+            for table_name, data in groups.items():
+                self.insert_by_schemaless(table_name, data, self.sml_batch_size)
+        else:
+            self.insert_many(groups, heads, generate_bar)
+
+        self.known_tables.update(groups)
+
+        for table_name, data in groups.items():
+            self.invalidate_disk_cache(table_name, data)
+
+        if self.bar_cache:
+            for data in groups.values():
+                bar = data[0]
+                self.bar_cache.invalidate((bar.symbol, bar.exchange, bar.interval))       # type: ignore
+
+        # 统一更新汇总信息
+        self.update_overview_many("s_bar", groups, stream)
 
         return True
 
+    @pooled
+    def save_tick_data_many(self, ticks: list[TickData], stream: bool = False) -> bool:
+        """保存多合约tick数据"""
+        if not ticks:
+            return False
+
+        # 按数据表分组
+        groups: dict[str, list[TickData]] = {}
+        heads: dict[str, str] = {}
+
+        for tick in ticks:
+            table_name: str = generate_tick_table_name(tick.symbol, tick.exchange)
+
+            if table_name not in groups:
+                groups[table_name] = []
+                heads[table_name] = table_name
+
+                # 未知的数据表通过USING子句自动创建
+                if table_name not in self.known_tables:
+                    heads[table_name] = (
+                        f"{table_name} USING s_tick(symbol, exchange, count_) "
+                        f"TAGS('{tick.symbol}', '{tick.exchange.value}', '0')"
+                    )
+
+            groups[table_name].append(tick)
+
+        # 写入tick数据
+        if self.insert_mode == "schemaless":
+            for table_name, data in groups.items():
+                self.insert_by_schemaless(table_name, data, self.sml_batch_size)
+        else:
+            self.insert_many(groups, heads, generate_tick)
+
+        self.known_tables.update(groups)
+
+        for table_name, data in groups.items():
+            self.invalidate_disk_cache(table_name, data)
+
+        # 统一更新汇总信息
+        self.update_overview_many("s_tick", groups, stream)
+
+        return True
+
+    @pooled
+    def save_bar_dataframe(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        stream: bool = False
+    ) -> bool:
+        """保存DataFrame格式的k线数据（需包含datetime列，缺少的数值列写入0），按列整批转换后写入"""
+        if df.empty:
+            return False
+
+        start, end = self.write_bar_dataframe(df, symbol, exchange, interval)
+
+        # 根据时间列的范围和数据量更新汇总信息
+        table_name: str = generate_bar_table_name(symbol, exchange, interval)
+        bar: BarData = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=start,
+            interval=interval,
+            gateway_name="DB"
+        )
+        self.update_overview_range(table_name, bar, start, end, len(df), stream)
+
+        return True
+
+    @pooled
+    def write_bar_dataframe(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval
+    ) -> tuple[datetime, datetime]:
+        """写入DataFrame格式的k线数据但不更新汇总信息，返回数据的起止时间"""
+        table_name: str = generate_bar_table_name(symbol, exchange, interval)
+
+        # 按列写入时统一通过SQL建表
+        if table_name not in self.known_tables:
+            self.cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table_name} "
+                "USING s_bar(symbol, exchange, interval_, count_) "
+                f"TAGS('{symbol}', '{exchange.value}', '{interval.value}', '0')"
+            )
+
+        timestamps: np.ndarray = convert_timestamps(df["datetime"])
+        arrays: list[np.ndarray] = [timestamps] + [get_double_column(df, field) for field in BAR_ARRAY_FIELDS[1:]]
+
+        # 写入k线数据
+        self.insert_arrays(table_name, arrays, BAR_FIELD_TYPES)
+
+        self.known_tables.add(table_name)
+
+        start: datetime = convert_ms(int(timestamps.min()))
+        end: datetime = convert_ms(int(timestamps.max()))
+
+        if self.disk_cache:
+            self.disk_cache.invalidate(table_name, start, end)
+
+        if self.bar_cache:
+            self.bar_cache.invalidate((symbol, exchange, interval))
+
+        return start, end
+
+    @pooled
+    def save_tick_dataframe(
+        self,
+        df: pd.DataFrame,
+        symbol: str,
+        exchange: Exchange,
+        stream: bool = False
+    ) -> bool:
+        """保存DataFrame格式的tick数据（需包含datetime列，缺少的数值列写入0），按列整批转换后写入"""
+        if df.empty:
+            return False
+
+        table_name: str = generate_tick_table_name(symbol, exchange)
+
+        # 按列写入时统一通过SQL建表
+        if table_name not in self.known_tables:
+            self.cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table_name} "
+                "USING s_tick(symbol, exchange, count_) "
+                f"TAGS('{symbol}', '{exchange.value}', '0')"
+            )
+
+        timestamps: np.ndarray = convert_timestamps(df["datetime"])
+
+        # 不带localtime时使用datetime（两列可能分别为带时区和不带时区的时间，转换后再合并）
+        localtimes: np.ndarray = timestamps
+        if "localtime" in df:
+            localtimes = np.where(df["localtime"].notna().to_numpy(), convert_timestamps(df["localtime"]), timestamps)
+
+        arrays: list[np.ndarray] = (
+            [timestamps, get_string_column(df, "name")]
+            + [get_double_column(df, field) for field in TICK_DOUBLE_FIELDS]
+            + [localtimes]
+        )
+
+        # 写入tick数据
+        self.insert_arrays(table_name, arrays, TICK_FIELD_TYPES)
+
+        self.known_tables.add(table_name)
+
+        start: datetime = convert_ms(int(timestamps.min()))
+        end: datetime = convert_ms(int(timestamps.max()))
+
+        if self.disk_cache:
+            self.disk_cache.invalidate(table_name, start, end)
+
+        # 根据时间列的范围和数据量更新汇总信息
+        tick: TickData = TickData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=start,
+            gateway_name="DB"
+        )
+        self.update_overview_range(table_name, tick, start, end, len(df), stream)
+
+        return True
+
+    @pooled
+    def insert_arrays(self, table_name: str, arrays: list[np.ndarray], field_types: list[str]) -> None:
+        """按列数组批量写入，参数绑定模式直接绑定各列，其他模式按列整批生成SQL语句"""
+        if self.insert_mode == "stmt":
+            self.bind_arrays(table_name, arrays, field_types)
+            return
+
+        head: str = f"{table_name} VALUES"
+        head_size: int = len(INSERT_PREFIX) + len(head.encode()) + 1
+
+        for i in range(0, len(arrays[0]), FRAME_CHUNK_SIZE):
+            columns: list[list[str]] = [
+                generate_sql_column(array[i:i + FRAME_CHUNK_SIZE], field_type)
+                for array, field_type in zip(arrays, field_types, strict=True)
+            ]
+            rows: list[str] = generate_rows(columns)
+
+            # 单条语句不超过字节预算
+            for start, end in split_rows(rows, self.batch_tuner.budget - head_size):
+                self.execute_segments([(head, rows[start:end])])
+
+    @pooled
+    def bind_arrays(self, table_name: str, arrays: list[np.ndarray], field_types: list[str]) -> None:
+        """通过参数绑定按列数组批量写入"""
+        placeholders: str = ", ".join(["?"] * len(field_types))
+        stmt: taos.TaosStmt = self.conn.statement(f"INSERT INTO {table_name} VALUES({placeholders})")
+
+        try:
+            for i in range(0, len(arrays[0]), self.stmt_batch_size):
+                binds = taos.new_multi_binds(len(field_types))
+                for bind, field_type, array in zip(binds, field_types, arrays, strict=True):
+                    getattr(bind, field_type)(generate_bind_column(array[i:i + self.stmt_batch_size], field_type))
+
+                stmt.bind_param_batch(binds)
+                stmt.execute()
+        finally:
+            stmt.close()
+
+    @pooled
+    def insert_many(
+        self,
+        groups: dict[str, list],
+        heads: dict[str, str],
+        generate: Callable,
+        batch_size: int = 0
+    ) -> None:
+        """多表合并写入，单条语句不超过字节预算（batch_size大于0时同时限制行数）"""
+        budget: int = self.batch_tuner.budget
+
+        segments: list[tuple[str, list[str]]] = []
+        size: int = len(INSERT_PREFIX)
+        count: int = 0
+
+        for table_name, data_set in groups.items():
+            head: str = f"{heads[table_name]} VALUES"
+            head_size: int = len(head.encode()) + 1
+
+            values: list[str] = []
+            segments.append((head, values))
+            size += head_size
+
+            for d in data_set:
+                value: str = generate(d)
+                value_size: int = len(value.encode()) + 1
+
+                # 超出字节预算或行数上限则先提交已有数据
+                if count and (size + value_size > budget or count == batch_size):
+                    self.execute_segments(segments)
+                    budget = self.batch_tuner.budget
+
+                    values = []
+                    segments = [(head, values)]
+                    size = len(INSERT_PREFIX) + head_size
+                    count = 0
+
+                values.append(value)
+                size += value_size
+                count += 1
+
+        if count:
+            self.execute_segments(segments)
+
+    @pooled
+    def execute_segments(self, segments: list[tuple[str, list[str]]]) -> None:
+        """执行多表写入语句（各段为数据表的VALUES子句和各行的值），因超长被拒绝时拆分为两半后重试"""
+        segments = [(head, values) for head, values in segments if values]
+
+        sql: str = " ".join([INSERT_PREFIX] + [f"{head} {' '.join(values)}" for head, values in segments])
+
+        start: float = perf_counter()
+        try:
+            self.cursor.execute(sql)
+        except Exception as e:
+            count: int = sum(len(values) for _, values in segments)
+            if count < 2 or not is_sql_too_long(e):
+                raise
+
+            self.batch_tuner.reject(len(sql.encode()))
+
+            first, second = split_segments(segments, count // 2)
+            self.execute_segments(first)
+            self.execute_segments(second)
+            return
+
+        self.batch_tuner.record(len(sql), perf_counter() - start)
+
+    @pooled
+    def update_overview_many(self, stable: str, groups: dict[str, list], stream: bool) -> None:
+        """批量更新多个数据表的汇总信息"""
+        # 延迟模式下根据写入数据增量计算汇总信息
+        if self.overview_updater:
+            for table_name, data_set in groups.items():
+                self.accumulate_overview(table_name, data_set)
+            return
+
+        table_filter: str = ", ".join([f"'{table_name}'" for table_name in groups])
+
+        # 一次性查询所有表的汇总信息
+        self.cursor.execute(
+            f"SELECT DISTINCT tbname, start_time, end_time, count_ FROM {stable} WHERE tbname IN ({table_filter})"
+        )
+        overviews: dict[str, tuple] = {row[0]: row[1:] for row in self.cursor.fetchall()}
+
+        # 非流式写入时一次性统计所有表的数据量
+        counts: dict[str, int] = {}
+        if not stream:
+            self.cursor.execute(
+                f"SELECT tbname, COUNT(*) FROM {stable} WHERE tbname IN ({table_filter}) PARTITION BY tbname"
+            )
+            counts = {row[0]: int(row[1]) for row in self.cursor.fetchall()}
+
+        for table_name, data_set in groups.items():
+            overview_start, overview_end, overview_count = overviews.get(table_name, (None, None, 0))
+            overview_count = int(overview_count or 0)
+
+            data_start: datetime = min(d.datetime for d in data_set)
+            data_end: datetime = max(d.datetime for d in data_set)
+
+            # 没有该合约
+            if not overview_count:
+                overview_start = data_start
+                overview_end = data_end
+                overview_count = counts.get(table_name, len(data_set))
+            # 已有该合约，流式写入时数据范围只扩展不收缩
+            elif stream:
+                overview_start = min(overview_start, data_start)
+                overview_end = max(overview_end, data_end)
+                overview_count += len(data_set)
+            else:
+                overview_start = min(overview_start, data_start)
+                overview_end = max(overview_end, data_end)
+                overview_count = counts[table_name]
+
+            self.update_overview_tags(table_name, data_set[0], overview_start, overview_end, overview_count)
+
+    @pooled
+    def update_overview_tags(
+        self,
+        table_name: str,
+        data: BarData | TickData,
+        start: datetime,
+        end: datetime,
+        count: int
+    ) -> None:
+        """更新数据表的汇总信息标签"""
+        if self.overview_updater:
+            self.overview_updater.set_state(table_name, start, end, count)
+        else:
+            self.cursor.execute(f"ALTER TABLE {table_name} SET TAG start_time='{start}';")
+            self.cursor.execute(f"ALTER TABLE {table_name} SET TAG end_time='{end}';")
+            self.cursor.execute(f"ALTER TABLE {table_name} SET TAG count_='{count}';")
+
+        # 同步更新内存中的汇总信息
+        if not self.overviews:
+            return
+
+        if isinstance(data, BarData):
+            self.overviews.update_bar(
+                table_name, data.symbol, data.exchange, data.interval, start, end, count      # type: ignore
+            )
+        else:
+            self.overviews.update_tick(table_name, data.symbol, data.exchange, start, end, count)
+
+    @pooled
+    def accumulate_overview(self, table_name: str, data_set: list) -> None:
+        """根据写入的数据增量更新汇总信息"""
+        data_start: datetime = min(d.datetime for d in data_set)
+        data_end: datetime = max(d.datetime for d in data_set)
+
+        self.accumulate_overview_range(table_name, data_set[0], data_start, data_end, len(data_set))
+
+    @pooled
+    def update_overview_range(
+        self,
+        table_name: str,
+        data: BarData | TickData,
+        data_start: datetime,
+        data_end: datetime,
+        data_count: int,
+        stream: bool
+    ) -> None:
+        """根据写入数据的时间范围和数据量更新汇总信息"""
+        # 延迟模式下增量计算汇总信息
+        if self.overview_updater:
+            self.accumulate_overview_range(table_name, data, data_start, data_end, data_count)
+            return
+
+        self.cursor.execute(f"SELECT start_time, end_time, count_ FROM {table_name}")
+        results: list[tuple] = self.cursor.fetchall()
+
+        overview_start, overview_end, overview_count = results[0] if results else (None, None, 0)
+        overview_count = int(overview_count or 0)
+
+        # 没有该合约
+        if not overview_count:
+            overview_start = data_start
+            overview_end = data_end
+            overview_count = data_count
+        # 已有该合约，流式写入时数据范围只扩展不收缩
+        elif stream:
+            overview_start = min(overview_start, data_start)
+            overview_end = max(overview_end, data_end)
+            overview_count += data_count
+        else:
+            overview_start = min(overview_start, data_start)
+            overview_end = max(overview_end, data_end)
+
+            self.cursor.execute(f"select count(*) from {table_name}")
+            results = self.cursor.fetchall()
+            overview_count = int(results[0][0])
+
+        self.update_overview_tags(table_name, data, overview_start, overview_end, overview_count)
+
+    @pooled
+    def accumulate_overview_range(
+        self,
+        table_name: str,
+        data: BarData | TickData,
+        data_start: datetime,
+        data_end: datetime,
+        data_count: int
+    ) -> None:
+        """根据写入数据的时间范围和数据量增量更新汇总信息"""
+        state: OverviewState | None = self.overview_updater.get_state(table_name)     # type: ignore
+
+        # 首次写入时从注册表或数据表标签获取当前汇总信息
+        if not state:
+            state = (None, None, 0)
+
+            if self.overviews:
+                overview = self.overviews.get(table_name)
+                if overview:
+                    state = (overview.start, overview.end, overview.count)
+            else:
+                self.cursor.execute(f"SELECT start_time, end_time, count_ FROM {table_name} LIMIT 1")
+                results: list[tuple] = self.cursor.fetchall()
+                if results:
+                    state = (results[0][0], results[0][1], int(results[0][2] or 0))
+
+        start, end, count = state
+
+        start = min(start, data_start) if start else data_start
+        end = max(end, data_end) if end else data_end
+        count += data_count
+
+        self.update_overview_tags(table_name, data, start, end, count)
+
+    @pooled
+    def write_overview_tags(self, states: dict[str, OverviewState]) -> None:
+        """批量写入汇总信息标签"""
+        for table_name, (start, end, count) in states.items():
+            self.cursor.execute(f"ALTER TABLE {table_name} SET TAG start_time='{start}';")
+            self.cursor.execute(f"ALTER TABLE {table_name} SET TAG end_time='{end}';")
+            self.cursor.execute(f"ALTER TABLE {table_name} SET TAG count_='{count}';")
+
+    def flush_overview(self) -> None:
+        """立即写入延迟更新的汇总信息"""
+        if self.overview_updater:
+            self.overview_updater.flush()
+
+    @pooled
+    def refresh_overview(self) -> None:
+        """根据数据表实际内容重新计算全部汇总信息"""
+        self.flush_overview()
+
+        states: dict[str, OverviewState] = {}
+
+        for stable in ["s_bar", "s_tick"]:
+            self.cursor.execute(
+                f"SELECT tbname, MIN(datetime), MAX(datetime), COUNT(*) FROM {stable} PARTITION BY tbname"
+            )
+            for row in self.cursor.fetchall():
+                states[row[0]] = (row[1], row[2], int(row[3]))
+
+        self.write_overview_tags(states)
+
+        # 清空增量状态并重新加载注册表
+        if self.overview_updater:
+            self.overview_updater.clear()
+
+        self.load_overview()
+
+    @pooled
+    def load_overview(self) -> None:
+        """从数据表标签加载汇总信息"""
+        if not self.overviews:
+            return
+
+        self.overviews.clear()
+
+        self.cursor.execute("SELECT TAGS tbname, symbol, exchange, interval_, start_time, end_time, count_ FROM s_bar")
+        for row in self.cursor.fetchall():
+            self.overviews.update_bar(
+                row[0], row[1], Exchange(row[2]), Interval(row[3]), row[4], row[5], int(row[6] or 0)
+            )
+
+        self.cursor.execute("SELECT TAGS tbname, symbol, exchange, start_time, end_time, count_ FROM s_tick")
+        for row in self.cursor.fetchall():
+            self.overviews.update_tick(
+                row[0], row[1], Exchange(row[2]), row[3], row[4], int(row[5] or 0)
+            )
+
+    @overload
     def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[False] = False
+    ) -> list[BarData]: ...
+
+    @overload
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[True]
+    ) -> BarBatch: ...
+
+    @pooled
+    def load_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        as_batch: bool = False
+    ) -> list[BarData] | BarBatch:
+        """读取K线数据，as_batch为True时返回以列数组保存的BarBatch"""
+        # 列数组容器不经过K线缓存
+        if as_batch:
+            arrays: dict[str, np.ndarray] = self.load_bar_arrays(symbol, exchange, interval, start, end)
+            return BarBatch(symbol, exchange, interval, arrays)
+
+        if not self.bar_cache:
+            return self.read_bar_data(symbol, exchange, interval, start, end)
+
+        # 通过缓存读取，仅从数据库加载缺失的区间
+        def loader(range_start: datetime, range_end: datetime) -> list[BarData]:
+            return self.read_bar_data(symbol, exchange, interval, range_start, range_end)
+
+        return self.bar_cache.get((symbol, exchange, interval), start, end, loader)
+
+    @pooled
+    def read_bar_data(
         self,
         symbol: str,
         exchange: Exchange,
@@ -172,89 +1072,439 @@ class TaosDatabase(BaseDatabase):
         start: datetime,
         end: datetime
     ) -> list[BarData]:
-        """读取K线数据"""
+        """读取K线数据，启用本地磁盘缓存时优先从缓存文件读取"""
+        table_name: str = generate_bar_table_name(symbol, exchange, interval)
+
+        if not self.disk_cache or table_name not in self.known_tables:
+            return self.query_bar_data(symbol, exchange, interval, start, end)
+
+        arrays: dict[str, np.ndarray] = self.load_disk_arrays(
+            table_name, BAR_ARRAY_FIELDS, BAR_ARRAY_FIELDS, start, end
+        )
+
+        return BarBatch(symbol, exchange, interval, arrays).to_list()
+
+    @pooled
+    def query_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> list[BarData]:
+        """从数据库读取K线数据"""
         # 生成数据表名
         table_name: str = "_".join(["bar", symbol.replace("-", "_"), exchange.value, interval.value])
 
+        # 没有该周期的K线数据表时，从对应周期的合成流读取
+        if table_name not in self.known_tables:
+            stream_table: str = self.streams.get_bar_table_name(symbol, exchange, interval)
+            if stream_table:
+                return self.query_bar_table(stream_table, symbol, exchange, interval, start, end)
+
         # 从数据库读取数据
         # df: pd.DataFrame = pd.read_sql(f"select *, interval_ from {table_name} WHERE datetime BETWEEN '{start}' AND '{end}'", self.conn)
 
-        # # 返回BarData列表
-        # bars: list[BarData] = []
+        # # 返回BarData列表
+        # bars: list[BarData] = []
+
+        # for row in df.itertuples():
+        #     bar: BarData = BarData(
+        #         symbol=symbol,
+        #         exchange=exchange,
+        #         datetime=row.datetime.astimezone(DB_TZ),
+        #         interval=Interval(row.interval_),
+        #         volume=row.volume,
+        #         turnover=row.turnover,
+        #         open_interest=row.open_interest,
+        #         open_price=row.open_price,
+        #         high_price=row.high_price,
+        #         low_price=row.low_price,
+        #         close_price=row.close_price,
+        #         gateway_name="DB"
+        #     )
+        #     bars.append(bar)
+
+        sql = f"""
+            SELECT 
+                datetime,
+                volume,
+                turnover,
+                open_interest,
+                open_price,
+                high_price,
+                low_price,
+                close_price
+            FROM {table_name}
+            WHERE 
+                datetime BETWEEN '{start.strftime("%Y-%m-%d %H:%M:%S")}' 
+                AND '{end.strftime("%Y-%m-%d %H:%M:%S")}'
+        """
+
+         # 执行原生TDengine查询
+        result = self.conn.query(sql)
+        
+        # 处理结果集
+        bars: list[BarData] = []
+        for row in result:
+            # 转换时区（假设原始数据存储为UTC）
+            # db_time = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S.%f")
+            db_time = row[0].astimezone(DB_TZ)
+            
+            # 构建BarData对象
+            bar = BarData(
+                symbol=symbol,
+                exchange=exchange,
+                datetime=db_time,
+                interval=interval,
+                volume=row[1],
+                turnover=row[2],
+                open_interest=row[3],
+                open_price=row[4],
+                high_price=row[5],
+                low_price=row[6],
+                close_price=row[7],
+                gateway_name="DB"
+            )
+            bars.append(bar)
+
+        return bars
+
+    @pooled
+    def load_resampled_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        source_interval: Interval,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str = ""
+    ) -> list[BarData]:
+        """在数据库中将K线按时间窗口合成为更大周期，window和offset格式如5m、1h、1d"""
+        interval: Interval = WINDOW_INTERVALS.get(window[-1], source_interval)
+        sql: str = self.generate_resample_sql(symbol, exchange, source_interval, window, start, end, offset)
+
+        result: taos.TaosResult = self.conn.query(sql)
+
+        return [parse_bar_row(row, symbol, exchange, interval) for row in result]
+
+    def generate_resample_sql(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        source_interval: Interval,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str
+    ) -> str:
+        """生成K线合成的查询语句，结果列与BAR_ARRAY_FIELDS一致"""
+        table_name: str = generate_bar_table_name(symbol, exchange, source_interval)
+        interval_clause: str = generate_interval_clause(window, offset)
+
+        sql: str = f"""
+            SELECT
+                _wstart,
+                SUM(volume),
+                SUM(turnover),
+                LAST(open_interest),
+                FIRST(open_price),
+                MAX(high_price),
+                MIN(low_price),
+                LAST(close_price)
+            FROM {table_name}
+            WHERE
+                datetime BETWEEN '{start.strftime("%Y-%m-%d %H:%M:%S")}'
+                AND '{end.strftime("%Y-%m-%d %H:%M:%S")}'
+            {interval_clause}
+        """
+
+        return sql
+
+    @pooled
+    def load_stream_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        source: str,
+        window: str,
+        start: datetime,
+        end: datetime
+    ) -> list[BarData]:
+        """读取合成流输出的K线数据，source为bar"""
+        table_name: str = self.streams.get_table_name(source, window, symbol, exchange)
+        if not table_name:
+            return []
+
+        interval: Interval = WINDOW_INTERVALS.get(window[-1], Interval.MINUTE)
+
+        return self.query_bar_table(table_name, symbol, exchange, interval, start, end)
+
+    @pooled
+    def query_bar_table(
+        self,
+        table_name: str,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> list[BarData]:
+        """读取指定数据表中的K线数据"""
+        sql: str = (
+            f"SELECT {', '.join(BAR_ARRAY_FIELDS)} FROM {table_name} "
+            f"WHERE datetime BETWEEN '{start.strftime('%Y-%m-%d %H:%M:%S')}' "
+            f"AND '{end.strftime('%Y-%m-%d %H:%M:%S')}' "
+            "ORDER BY datetime"
+        )
+
+        result: taos.TaosResult = self.conn.query(sql)
+
+        return [parse_bar_row(row, symbol, exchange, interval) for row in result]
+
+    @pooled
+    def load_tick_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str = "",
+        interval: Interval | None = None
+    ) -> list[BarData]:
+        """在数据库中将tick数据按时间窗口合成为K线"""
+        interval = interval or get_window_interval(window)
+        sql: str = self.generate_tick_bar_sql(symbol, exchange, window, start, end, offset)
+
+        result: taos.TaosResult = self.conn.query(sql)
+
+        return [parse_bar_row(row, symbol, exchange, interval) for row in result]
+
+    @pooled
+    def load_tick_bar_arrays(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str = ""
+    ) -> dict[str, np.ndarray]:
+        """在数据库中将tick数据按时间窗口合成为K线，返回列数组"""
+        sql: str = self.generate_tick_bar_sql(
+            symbol, exchange, window, start, end, offset, "CAST(_wstart AS BIGINT)"
+        )
+
+        result: taos.TaosResult = self.conn.query(sql)
+        block: np.ndarray = np.array(result.fetch_all(), dtype=np.float64).reshape(-1, len(BAR_ARRAY_FIELDS))
+
+        arrays: dict[str, np.ndarray] = {}
+        for i, field in enumerate(BAR_ARRAY_FIELDS):
+            if field in TIMESTAMP_FIELDS:
+                arrays[field] = block[:, i].astype(np.int64)
+            else:
+                arrays[field] = block[:, i].copy()
+
+        return arrays
+
+    @pooled
+    def save_tick_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str = "",
+        interval: Interval | None = None
+    ) -> int:
+        """在数据库中将tick数据合成为K线并直接写入K线数据表，返回数据表中的K线条数"""
+        interval = interval or get_window_interval(window)
+        table_name: str = generate_bar_table_name(symbol, exchange, interval)
+
+        if table_name not in self.known_tables:
+            self.cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {table_name} "
+                "USING s_bar(symbol, exchange, interval_, count_) "
+                f"TAGS('{symbol}', '{exchange.value}', '{interval.value}', '0')"
+            )
+            self.known_tables.add(table_name)
+
+        # 合成结果不经过客户端，直接写入K线数据表
+        sql: str = self.generate_tick_bar_sql(symbol, exchange, window, start, end, offset)
+        self.cursor.execute(f"INSERT INTO {table_name} {sql}")
+
+        if self.disk_cache:
+            self.disk_cache.invalidate(table_name, start, end)
+
+        if self.bar_cache:
+            self.bar_cache.invalidate((symbol, exchange, interval))
+
+        # 根据数据表实际内容更新汇总信息
+        self.cursor.execute(f"SELECT FIRST(datetime), LAST(datetime), COUNT(*) FROM {table_name}")
+        results: list[tuple] = self.cursor.fetchall()
+        if not results or not results[0][2]:
+            return 0
+
+        overview_start, overview_end, overview_count = results[0]
+        bar: BarData = BarData(
+            symbol=symbol,
+            exchange=exchange,
+            datetime=overview_start,
+            interval=interval,
+            gateway_name="DB"
+        )
+
+        self.update_overview_tags(table_name, bar, overview_start, overview_end, int(overview_count))
+
+        return int(overview_count)
+
+    @pooled
+    def generate_tick_bar_sql(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str,
+        time_column: str = "_wstart"
+    ) -> str:
+        """生成tick合成K线的查询语句，结果列与BAR_ARRAY_FIELDS一致"""
+        table_name: str = generate_tick_table_name(symbol, exchange)
+        interval_clause: str = generate_interval_clause(window, offset)
+
+        # 以区间开始前的最后一条tick作为基准，计算区间内每条tick的成交量增量（DIFF不输出基准行）
+        start_str: str = start.strftime("%Y-%m-%d %H:%M:%S")
+        end_str: str = end.strftime("%Y-%m-%d %H:%M:%S")
+
+        self.cursor.execute(f"SELECT LAST(datetime) FROM {table_name} WHERE datetime < '{start_str}'")
+        results: list[tuple] = self.cursor.fetchall()
+
+        first_time: datetime | None = None
+        if results and results[0][0]:
+            start_condition: str = f"datetime >= {generate_timestamp(results[0][0])}"
+        else:
+            start_condition = f"datetime >= '{start_str}'"
 
-        # for row in df.itertuples():
-        #     bar: BarData = BarData(
-        #         symbol=symbol,
-        #         exchange=exchange,
-        #         datetime=row.datetime.astimezone(DB_TZ),
-        #         interval=Interval(row.interval_),
-        #         volume=row.volume,
-        #         turnover=row.turnover,
-        #         open_interest=row.open_interest,
-        #         open_price=row.open_price,
-        #         high_price=row.high_price,
-        #         low_price=row.low_price,
-        #         close_price=row.close_price,
-        #         gateway_name="DB"
-        #     )
-        #     bars.append(bar)
+            # 区间从数据表的第一条tick开始时没有基准，DIFF会舍弃该tick，需要单独加入
+            self.cursor.execute(
+                f"SELECT FIRST(datetime) FROM {table_name} "
+                f"WHERE datetime >= '{start_str}' AND datetime <= '{end_str}'"
+            )
+            results = self.cursor.fetchall()
+            if results and results[0][0]:
+                first_time = results[0][0]
 
-        sql = f"""
-            SELECT 
+        tick_sql: str = f"""
+            SELECT
                 datetime,
                 volume,
                 turnover,
                 open_interest,
-                open_price,
-                high_price,
-                low_price,
-                close_price
+                last_price,
+                DIFF(volume) AS volume_delta,
+                DIFF(turnover) AS turnover_delta
             FROM {table_name}
-            WHERE 
-                datetime BETWEEN '{start.strftime("%Y-%m-%d %H:%M:%S")}' 
-                AND '{end.strftime("%Y-%m-%d %H:%M:%S")}'
+            WHERE
+                {start_condition}
+                AND datetime <= '{end_str}'
         """
 
-         # 执行原生TDengine查询
-        result = self.conn.query(sql)
-        
-        # 处理结果集
-        bars: list[BarData] = []
-        for row in result:
-            # 转换时区（假设原始数据存储为UTC）
-            # db_time = datetime.strptime(row[0], "%Y-%m-%d %H:%M:%S.%f")
-            db_time = row[0].astimezone(DB_TZ)
-            
-            # 构建BarData对象
-            bar = BarData(
-                symbol=symbol,
-                exchange=exchange,
-                datetime=db_time,
-                interval=interval,
-                volume=row[1],
-                turnover=row[2],
-                open_interest=row[3],
-                open_price=row[4],
-                high_price=row[5],
-                low_price=row[6],
-                close_price=row[7],
-                gateway_name="DB"
+        # 第一条tick以其累计值作为增量
+        if first_time:
+            tick_sql = f"""
+                SELECT
+                    datetime,
+                    volume,
+                    turnover,
+                    open_interest,
+                    last_price,
+                    volume AS volume_delta,
+                    turnover AS turnover_delta
+                FROM {table_name}
+                WHERE datetime = {generate_timestamp(first_time)}
+                UNION ALL
+                {tick_sql}
+                ORDER BY datetime
+            """
+
+        # 累计成交量在交易时段切换时归零，增量为负时以当前累计值作为增量
+        sql: str = f"""
+            SELECT
+                {time_column},
+                SUM(CASE WHEN volume_delta < 0 THEN volume ELSE volume_delta END),
+                SUM(CASE WHEN turnover_delta < 0 THEN turnover ELSE turnover_delta END),
+                LAST(open_interest),
+                FIRST(last_price),
+                MAX(last_price),
+                MIN(last_price),
+                LAST(last_price)
+            FROM (
+                {tick_sql}
             )
-            bars.append(bar)
+            {interval_clause}
+        """
 
-        return bars
+        return sql
 
+    @overload
     def load_tick_data(
         self,
         symbol: str,
         exchange: Exchange,
         start: datetime,
-        end: datetime
-    ) -> list[TickData]:
-        """读取tick数据"""
+        end: datetime,
+        as_batch: Literal[False] = False
+    ) -> list[TickData]: ...
+
+    @overload
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        as_batch: Literal[True]
+    ) -> TickBatch: ...
+
+    @pooled
+    def load_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        as_batch: bool = False
+    ) -> list[TickData] | TickBatch:
+        """读取tick数据，as_batch为True时返回以列数组保存的TickBatch"""
         # 生成数据表名
         table_name: str = "_".join(["tick", symbol.replace("-", "_"), exchange.value])
 
+        arrays: dict[str, np.ndarray]
+
+        # 合约名称不随tick变化，列数组容器中只保存一份
+        if as_batch:
+            arrays = self.load_tick_arrays(symbol, exchange, start, end)
+
+            name: str = ""
+            if len(arrays["datetime"]):
+                self.cursor.execute(f"SELECT LAST(name) FROM {table_name}")
+                results: list[tuple] = self.cursor.fetchall()
+                name = results[0][0] if results else ""
+
+            return TickBatch(symbol, exchange, arrays, name)
+
+        # 启用本地磁盘缓存时优先从缓存文件读取
+        if self.disk_cache and table_name in self.known_tables:
+            arrays = self.load_disk_arrays(
+                table_name, TICK_QUERY_FIELDS, TICK_QUERY_FIELDS, start, end
+            )
+            return TickBatch(symbol, exchange, arrays).to_list()
+
         # 从数据库读取数据
         df: pd.DataFrame = pd.read_sql(f"select * from {table_name} WHERE datetime BETWEEN '{start}' AND '{end}'", self.conn)
 
@@ -304,6 +1554,357 @@ class TaosDatabase(BaseDatabase):
 
         return ticks
 
+    @pooled
+    def load_bar_arrays(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """读取K线数据为列数组，datetime为毫秒时间戳"""
+        table_name: str = generate_bar_table_name(symbol, exchange, interval)
+
+        if self.disk_cache and table_name in self.known_tables:
+            return self.load_disk_arrays(table_name, BAR_ARRAY_FIELDS, BAR_ARRAY_FIELDS, start, end)
+
+        return self.query_arrays(table_name, BAR_ARRAY_FIELDS, start, end)
+
+    @pooled
+    def load_tick_arrays(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """读取tick数据为列数组，datetime和localtime为毫秒时间戳"""
+        table_name: str = generate_tick_table_name(symbol, exchange)
+
+        if self.disk_cache and table_name in self.known_tables:
+            return self.load_disk_arrays(table_name, TICK_QUERY_FIELDS, TICK_ARRAY_FIELDS, start, end)
+
+        return self.query_arrays(table_name, TICK_ARRAY_FIELDS, start, end)
+
+    def load_disk_arrays(
+        self,
+        table_name: str,
+        file_fields: list[str],
+        fields: list[str],
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """通过本地磁盘缓存读取列数组，缓存文件保存file_fields中的全部字段"""
+        def fetch(name: str, start_ms: int, end_ms: int) -> dict[str, np.ndarray]:
+            return self.fetch_arrays(name, file_fields, start_ms, end_ms)
+
+        parts: list[dict[str, np.ndarray]] = self.disk_cache.get(          # type: ignore
+            table_name, start, end, fetch, self.count_days
+        )
+
+        arrays: dict[str, np.ndarray] = {}
+        for field in fields:
+            if len(parts) == 1:
+                arrays[field] = parts[0][field]
+            elif parts:
+                arrays[field] = np.concatenate([part[field] for part in parts])
+            else:
+                arrays[field] = np.empty(0, dtype=get_field_dtype(field))
+
+        return arrays
+
+    @pooled
+    def fetch_arrays(self, table_name: str, fields: list[str], start_ms: int, end_ms: int) -> dict[str, np.ndarray]:
+        """读取毫秒时间戳区间[start_ms, end_ms)内的数据为列数组"""
+        columns: list[str] = []
+        for field in fields:
+            if field in TIMESTAMP_FIELDS:
+                columns.append(f"CAST({field} AS BIGINT)")
+            else:
+                columns.append(field)
+
+        result: taos.TaosResult = self.conn.query(
+            f"SELECT {', '.join(columns)} FROM {table_name} "
+            f"WHERE datetime >= {start_ms} AND datetime < {end_ms} ORDER BY datetime"
+        )
+        rows: list[tuple] = result.fetch_all()
+
+        values: list[tuple] = list(zip(*rows, strict=True)) if rows else [()] * len(fields)
+
+        arrays: dict[str, np.ndarray] = {}
+        for field, column in zip(fields, values, strict=True):
+            dtype: type = get_field_dtype(field)
+
+            if dtype is np.int64:
+                # 为空的时间戳使用datetime填充
+                array: np.ndarray = np.array(column, dtype=np.float64)
+                if field != "datetime":
+                    array = np.where(np.isnan(array), arrays["datetime"], array)
+                arrays[field] = array.astype(np.int64)
+            else:
+                arrays[field] = np.array(column, dtype=dtype)
+
+        return arrays
+
+    @pooled
+    def count_days(self, table_name: str, start_ms: int, end_ms: int) -> dict[int, int]:
+        """按连接时区的自然日统计毫秒时间戳区间[start_ms, end_ms)内的数据条数，返回日期零点的毫秒时间戳到条数的映射"""
+        result: taos.TaosResult = self.conn.query(
+            f"SELECT CAST(TIMETRUNCATE(datetime, 1d) AS BIGINT), COUNT(*) FROM {table_name} "
+            f"WHERE datetime >= {start_ms} AND datetime < {end_ms} GROUP BY TIMETRUNCATE(datetime, 1d)"
+        )
+        return {int(row[0]): int(row[1]) for row in result.fetch_all()}
+
+    def invalidate_disk_cache(self, table_name: str, data_set: list | None = None) -> None:
+        """写入或删除数据后移除对应日期的本地磁盘缓存"""
+        if not self.disk_cache:
+            return
+
+        if data_set is None:
+            self.disk_cache.invalidate(table_name)
+        else:
+            times: list[datetime] = [data.datetime for data in data_set]
+            self.disk_cache.invalidate(table_name, min(times), max(times))
+
+    @pooled
+    def query_arrays(
+        self,
+        table_name: str,
+        fields: list[str],
+        start: datetime,
+        end: datetime
+    ) -> dict[str, np.ndarray]:
+        """按列读取数据表到预分配的数组"""
+        condition: str = (
+            f"WHERE datetime BETWEEN '{start.strftime('%Y-%m-%d %H:%M:%S')}' "
+            f"AND '{end.strftime('%Y-%m-%d %H:%M:%S')}'"
+        )
+
+        # 查询数据条数用于预分配数组
+        self.cursor.execute(f"SELECT COUNT(*) FROM {table_name} {condition}")
+        results: list[tuple] = self.cursor.fetchall()
+        size: int = int(results[0][0]) if results else 0
+
+        arrays: dict[str, np.ndarray] = {}
+        for field in fields:
+            if field in TIMESTAMP_FIELDS:
+                arrays[field] = np.empty(size, dtype=np.int64)
+            else:
+                arrays[field] = np.empty(size, dtype=np.float64)
+
+        if not size:
+            return arrays
+
+        # 时间戳直接转换为整数，避免创建datetime对象
+        columns: list[str] = []
+        for field in fields:
+            if field in TIMESTAMP_FIELDS:
+                columns.append(f"CAST({field} AS BIGINT)")
+            else:
+                columns.append(field)
+
+        result: taos.TaosResult = self.conn.query(
+            f"SELECT {', '.join(columns)} FROM {table_name} {condition} ORDER BY datetime"
+        )
+
+        # 按数据块整体转换后填充各列
+        pos: int = 0
+        for rows, length in result.blocks_iter():
+            length = min(length, size - pos)
+            if length <= 0:
+                break
+
+            block: np.ndarray = np.array(rows[:length], dtype=np.float64)
+            for i, field in enumerate(fields):
+                column: np.ndarray = block[:, i]
+
+                # 为空的时间戳使用datetime填充
+                if field in TIMESTAMP_FIELDS:
+                    column = np.where(np.isnan(column), block[:, 0], column)
+
+                arrays[field][pos:pos + length] = column
+
+            pos += length
+
+        # 查询期间数据减少时截断
+        if pos < size:
+            for field in fields:
+                arrays[field] = arrays[field][:pos]
+
+        return arrays
+
+    def iter_bar_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000,
+        prefetch: bool = False
+    ) -> Iterator[list[BarData]]:
+        """分批读取K线数据，每批最多batch_size条"""
+        table_name: str = generate_bar_table_name(symbol, exchange, interval)
+
+        def parse(row: tuple) -> BarData:
+            return parse_bar_row(row, symbol, exchange, interval)
+
+        return self.iter_in_batch(table_name, BAR_ARRAY_FIELDS, parse, start, end, batch_size, prefetch)
+
+    def iter_tick_data(
+        self,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime,
+        end: datetime,
+        batch_size: int = 10000,
+        prefetch: bool = False
+    ) -> Iterator[list[TickData]]:
+        """分批读取tick数据，每批最多batch_size条"""
+        table_name: str = generate_tick_table_name(symbol, exchange)
+
+        def parse(row: tuple) -> TickData:
+            return parse_tick_row(row, symbol, exchange)
+
+        return self.iter_in_batch(table_name, TICK_QUERY_FIELDS, parse, start, end, batch_size, prefetch)
+
+    def iter_in_batch(
+        self,
+        table_name: str,
+        fields: list[str],
+        parse: Callable,
+        start: datetime,
+        end: datetime,
+        batch_size: int,
+        prefetch: bool
+    ) -> Iterator[list]:
+        """以时间戳为游标分页读取数据表"""
+        sql: str = (
+            f"SELECT {', '.join(fields)} FROM {table_name} "
+            "WHERE {} "
+            f"AND datetime <= '{end.strftime('%Y-%m-%d %H:%M:%S')}' "
+            f"ORDER BY datetime LIMIT {batch_size}"
+        )
+
+        def fetch(condition: str) -> list:
+            with self.pool.connection() as conn:
+                result: taos.TaosResult = conn.query(sql.format(condition))
+                return [parse(row) for row in result]
+
+        # 开启预读时在后台线程中读取下一页
+        executor: ThreadPoolExecutor | None = None
+        if prefetch:
+            executor = ThreadPoolExecutor(max_workers=1)
+
+        try:
+            batch: list = fetch(f"datetime >= '{start.strftime('%Y-%m-%d %H:%M:%S')}'")
+
+            while batch:
+                # 数据不足一批说明已经读取完毕
+                if len(batch) < batch_size:
+                    yield batch
+                    return
+
+                condition: str = f"datetime > {generate_timestamp(batch[-1].datetime)}"
+
+                if executor:
+                    future: Future = executor.submit(fetch, condition)
+                    yield batch
+                    batch = future.result()
+                else:
+                    yield batch
+                    batch = fetch(condition)
+        finally:
+            if executor:
+                executor.shutdown()
+
+    @timed
+    def load_bar_data_multi(
+        self,
+        vt_symbols: list[str],
+        interval: Interval,
+        start: datetime,
+        end: datetime,
+        workers: int = 1
+    ) -> dict[str, list[BarData]]:
+        """通过超级表一次读取多个合约的K线数据，按本地代码返回"""
+        tables: dict[str, tuple[str, str, Exchange]] = {}
+        for vt_symbol in vt_symbols:
+            symbol, exchange = extract_vt_symbol(vt_symbol)
+            tables[generate_bar_table_name(symbol, exchange, interval)] = (vt_symbol, symbol, exchange)
+
+        def parse(row: tuple, symbol: str, exchange: Exchange) -> BarData:
+            return parse_bar_row(row, symbol, exchange, interval)
+
+        return self.query_multi("s_bar", tables, BAR_ARRAY_FIELDS, parse, start, end, workers)
+
+    @timed
+    def load_tick_data_multi(
+        self,
+        vt_symbols: list[str],
+        start: datetime,
+        end: datetime,
+        workers: int = 1
+    ) -> dict[str, list[TickData]]:
+        """通过超级表一次读取多个合约的tick数据，按本地代码返回"""
+        tables: dict[str, tuple[str, str, Exchange]] = {}
+        for vt_symbol in vt_symbols:
+            symbol, exchange = extract_vt_symbol(vt_symbol)
+            tables[generate_tick_table_name(symbol, exchange)] = (vt_symbol, symbol, exchange)
+
+        return self.query_multi("s_tick", tables, TICK_QUERY_FIELDS, parse_tick_row, start, end, workers)
+
+    def query_multi(
+        self,
+        stable: str,
+        tables: dict[str, tuple[str, str, Exchange]],
+        fields: list[str],
+        parse: Callable,
+        start: datetime,
+        end: datetime,
+        workers: int
+    ) -> dict:
+        """按数据表名过滤超级表，将结果拆分到各合约，workers大于1时分组并行查询"""
+        results: dict[str, list] = {vt_symbol: [] for vt_symbol, _, _ in tables.values()}
+        if not tables:
+            return results
+
+        sql: str = (
+            f"SELECT tbname, {', '.join(fields)} FROM {stable} "
+            "WHERE tbname IN ({}) "
+            f"AND datetime BETWEEN '{start.strftime('%Y-%m-%d %H:%M:%S')}' "
+            f"AND '{end.strftime('%Y-%m-%d %H:%M:%S')}' "
+            "PARTITION BY tbname"
+        )
+
+        def fetch(names: list[str]) -> None:
+            with self.pool.connection() as conn:
+                result: taos.TaosResult = conn.query(sql.format(", ".join(f"'{name}'" for name in names)))
+
+                for row in result:
+                    vt_symbol, symbol, exchange = tables[row[0]]
+                    results[vt_symbol].append(parse(row[1:], symbol, exchange))
+
+        names: list[str] = list(tables)
+
+        if workers > 1 and len(names) > 1:
+            size: int = -(-len(names) // workers)
+            chunks: list[list[str]] = [names[i:i + size] for i in range(0, len(names), size)]
+
+            with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                for future in [executor.submit(fetch, chunk) for chunk in chunks]:
+                    future.result()
+        else:
+            fetch(names)
+
+        # 分区内的数据按时间排序，已有序时排序开销为线性
+        for data in results.values():
+            data.sort(key=lambda d: d.datetime)
+
+        return results
+
+    @pooled
     def load_last_tick_data(
         self,
         symbol: str,
@@ -369,7 +1970,7 @@ class TaosDatabase(BaseDatabase):
 
         # 转换时区（假设原始数据存储为UTC）
         tick_time = row[0].astimezone(DB_TZ)
-        local_time = row[32].astimezone(DB_TZ)
+        local_time = row[32].astimezone(DB_TZ) if row[32] else None
             
         tick: TickData = TickData(
                 symbol=symbol,
@@ -412,6 +2013,7 @@ class TaosDatabase(BaseDatabase):
         
         return tick
 
+    @pooled
     def load_last_bar_data(
         self,
         symbol: str,
@@ -471,6 +2073,7 @@ class TaosDatabase(BaseDatabase):
         
         return bar
 
+    @pooled
     def delete_bar_data(
         self,
         symbol: str,
@@ -488,9 +2091,21 @@ class TaosDatabase(BaseDatabase):
 
         # 执行K线删除
         self.cursor.execute(f"DROP TABLE {table_name}")
+        self.known_tables.discard(table_name)
+        self.invalidate_disk_cache(table_name)
+
+        if self.overview_updater:
+            self.overview_updater.remove(table_name)
+
+        if self.overviews:
+            self.overviews.remove(table_name)
+
+        if self.bar_cache:
+            self.bar_cache.invalidate((symbol, exchange, interval))
 
         return count
 
+    @pooled
     def delete_tick_data(
         self,
         symbol: str,
@@ -507,9 +2122,18 @@ class TaosDatabase(BaseDatabase):
 
         # 删除tick数据
         self.cursor.execute(f"DROP TABLE {table_name}")
+        self.known_tables.discard(table_name)
+        self.invalidate_disk_cache(table_name)
+
+        if self.overview_updater:
+            self.overview_updater.remove(table_name)
+
+        if self.overviews:
+            self.overviews.remove(table_name)
 
         return count
 
+    @pooled
     def delete_bar_by_datetime(
         self,
         symbol: str,
@@ -527,6 +2151,12 @@ class TaosDatabase(BaseDatabase):
         try:
             # 删除指定datetime的K线数据
             self.cursor.execute(f"DELETE FROM {table_name} WHERE datetime = '{dt_str}'")
+
+            if self.disk_cache:
+                self.disk_cache.invalidate(table_name, dt, dt)
+
+            if self.bar_cache:
+                self.bar_cache.invalidate((symbol, exchange, interval))
             
             # 更新汇总信息
             self.cursor.execute(f"select count(*) from {table_name}")
@@ -537,14 +2167,38 @@ class TaosDatabase(BaseDatabase):
 
             # 更新汇总信息
             self.cursor.execute(f"ALTER TABLE {table_name} SET TAG count_='{overview_count}';")
+
+            if self.overviews:
+                self.overviews.update_count(table_name, overview_count)
+
+            if self.overview_updater:
+                self.overview_updater.set_count(table_name, overview_count)
             
             return True
         except Exception as e:
             print(f"删除K线数据失败: {e}")
             return False
 
+    def get_cache_statistics(self) -> dict[str, int]:
+        """查询K线缓存统计信息"""
+        if not self.bar_cache:
+            return {}
+
+        return self.bar_cache.get_statistics()
+
+    def get_slow_queries(self, count: int = 10, key: str = "total") -> list[dict]:
+        """查询慢查询最严重的语句指纹，key可选total、p50、p99、max、count"""
+        if not self.slow_log:
+            return []
+
+        return self.slow_log.get_top(count, key)
+
+    @pooled
     def get_bar_overview(self) -> list[BarOverview]:
         """查询K线汇总信息"""
+        if self.overviews:
+            return self.overviews.get_bar_overviews()
+
         # 从数据库读取数据
         df: pd.DataFrame = pd.read_sql("SELECT DISTINCT symbol, exchange, interval_, start_time, end_time, count_ FROM s_bar", self.conn)
 
@@ -564,8 +2218,12 @@ class TaosDatabase(BaseDatabase):
 
         return overviews
 
+    @pooled
     def get_tick_overview(self) -> list[TickOverview]:
         """查询Tick汇总信息"""
+        if self.overviews:
+            return self.overviews.get_tick_overviews()
+
         # 从数据库读取数据
         df: pd.DataFrame = pd.read_sql("SELECT DISTINCT symbol, exchange, start_time, end_time, count_ FROM s_tick", self.conn)
 
@@ -584,6 +2242,7 @@ class TaosDatabase(BaseDatabase):
 
         return overviews
 
+    @pooled
     def save_main_contract_data(self, data: list[MainContract]) -> bool:
         """保存主力合约数据"""
         if not data:
@@ -611,7 +2270,9 @@ class TaosDatabase(BaseDatabase):
             "USING s_main_contract(product, exchange, start_date, end_date, count_) "
             f"TAGS('{product}', '{exchange.value}', NULL, NULL, '0')"
         )
-        self.cursor.execute(create_table_script)
+        if table_name not in self.known_tables:
+            self.cursor.execute(create_table_script)
+            self.known_tables.add(table_name)
         
         # 写入主力合约数据
         data_values = []
@@ -666,6 +2327,7 @@ class TaosDatabase(BaseDatabase):
         
         return True
     
+    @pooled
     def load_main_contract_data(self, product: str, exchange: Exchange, start: datetime, end: datetime) -> list[MainContract]:
         """读取主力合约数据"""
         # 生成表名
@@ -705,28 +2367,151 @@ class TaosDatabase(BaseDatabase):
             # print(f"查询主力合约数据失败: {e}")
             return []
 
-    def insert_in_batch(self, table_name: str, data_set: list, batch_size: int) -> None:
-        """数据批量插入数据库"""
+    @pooled
+    def insert_in_batch(self, table_name: str, data_set: list, batch_size: int = 0) -> None:
+        """数据批量插入数据库，SQL模式下单条语句不超过字节预算（batch_size大于0时同时限制行数）"""
+        if self.insert_mode == "stmt":
+            self.insert_by_stmt(table_name, data_set, self.stmt_batch_size)
+            return
+        elif self.insert_mode == "schemaless":
+            self.insert_by_schemaless(table_name, data_set, self.sml_batch_size)
+            return
+
         if table_name.split("_")[0] == "bar":
             generate: Callable = generate_bar
         else:
             generate = generate_tick
 
-        data: list[str] = [f"insert into {table_name} values"]
-        count: int = 0
+        self.insert_many({table_name: data_set}, {table_name: table_name}, generate, batch_size)
+
+    @pooled
+    def insert_by_stmt(self, table_name: str, data_set: list, batch_size: int) -> None:
+        """通过参数绑定批量插入数据库"""
+        if table_name.split("_")[0] == "bar":
+            generate: Callable = generate_bar_columns
+            field_types: list[str] = BAR_FIELD_TYPES
+        else:
+            generate = generate_tick_columns
+            field_types = TICK_FIELD_TYPES
+
+        placeholders: str = ", ".join(["?"] * len(field_types))
+        stmt: taos.TaosStmt = self.conn.statement(f"INSERT INTO {table_name} VALUES({placeholders})")
+
+        try:
+            for i in range(0, len(data_set), batch_size):
+                columns: list[list] = generate(data_set[i:i + batch_size])
+
+                # 按列类型绑定数据缓冲区
+                binds = taos.new_multi_binds(len(field_types))
+                for bind, field_type, values in zip(binds, field_types, columns, strict=True):
+                    getattr(bind, field_type)(values)
+
+                stmt.bind_param_batch(binds)
+                stmt.execute()
+        finally:
+            stmt.close()
+
+    @pooled
+    def insert_by_schemaless(self, table_name: str, data_set: list, batch_size: int) -> None:
+        """通过行协议无模式写入数据库"""
+        if not data_set:
+            return
+
+        if table_name.split("_")[0] == "bar":
+            generate: Callable = generate_bar_line
+            tags: str = generate_bar_tags(data_set[0], table_name, self.sml_table_tag)
+        else:
+            generate = generate_tick_line
+            tags = generate_tick_tags(data_set[0], table_name, self.sml_table_tag)
+
+        for i in range(0, len(data_set), batch_size):
+            lines: list[str] = [generate(d, tags) for d in data_set[i:i + batch_size]]
+
+            self.conn.schemaless_insert(
+                lines,
+                taos.SmlProtocol.LINE_PROTOCOL,
+                taos.SmlPrecision.MILLI_SECONDS
+            )
+
+        # 首次写入的数据表检查子表名，客户端未配置smlChildTableName时数据库会使用哈希值命名
+        if table_name not in self.known_tables:
+            self.check_schemaless_table(table_name)
+
+
+def split_segments(
+    segments: list[tuple[str, list[str]]],
+    count: int
+) -> tuple[list[tuple[str, list[str]]], list[tuple[str, list[str]]]]:
+    """按行数将多表写入的各段拆分为两部分"""
+    first: list[tuple[str, list[str]]] = []
+    second: list[tuple[str, list[str]]] = []
+
+    for head, values in segments:
+        if count >= len(values):
+            first.append((head, values))
+            count -= len(values)
+        elif count > 0:
+            first.append((head, values[:count]))
+            second.append((head, values[count:]))
+            count = 0
+        else:
+            second.append((head, values))
+
+    return first, second
+
+
+def generate_bar_table_name(symbol: str, exchange: Exchange, interval: Interval) -> str:
+    """生成k线数据表名"""
+    return "_".join(["bar", symbol.replace("-", "_"), exchange.value, interval.value])
+
+
+def generate_tick_table_name(symbol: str, exchange: Exchange) -> str:
+    """生成tick数据表名"""
+    return "_".join(["tick", symbol.replace("-", "_"), exchange.value])
 
-        for d in data_set:
-            data.append(generate(d))
-            count += 1
 
-            if count == batch_size:
-                self.cursor.execute(" ".join(data))
+def parse_bar_row(row: tuple, symbol: str, exchange: Exchange, interval: Interval) -> BarData:
+    """将查询结果行转换为BarData"""
+    bar: BarData = BarData(
+        symbol=symbol,
+        exchange=exchange,
+        datetime=row[0].astimezone(DB_TZ),
+        interval=interval,
+        volume=row[1],
+        turnover=row[2],
+        open_interest=row[3],
+        open_price=row[4],
+        high_price=row[5],
+        low_price=row[6],
+        close_price=row[7],
+        gateway_name="DB"
+    )
 
-                data = [f"insert into {table_name} values"]
-                count = 0
+    return bar
 
-        if count != 0:
-            self.cursor.execute(" ".join(data))
+
+def parse_tick_row(row: tuple, symbol: str, exchange: Exchange) -> TickData:
+    """将查询结果行（按TICK_QUERY_FIELDS顺序）转换为TickData"""
+    tick: TickData = TickData(
+        symbol=symbol,
+        exchange=exchange,
+        datetime=row[0].astimezone(DB_TZ),
+        name=row[1],
+        localtime=row[-1].astimezone(DB_TZ) if row[-1] else None,
+        gateway_name="DB",
+        **dict(zip(TICK_DOUBLE_FIELDS, row[2:-1], strict=True))
+    )
+
+    return tick
+
+
+def get_field_dtype(field: str) -> type:
+    """获取字段在列数组中的数据类型"""
+    if field in TIMESTAMP_FIELDS:
+        return np.int64
+    elif field == "name":
+        return object
+    return np.float64
 
 
 def generate_bar(bar: BarData) -> str:
@@ -737,6 +2522,45 @@ def generate_bar(bar: BarData) -> str:
     return result
 
 
+def generate_timestamp(dt: datetime) -> int:
+    """将datetime转换为毫秒时间戳"""
+    # 不带时区的时间视为数据库时区
+    if not dt.tzinfo:
+        dt = dt.replace(tzinfo=DB_TZ)
+
+    return (dt - EPOCH) // MILLISECOND
+
+
+def generate_bar_columns(bars: list[BarData]) -> list[list]:
+    """将BarData列表转换为参数绑定所需的列数据"""
+    return [
+        [generate_timestamp(bar.datetime) for bar in bars],
+        [bar.volume for bar in bars],
+        [bar.turnover for bar in bars],
+        [bar.open_interest for bar in bars],
+        [bar.open_price for bar in bars],
+        [bar.high_price for bar in bars],
+        [bar.low_price for bar in bars],
+        [bar.close_price for bar in bars],
+    ]
+
+
+def generate_tick_columns(ticks: list[TickData]) -> list[list]:
+    """将TickData列表转换为参数绑定所需的列数据"""
+    columns: list[list] = [
+        [generate_timestamp(tick.datetime) for tick in ticks],
+        [tick.name for tick in ticks],
+    ]
+
+    for field in TICK_DOUBLE_FIELDS:
+        columns.append([getattr(tick, field) for tick in ticks])
+
+    # tick不带localtime时使用datetime
+    columns.append([generate_timestamp(tick.localtime or tick.datetime) for tick in ticks])
+
+    return columns
+
+
 def generate_tick(tick: TickData) -> str:
     """将TickData转换为可存储的字符串"""
     # tick不带localtime
@@ -756,3 +2580,46 @@ def generate_tick(tick: TickData) -> str:
                    + f"'{localtime}')")
 
     return result
+
+
+def escape_line_tag(value: str) -> str:
+    """转义行协议中的标签值"""
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace("=", "\\=").replace(" ", "\\ ")
+
+
+def escape_line_string(value: str) -> str:
+    """转义行协议中的字符串字段值"""
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def generate_bar_tags(bar: BarData, table_name: str, table_tag: str) -> str:
+    """生成k线行协议的超级表和标签部分"""
+    interval: Interval = bar.interval      # type: ignore
+
+    return (f"s_bar,symbol={escape_line_tag(bar.symbol)},exchange={bar.exchange.value},"
+            + f"interval_={interval.value},{table_tag}={table_name}")
+
+
+def generate_tick_tags(tick: TickData, table_name: str, table_tag: str) -> str:
+    """生成tick行协议的超级表和标签部分"""
+    return (f"s_tick,symbol={escape_line_tag(tick.symbol)},exchange={tick.exchange.value},"
+            + f"{table_tag}={table_name}")
+
+
+def generate_bar_line(bar: BarData, tags: str) -> str:
+    """将BarData转换为行协议字符串"""
+    result: str = (f"{tags} volume={bar.volume},turnover={bar.turnover},open_interest={bar.open_interest},"
+                   + f"open_price={bar.open_price},high_price={bar.high_price},low_price={bar.low_price},"
+                   + f"close_price={bar.close_price} {generate_timestamp(bar.datetime)}")
+
+    return result
+
+
+def generate_tick_line(tick: TickData, tags: str) -> str:
+    """将TickData转换为行协议字符串"""
+    # 行协议不支持TIMESTAMP类型字段，localtime不写入
+    fields: str = ",".join([f"{field}={getattr(tick, field)}" for field in TICK_DOUBLE_FIELDS])
+
+    result: str = f'{tags} name=L"{escape_line_string(tick.name)}",{fields} {generate_timestamp(tick.datetime)}'
+
+    return result
@@ -0,0 +1,455 @@
+"""
+本地磁盘列式缓存，按数据表和日期保存已经结束的交易日数据，读取时通过内存映射访问。
+
+每个文件只包含一个数据块，没有空值的数值列转换为NumPy数组时不复制数据，
+包含空值或多个数据块的列以及字符串列转换时会复制。
+
+读取前按日期查询数据库中的数据条数，与缓存记录的条数不一致（其他进程补写或删除了数据）的日期重新下载。
+多个进程共享缓存目录时，清单文件在文件锁内读取、合并后写入。
+"""
+
+import json
+import os
+import sys
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from threading import Lock
+from time import time
+
+import numpy as np
+
+from vnpy.trader.database import DB_TZ
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except ImportError:
+    pa = None
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+
+# 时间戳转换常量
+EPOCH: datetime = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MILLISECOND: timedelta = timedelta(milliseconds=1)
+
+# 清单文件名
+MANIFEST_NAME: str = "manifest.json"
+
+# 清单文件锁的文件名
+LOCK_NAME: str = "manifest.lock"
+
+# 按毫秒时间戳区间[start, end)读取数据表的列数组
+ArrayFetcher = Callable[[str, int, int], dict[str, np.ndarray]]
+
+# 按日期统计毫秒时间戳区间[start, end)内的数据条数，返回日期零点的毫秒时间戳到条数的映射
+DayCounter = Callable[[str, int, int], dict[int, int]]
+
+# 日期缓存信息：数据条数、文件字节数、最近访问时间
+DayEntry = list
+
+
+class DiskCache:
+    """按容量上限淘汰的本地Arrow文件缓存"""
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        """构造函数"""
+        if pa is None:
+            raise ImportError('启用本地磁盘缓存需要安装pyarrow：pip install "vnpy_taos[arrow]"')
+
+        self.path: Path = path
+        self.max_bytes: int = max_bytes
+        self.size: int = 0
+
+        # 数据表名 -> 日期 -> 缓存信息
+        self.manifest: dict[str, dict[str, DayEntry]] = {}
+        self.lock: Lock = Lock()
+
+        # 上次写入清单后本进程的修改，写入时合并到其他进程的清单中（None为删除）
+        self.changes: dict[tuple[str, str], DayEntry | None] = {}
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.load_manifest()
+
+    def get(
+        self,
+        table_name: str,
+        start: datetime,
+        end: datetime,
+        fetch: ArrayFetcher,
+        count: DayCounter
+    ) -> list[dict[str, np.ndarray]]:
+        """读取区间数据，返回按时间排列的各段列数组，当日及之后的数据始终从数据库读取"""
+        start_ms: int = generate_ms(start)
+        end_ms: int = generate_ms(end)
+
+        first_day: date = convert_tz(start).date()
+        last_day: date = convert_tz(end).date()
+        today: date = datetime.now(DB_TZ).date()
+
+        # 已经结束的交易日使用本地缓存
+        days: list[date] = []
+        day: date = first_day
+        while day <= last_day and day < today:
+            days.append(day)
+            day += timedelta(days=1)
+
+        # 数据库中没有数据的日期不需要读取，条数与缓存不一致的日期重新下载
+        if days:
+            day_counts: dict[int, int] = count(
+                table_name, generate_day_ms(days[0]), generate_day_ms(days[-1] + timedelta(days=1))
+            )
+            self.validate(table_name, days, day_counts)
+            days = [day for day in days if day_counts.get(generate_day_ms(day), 0)]
+
+        self.fill(table_name, days, fetch)
+
+        # 按日期顺序确定各段数据的来源，读取期间已被淘汰或失效的日期从数据库读取
+        sources: list[Path | date] = []
+
+        with self.lock:
+            entries: dict[str, DayEntry] = self.manifest.get(table_name, {})
+            now: float = time()
+
+            for day in days:
+                entry: DayEntry | None = entries.get(day.strftime("%Y%m%d"))
+
+                if entry is None:
+                    sources.append(day)
+                else:
+                    entry[2] = now
+                    sources.append(self.get_day_path(table_name, day))
+
+        parts: list[dict[str, np.ndarray]] = []
+
+        for source in sources:
+            if isinstance(source, Path):
+                try:
+                    parts.append(read_arrays(source))
+                    continue
+                except OSError:
+                    # 文件已被其他进程删除，移除记录后下次读取时重新下载
+                    day = datetime.strptime(source.stem, "%Y%m%d").date()
+                    self.discard(table_name, source.stem)
+            else:
+                day = source
+
+            parts.append(fetch(table_name, generate_day_ms(day), generate_day_ms(day + timedelta(days=1))))
+
+        # 当日及之后的数据不缓存
+        if last_day >= today:
+            recent_ms: int = max(start_ms, generate_day_ms(max(first_day, today)))
+            parts.append(fetch(table_name, recent_ms, end_ms + 1))
+
+        # 截取请求的区间
+        result: list[dict[str, np.ndarray]] = []
+        for arrays in parts:
+            times: np.ndarray = arrays["datetime"]
+            left: int = int(np.searchsorted(times, start_ms, side="left"))
+            right: int = int(np.searchsorted(times, end_ms, side="right"))
+
+            if right > left:
+                result.append({field: array[left:right] for field, array in arrays.items()})
+
+        return result
+
+    def validate(self, table_name: str, days: list[date], day_counts: dict[int, int]) -> None:
+        """移除数据条数与数据库不一致的日期缓存"""
+        with self.lock:
+            entries: dict[str, DayEntry] = self.manifest.get(table_name, {})
+            keys: list[str] = []
+
+            for day in days:
+                key: str = day.strftime("%Y%m%d")
+                entry: DayEntry | None = entries.get(key)
+
+                if entry is not None and entry[0] != day_counts.get(generate_day_ms(day), 0):
+                    keys.append(key)
+
+            if not keys:
+                return
+
+            for key in keys:
+                self.remove(table_name, key)
+
+            self.save_manifest()
+
+    def discard(self, table_name: str, key: str) -> None:
+        """移除缓存文件无法读取的日期记录"""
+        with self.lock:
+            if key in self.manifest.get(table_name, {}):
+                self.remove(table_name, key)
+                self.save_manifest()
+
+    def fill(self, table_name: str, days: list[date], fetch: ArrayFetcher) -> None:
+        """从数据库加载缺失的日期并写入缓存文件"""
+        with self.lock:
+            entries: dict[str, DayEntry] = self.manifest.get(table_name, {})
+            missing: list[date] = [day for day in days if day.strftime("%Y%m%d") not in entries]
+
+        if not missing:
+            return
+
+        # 连续的缺失日期合并为一次查询
+        runs: list[list[date]] = [[missing[0]]]
+        for day in missing[1:]:
+            if day - runs[-1][-1] == timedelta(days=1):
+                runs[-1].append(day)
+            else:
+                runs.append([day])
+
+        table_path: Path = self.path.joinpath(table_name)
+        table_path.mkdir(exist_ok=True)
+
+        for run in runs:
+            arrays: dict[str, np.ndarray] = fetch(
+                table_name, generate_day_ms(run[0]), generate_day_ms(run[-1] + timedelta(days=1))
+            )
+
+            new_entries: dict[str, DayEntry] = {}
+            now: float = time()
+
+            for day in run:
+                # 按日期拆分数据
+                times: np.ndarray = arrays["datetime"]
+                left: int = int(np.searchsorted(times, generate_day_ms(day), side="left"))
+                right: int = int(np.searchsorted(times, generate_day_ms(day + timedelta(days=1)), side="left"))
+
+                # 没有数据的日期不记录，之后补写的数据可以被读取
+                if right == left:
+                    continue
+
+                path: Path = self.get_day_path(table_name, day)
+                write_arrays(path, {field: array[left:right] for field, array in arrays.items()})
+
+                new_entries[day.strftime("%Y%m%d")] = [right - left, path.stat().st_size, now]
+
+            if not new_entries:
+                continue
+
+            with self.lock:
+                entries = self.manifest.setdefault(table_name, {})
+                for key, entry in new_entries.items():
+                    old: DayEntry | None = entries.get(key)
+                    if old:
+                        self.size -= old[1]
+
+                    entries[key] = entry
+                    self.size += entry[1]
+                    self.changes[(table_name, key)] = entry
+
+                self.save_manifest()
+
+    def invalidate(self, table_name: str, start: datetime | None = None, end: datetime | None = None) -> None:
+        """移除数据表在区间内（未指定时为全部）的缓存"""
+        with self.lock:
+            entries: dict[str, DayEntry] | None = self.manifest.get(table_name)
+            if not entries:
+                return
+
+            first_key: str = convert_tz(start).strftime("%Y%m%d") if start else ""
+            last_key: str = convert_tz(end).strftime("%Y%m%d") if end else "99999999"
+
+            keys: list[str] = [key for key in entries if first_key <= key <= last_key]
+            if not keys:
+                return
+
+            for key in keys:
+                self.remove(table_name, key)
+
+            self.save_manifest()
+
+    def clear(self) -> None:
+        """清空全部缓存（包括其他进程写入的缓存）"""
+        with self.lock:
+            # 先合并其他进程的清单，再删除全部记录
+            self.save_manifest()
+
+            for table_name, entries in list(self.manifest.items()):
+                for key in list(entries):
+                    self.remove(table_name, key)
+
+            self.save_manifest()
+
+    def evict(self) -> None:
+        """按最近访问时间淘汰超出容量上限的缓存文件"""
+        if self.size <= self.max_bytes:
+            return
+
+        candidates: list[tuple[float, str, str]] = sorted(
+            (entry[2], table_name, key)
+            for table_name, entries in self.manifest.items()
+            for key, entry in entries.items()
+            if entry[1]
+        )
+
+        for _, table_name, key in candidates:
+            if self.size <= self.max_bytes:
+                break
+            self.remove(table_name, key)
+
+    def remove(self, table_name: str, key: str) -> None:
+        """删除日期缓存文件及清单记录"""
+        entry: DayEntry = self.manifest[table_name].pop(key)
+        self.size -= entry[1]
+        self.changes[(table_name, key)] = None
+
+        if not self.manifest[table_name]:
+            self.manifest.pop(table_name)
+
+        if entry[1]:
+            try:
+                self.path.joinpath(table_name, f"{key}.arrow").unlink()
+            except OSError:
+                # 文件仍被映射时（Windows）保留文件，下次写入时覆盖
+                pass
+
+    def get_day_path(self, table_name: str, day: date) -> Path:
+        """获取日期缓存文件路径"""
+        return self.path.joinpath(table_name, f"{day.strftime('%Y%m%d')}.arrow")
+
+    def load_manifest(self) -> None:
+        """加载清单文件"""
+        with lock_file(self.path.joinpath(LOCK_NAME)):
+            self.manifest = self.read_manifest()
+
+        self.size = self.get_size()
+
+    def read_manifest(self) -> dict[str, dict[str, DayEntry]]:
+        """读取清单文件，忽略文件已丢失和没有数据的记录"""
+        manifest: dict[str, dict[str, DayEntry]] = {}
+
+        manifest_path: Path = self.path.joinpath(MANIFEST_NAME)
+        if not manifest_path.exists():
+            return manifest
+
+        with open(manifest_path, encoding="UTF-8") as f:
+            data: dict[str, dict[str, DayEntry]] = json.load(f)
+
+        for table_name, entries in data.items():
+            for key, entry in entries.items():
+                if not entry[1] or not self.path.joinpath(table_name, f"{key}.arrow").exists():
+                    continue
+
+                manifest.setdefault(table_name, {})[key] = entry
+
+        return manifest
+
+    def save_manifest(self) -> None:
+        """在文件锁内读取清单文件，合并本进程的修改并按容量淘汰后写入，需要在持有self.lock时调用"""
+        manifest_path: Path = self.path.joinpath(MANIFEST_NAME)
+        temp_path: Path = self.path.joinpath(f"{MANIFEST_NAME}.{os.getpid()}")
+
+        with lock_file(self.path.joinpath(LOCK_NAME)):
+            manifest: dict[str, dict[str, DayEntry]] = self.read_manifest()
+
+            for (table_name, key), entry in self.changes.items():
+                entries: dict[str, DayEntry] = manifest.setdefault(table_name, {})
+
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+
+                if not entries:
+                    manifest.pop(table_name)
+
+            # 保留本进程记录的最近访问时间
+            for table_name, entries in manifest.items():
+                local: dict[str, DayEntry] = self.manifest.get(table_name, {})
+                for key, entry in entries.items():
+                    if key in local:
+                        entry[2] = max(entry[2], local[key][2])
+
+            self.manifest = manifest
+            self.size = self.get_size()
+            self.evict()
+            self.changes.clear()
+
+            with open(temp_path, mode="w", encoding="UTF-8") as f:
+                json.dump(self.manifest, f)
+
+            os.replace(temp_path, manifest_path)
+
+    def get_size(self) -> int:
+        """计算清单中缓存文件的总字节数"""
+        return sum(entry[1] for entries in self.manifest.values() for entry in entries.values())
+
+    def get_statistics(self) -> dict[str, int]:
+        """查询缓存统计信息"""
+        with self.lock:
+            return {
+                "tables": len(self.manifest),
+                "days": sum(len(entries) for entries in self.manifest.values()),
+                "size": self.size,
+            }
+
+
+@contextmanager
+def lock_file(path: Path) -> Iterator[None]:
+    """持有跨进程的排他文件锁"""
+    with open(path, mode="a+b") as f:
+        if sys.platform == "win32":
+            f.seek(0)
+            # LK_LOCK重试10次（约10秒）后仍未获得锁时抛出异常，继续等待
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def convert_tz(dt: datetime) -> datetime:
+    """转换为数据库时区，不带时区的时间视为数据库时区"""
+    if not dt.tzinfo:
+        return dt.replace(tzinfo=DB_TZ)
+    return dt.astimezone(DB_TZ)
+
+
+def generate_ms(dt: datetime) -> int:
+    """转换为毫秒时间戳"""
+    return (convert_tz(dt) - EPOCH) // MILLISECOND
+
+
+def generate_day_ms(day: date) -> int:
+    """日期在数据库时区零点的毫秒时间戳"""
+    return generate_ms(datetime(day.year, day.month, day.day, tzinfo=DB_TZ))
+
+
+def write_arrays(path: Path, arrays: dict[str, np.ndarray]) -> None:
+    """写入Arrow文件，先写入临时文件再替换"""
+    table: pa.Table = pa.table({field: pa.array(array) for field, array in arrays.items()})
+    temp_path: Path = path.with_suffix(f".{os.getpid()}")
+
+    with ipc.new_file(str(temp_path), table.schema) as writer:
+        writer.write_table(table)
+
+    os.replace(temp_path, path)
+
+
+def read_arrays(path: Path) -> dict[str, np.ndarray]:
+    """通过内存映射读取Arrow文件，没有空值的数值列直接引用映射的内存，字符串列会复制"""
+    table: pa.Table = ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+
+    return {
+        name: column.to_numpy()
+        for name, column in zip(table.column_names, table.columns, strict=True)
+    }
@@ -0,0 +1,102 @@
+"""
+DataFrame格式数据的按列转换，整批生成参数绑定所需的列数据和SQL语句中各行的值。
+"""
+
+from collections.abc import Iterator
+
+import numpy as np
+import pandas as pd
+
+from vnpy.trader.database import DB_TZ
+
+
+# 每次转换的数据条数，限制生成字符串时的内存占用
+CHUNK_SIZE: int = 10_000
+
+
+def convert_timestamps(values: pd.Series) -> np.ndarray:
+    """将时间列转换为毫秒时间戳数组，整数列视为毫秒时间戳，不带时区的时间视为数据库时区"""
+    if pd.api.types.is_integer_dtype(values):
+        timestamps: np.ndarray = values.to_numpy(dtype=np.int64)
+        return timestamps
+
+    times: pd.Series = pd.to_datetime(values)
+    if times.dt.tz is None:
+        times = times.dt.tz_localize(DB_TZ)
+
+    array: np.ndarray = times.dt.tz_convert("UTC").dt.tz_localize(None).to_numpy(dtype="datetime64[ms]")
+    timestamps = array.astype(np.int64)
+    return timestamps
+
+
+def get_double_column(df: pd.DataFrame, field: str) -> np.ndarray:
+    """读取浮点数列，缺少的字段使用0（与BarData和TickData的默认值一致）"""
+    if field not in df:
+        return np.zeros(len(df), dtype=np.float64)
+
+    array: np.ndarray = df[field].to_numpy(dtype=np.float64)
+    return array
+
+
+def get_string_column(df: pd.DataFrame, field: str) -> np.ndarray:
+    """读取字符串列，缺少的字段和空值使用空字符串"""
+    if field not in df:
+        return np.full(len(df), "", dtype=object)
+
+    array: np.ndarray = df[field].fillna("").astype(str).to_numpy(dtype=object)
+    return array
+
+
+def generate_sql_column(array: np.ndarray, field_type: str) -> list[str]:
+    """将列数组转换为SQL语句中的值"""
+    if field_type == "timestamp":
+        return list(map(str, array.tolist()))
+
+    # 价格和成交量等字段以及合约名称重复值较多，只格式化不重复的值
+    codes, uniques = pd.factorize(array)
+
+    if field_type == "nchar":
+        strings: list[str] = ["'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'" for value in uniques]
+    else:
+        strings = list(map(repr, uniques.tolist()))
+
+    # NaN的编码为-1，对应末尾的NULL
+    values: np.ndarray = np.array(strings + ["NULL"], dtype=object)
+
+    result: list[str] = values[codes].tolist()
+    return result
+
+
+def generate_bind_column(array: np.ndarray, field_type: str) -> list:
+    """将列数组转换为参数绑定的值，NaN绑定为空值"""
+    if field_type == "double":
+        mask: np.ndarray = np.isnan(array)
+        if mask.any():
+            values: np.ndarray = array.astype(object)
+            values[mask] = None
+            array = values
+
+    result: list = array.tolist()
+    return result
+
+
+def generate_rows(columns: list[list[str]]) -> list[str]:
+    """按列整批生成SQL语句中各行的值"""
+    return list(map("({})".format, map(",".join, zip(*columns, strict=True))))
+
+
+def split_rows(rows: list[str], limit: int) -> Iterator[tuple[int, int]]:
+    """按单条语句的字节上限划分行区间，每行另需分隔空格"""
+    sizes: np.ndarray = np.fromiter(map(len, map(str.encode, rows)), dtype=np.int64, count=len(rows))
+    totals: np.ndarray = np.cumsum(sizes + 1)
+    start: int = 0
+
+    while start < len(rows):
+        offset: int = int(totals[start - 1]) if start else 0
+        end: int = int(np.searchsorted(totals, offset + limit, side="right"))
+
+        # 单行超出上限时也需单独写入
+        end = max(end, start + 1)
+        yield start, end
+
+        start = end
@@ -0,0 +1,461 @@
+"""
+数据库操作性能指标，按操作类型统计耗时分布、数据条数、SQL字节数和执行次数，通过可插拔的输出接口导出。
+"""
+
+import os
+import re
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from functools import wraps
+from copy import copy
+from pathlib import Path
+from threading import Event, Lock, Thread
+from time import perf_counter
+from typing import Any, TypeVar
+
+import taos
+from vnpy.trader.logger import logger
+
+
+# 耗时分布的区间上限（秒）
+LATENCY_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# 操作类别：TaosDatabase函数调用、SQL语句执行
+KIND_METHOD: str = "method"
+KIND_STATEMENT: str = "statement"
+
+# SQL语句按首个关键字分类
+STATEMENT_TYPES: dict[str, str] = {
+    "SELECT": "select",
+    "INSERT": "insert",
+    "ALTER": "alter",
+    "CREATE": "ddl",
+    "DROP": "ddl",
+    "USE": "ddl",
+    "DELETE": "delete",
+}
+
+# 无模式写入没有SQL语句，通知回调时使用的名称
+SCHEMALESS_SQL: str = "SCHEMALESS INSERT"
+
+# 不发送SQL文本的操作（参数绑定写入的数据以二进制发送），不计入SQL字节数
+NO_SQL_OPERATIONS: set[str] = {"stmt"}
+
+# SQL语句的首个关键字
+KEYWORD_PATTERN: re.Pattern = re.compile(r"\s*(\w+)")
+
+# 操作的标识：(类别, 名称)
+OperationKey = tuple[str, str]
+
+# SQL语句执行完成的回调：(SQL语句, 耗时)
+StatementListener = Callable[[str, float], None]
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class OperationStats:
+    """单个操作的累计统计数据"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.count: int = 0
+        self.rows: int = 0
+        self.sql_bytes: int = 0
+        self.total_time: float = 0
+        self.max_time: float = 0
+
+        # 上次导出以来的最大耗时，每次导出后清零
+        self.interval_max_time: float = 0
+
+        # 各耗时区间的次数，最后一个区间没有上限
+        self.buckets: list[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency: float, rows: int, sql_bytes: int) -> None:
+        """记录一次操作"""
+        self.count += 1
+        self.rows += rows
+        self.sql_bytes += sql_bytes
+        self.total_time += latency
+        self.max_time = max(self.max_time, latency)
+        self.interval_max_time = max(self.interval_max_time, latency)
+
+        self.buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def copy(self) -> "OperationStats":
+        """复制统计数据"""
+        stats: OperationStats = copy(self)
+        stats.buckets = list(self.buckets)
+        return stats
+
+
+class MetricsSink:
+    """性能指标输出接口，自定义输出需继承并实现export"""
+
+    def export(self, snapshot: dict[OperationKey, OperationStats]) -> None:
+        """输出各操作的累计统计数据快照"""
+        pass
+
+
+class PrometheusSink(MetricsSink):
+    """以Prometheus文本格式写入文件，可由node_exporter的textfile collector采集"""
+
+    def __init__(self, path: Path) -> None:
+        """构造函数"""
+        self.path: Path = path
+
+    def export(self, snapshot: dict[OperationKey, OperationStats]) -> None:
+        """先写入临时文件再替换，避免采集到不完整的内容"""
+        temp_path: Path = self.path.with_name(f"{self.path.name}.{os.getpid()}")
+
+        with open(temp_path, mode="w", encoding="UTF-8") as f:
+            f.write(generate_prometheus_text(snapshot))
+
+        os.replace(temp_path, self.path)
+
+
+class LogSink(MetricsSink):
+    """通过vnpy日志输出上次导出以来各操作的统计摘要"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.last: dict[OperationKey, OperationStats] = {}
+
+    def export(self, snapshot: dict[OperationKey, OperationStats]) -> None:
+        """只输出有新增记录的操作"""
+        for key, stats in sorted(snapshot.items()):
+            last: OperationStats = self.last.get(key) or OperationStats()
+
+            count: int = stats.count - last.count
+            if not count:
+                continue
+
+            total_time: float = stats.total_time - last.total_time
+
+            message: str = (
+                f"{key[0]} {key[1]}: count={count} "
+                f"avg={total_time / count * 1000:.2f}ms max={stats.interval_max_time * 1000:.2f}ms"
+            )
+
+            # 数据条数和SQL字节数只对SQL语句统计
+            if key[0] == KIND_STATEMENT:
+                message += f" rows={stats.rows - last.rows}"
+
+                if key[1] not in NO_SQL_OPERATIONS:
+                    message += f" sql_bytes={stats.sql_bytes - last.sql_bytes}"
+
+            logger.bind(gateway_name="TAOS").info(message)
+
+        self.last = snapshot
+
+
+class TaosMetrics:
+    """线程安全的性能指标统计，按时间间隔定时导出到各输出接口"""
+
+    def __init__(self, sinks: list[MetricsSink], interval: float) -> None:
+        """构造函数，interval为0时只在调用export时导出"""
+        self.sinks: list[MetricsSink] = sinks
+        self.interval: float = interval
+
+        self.stats: dict[OperationKey, OperationStats] = {}
+        self.lock: Lock = Lock()
+
+        self.listeners: list[StatementListener] = []
+
+        self.stop_event: Event = Event()
+        self.thread: Thread | None = None
+
+        if interval:
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def add_sink(self, sink: MetricsSink) -> None:
+        """添加输出接口"""
+        self.sinks.append(sink)
+
+    def add_listener(self, listener: StatementListener) -> None:
+        """添加SQL语句执行完成的回调"""
+        self.listeners.append(listener)
+
+    def record(self, kind: str, name: str, latency: float, rows: int = 0, sql_bytes: int = 0) -> None:
+        """记录一次操作"""
+        key: OperationKey = (kind, name)
+
+        with self.lock:
+            stats: OperationStats | None = self.stats.get(key)
+            if not stats:
+                stats = OperationStats()
+                self.stats[key] = stats
+
+            stats.add(latency, rows, sql_bytes)
+
+    def record_statement(self, sql: str, operation: str, latency: float, rows: int, sql_bytes: int) -> None:
+        """记录一次SQL语句执行，并通知回调"""
+        self.record(KIND_STATEMENT, operation, latency, rows, sql_bytes)
+
+        for listener in self.listeners:
+            listener(sql, latency)
+
+    def add_rows(self, kind: str, name: str, rows: int) -> None:
+        """补充记录操作返回的数据条数（查询结果读取完成后）"""
+        with self.lock:
+            stats: OperationStats | None = self.stats.get((kind, name))
+            if stats:
+                stats.rows += rows
+
+    def snapshot(self) -> dict[OperationKey, OperationStats]:
+        """查询各操作统计数据的副本"""
+        with self.lock:
+            return {key: stats.copy() for key, stats in self.stats.items()}
+
+    def reset(self) -> None:
+        """清空统计数据"""
+        with self.lock:
+            self.stats.clear()
+
+    def export(self) -> None:
+        """将统计数据快照导出到各输出接口，并开始新的区间最大耗时统计"""
+        with self.lock:
+            snapshot: dict[OperationKey, OperationStats] = {key: stats.copy() for key, stats in self.stats.items()}
+
+            for stats in self.stats.values():
+                stats.interval_max_time = 0
+
+        for sink in self.sinks:
+            try:
+                sink.export(snapshot)
+            except Exception as e:
+                logger.bind(gateway_name="TAOS").error(f"性能指标导出失败: {e}")
+
+    def run(self) -> None:
+        """定时导出线程"""
+        while not self.stop_event.wait(self.interval):
+            self.export()
+
+    def close(self) -> None:
+        """停止定时线程并导出最终的统计数据"""
+        self.stop_event.set()
+
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+        self.export()
+
+
+class MetricsConnection:
+    """记录SQL语句执行指标的连接代理"""
+
+    def __init__(self, conn: taos.TaosConnection, metrics: TaosMetrics) -> None:
+        """构造函数"""
+        self.conn: taos.TaosConnection = conn
+        self.metrics: TaosMetrics = metrics
+
+    def cursor(self) -> "MetricsCursor":
+        """创建游标"""
+        return MetricsCursor(self.conn.cursor(), self.metrics)
+
+    def query(self, sql: str, *args: Any) -> "MetricsResult":
+        """执行查询，耗时不包含结果读取"""
+        operation: str = get_statement_type(sql)
+
+        start: float = perf_counter()
+        result: taos.TaosResult = self.conn.query(sql, *args)
+        latency: float = perf_counter() - start
+
+        rows: int = 0 if operation in {"select", "count"} else getattr(result, "affected_rows", 0)
+        self.metrics.record_statement(sql, operation, latency, rows, len(sql.encode()))
+
+        return MetricsResult(result, self.metrics, operation)
+
+    def execute(self, sql: str, *args: Any) -> int:
+        """执行SQL语句"""
+        start: float = perf_counter()
+        rows: int = self.conn.execute(sql, *args)
+        latency: float = perf_counter() - start
+
+        self.metrics.record_statement(sql, get_statement_type(sql), latency, rows or 0, len(sql.encode()))
+        return rows
+
+    def statement(self, sql: str) -> "MetricsStmt":
+        """创建参数绑定写入语句"""
+        return MetricsStmt(self.conn.statement(sql), self.metrics, sql)
+
+    def schemaless_insert(self, lines: list[str], *args: Any, **kwargs: Any) -> int:
+        """行协议写入"""
+        start: float = perf_counter()
+        rows: int = self.conn.schemaless_insert(lines, *args, **kwargs)
+        latency: float = perf_counter() - start
+
+        sql_bytes: int = sum(len(line.encode()) for line in lines)
+        self.metrics.record_statement(SCHEMALESS_SQL, "schemaless", latency, rows or len(lines), sql_bytes)
+        return rows
+
+    def __getattr__(self, name: str) -> Any:
+        """其他属性直接访问原始连接"""
+        return getattr(self.conn, name)
+
+
+class MetricsCursor:
+    """记录SQL语句执行指标的游标代理"""
+
+    def __init__(self, cursor: taos.TaosCursor, metrics: TaosMetrics) -> None:
+        """构造函数"""
+        self.cursor: taos.TaosCursor = cursor
+        self.metrics: TaosMetrics = metrics
+        self.operation: str = ""
+
+    def execute(self, sql: str, *args: Any) -> Any:
+        """执行SQL语句，查询返回的数据条数在fetchall时记录"""
+        self.operation = get_statement_type(sql)
+
+        start: float = perf_counter()
+        result: Any = self.cursor.execute(sql, *args)
+        latency: float = perf_counter() - start
+
+        rows: int = 0
+        if self.operation not in {"select", "count"} and isinstance(result, int):
+            rows = result
+        self.metrics.record_statement(sql, self.operation, latency, rows, len(sql.encode()))
+
+        return result
+
+    def fetchall(self) -> list:
+        """读取全部结果"""
+        rows: list = self.cursor.fetchall()
+        self.metrics.add_rows(KIND_STATEMENT, self.operation, len(rows))
+        return rows
+
+    def __getattr__(self, name: str) -> Any:
+        """其他属性直接访问原始游标"""
+        return getattr(self.cursor, name)
+
+
+class MetricsResult:
+    """记录读取数据条数的查询结果代理"""
+
+    def __init__(self, result: taos.TaosResult, metrics: TaosMetrics, operation: str) -> None:
+        """构造函数"""
+        self.result: taos.TaosResult = result
+        self.metrics: TaosMetrics = metrics
+        self.operation: str = operation
+
+    def fetch_all(self) -> list:
+        """读取全部结果"""
+        rows: list = self.result.fetch_all()
+        self.metrics.add_rows(KIND_STATEMENT, self.operation, len(rows))
+        return rows
+
+    def blocks_iter(self) -> Iterator:
+        """分块读取结果"""
+        rows: int = 0
+        try:
+            for block, length in self.result.blocks_iter():
+                rows += length
+                yield block, length
+        finally:
+            self.metrics.add_rows(KIND_STATEMENT, self.operation, rows)
+
+    def __iter__(self) -> Iterator:
+        """逐行读取结果"""
+        rows: int = 0
+        try:
+            for row in self.result:
+                rows += 1
+                yield row
+        finally:
+            self.metrics.add_rows(KIND_STATEMENT, self.operation, rows)
+
+    def __getattr__(self, name: str) -> Any:
+        """其他属性直接访问原始结果"""
+        return getattr(self.result, name)
+
+
+class MetricsStmt:
+    """记录参数绑定写入指标的语句代理"""
+
+    def __init__(self, stmt: taos.TaosStmt, metrics: TaosMetrics, sql: str) -> None:
+        """构造函数"""
+        self.stmt: taos.TaosStmt = stmt
+        self.metrics: TaosMetrics = metrics
+        self.sql: str = sql
+
+    def execute(self) -> None:
+        """执行写入"""
+        start: float = perf_counter()
+        self.stmt.execute()
+        latency: float = perf_counter() - start
+
+        self.metrics.record_statement(self.sql, "stmt", latency, getattr(self.stmt, "affected_rows", 0), 0)
+
+    def __getattr__(self, name: str) -> Any:
+        """其他属性直接访问原始语句"""
+        return getattr(self.stmt, name)
+
+
+def timed(func: F) -> F:
+    """启用性能指标时记录函数耗时（用于不借出连接的函数）"""
+    name: str = func.__name__
+
+    @wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if not self.metrics:
+            return func(self, *args, **kwargs)
+
+        start: float = perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            self.metrics.record(KIND_METHOD, name, perf_counter() - start)
+
+    return wrapper      # type: ignore
+
+
+def get_statement_type(sql: str) -> str:
+    """根据首个关键字确定SQL语句的类型，区分计数查询"""
+    match: re.Match | None = KEYWORD_PATTERN.match(sql)
+    if not match:
+        return "other"
+
+    statement_type: str = STATEMENT_TYPES.get(match.group(1).upper(), "other")
+
+    if statement_type == "select" and "COUNT(" in sql.upper():
+        return "count"
+
+    return statement_type
+
+
+def generate_prometheus_text(snapshot: dict[OperationKey, OperationStats]) -> str:
+    """生成Prometheus文本格式的指标"""
+    lines: list[str] = [
+        "# HELP vnpy_taos_operation_seconds Latency of TaosDatabase methods and SQL statements.",
+        "# TYPE vnpy_taos_operation_seconds histogram",
+    ]
+
+    for (kind, name), stats in sorted(snapshot.items()):
+        labels: str = f'kind="{kind}",operation="{name}"'
+
+        total: int = 0
+        for bound, count in zip(LATENCY_BUCKETS, stats.buckets, strict=False):
+            total += count
+            lines.append(f'vnpy_taos_operation_seconds_bucket{{{labels},le="{bound}"}} {total}')
+
+        lines.append(f'vnpy_taos_operation_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+        lines.append(f"vnpy_taos_operation_seconds_sum{{{labels}}} {stats.total_time}")
+        lines.append(f"vnpy_taos_operation_seconds_count{{{labels}}} {stats.count}")
+
+    counters: list[tuple[str, str, str]] = [
+        ("vnpy_taos_statement_rows_total", "Rows written or read by each statement type.", "rows"),
+        ("vnpy_taos_statement_sql_bytes_total", "Bytes of SQL text sent by each statement type.", "sql_bytes"),
+    ]
+
+    for metric, description, field in counters:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} counter")
+
+        for (kind, name), stats in sorted(snapshot.items()):
+            if kind != KIND_STATEMENT or (field == "sql_bytes" and name in NO_SQL_OPERATIONS):
+                continue
+
+            lines.append(f'{metric}{{operation="{name}"}} {getattr(stats, field)}')
+
+    return "\n".join(lines) + "\n"
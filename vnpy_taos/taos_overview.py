@@ -0,0 +1,194 @@
+"""
+数据汇总信息注册表，在内存中维护各数据表的汇总信息。
+"""
+
+from copy import copy
+from collections.abc import Callable
+from datetime import datetime
+from threading import Event, Lock, Thread
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.database import BarOverview, TickOverview, DB_TZ
+from vnpy.trader.logger import logger
+
+
+class OverviewRegistry:
+    """按数据表名维护K线和tick汇总信息"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.bar_overviews: dict[str, BarOverview] = {}
+        self.tick_overviews: dict[str, TickOverview] = {}
+
+        self.lock: Lock = Lock()
+
+    def update_bar(
+        self,
+        table_name: str,
+        symbol: str,
+        exchange: Exchange,
+        interval: Interval,
+        start: datetime | None,
+        end: datetime | None,
+        count: int
+    ) -> None:
+        """更新K线汇总信息"""
+        overview: BarOverview = BarOverview(
+            symbol=symbol,
+            exchange=exchange,
+            interval=interval,
+            start=convert_tz(start),
+            end=convert_tz(end),
+            count=count
+        )
+
+        with self.lock:
+            self.bar_overviews[table_name] = overview
+
+    def update_tick(
+        self,
+        table_name: str,
+        symbol: str,
+        exchange: Exchange,
+        start: datetime | None,
+        end: datetime | None,
+        count: int
+    ) -> None:
+        """更新tick汇总信息"""
+        overview: TickOverview = TickOverview(
+            symbol=symbol,
+            exchange=exchange,
+            start=convert_tz(start),
+            end=convert_tz(end),
+            count=count
+        )
+
+        with self.lock:
+            self.tick_overviews[table_name] = overview
+
+    def get(self, table_name: str) -> BarOverview | TickOverview | None:
+        """查询数据表的汇总信息"""
+        with self.lock:
+            return self.bar_overviews.get(table_name) or self.tick_overviews.get(table_name)
+
+    def update_count(self, table_name: str, count: int) -> None:
+        """更新数据表的数据条数"""
+        with self.lock:
+            overview: BarOverview | TickOverview | None = (
+                self.bar_overviews.get(table_name) or self.tick_overviews.get(table_name)
+            )
+
+            if overview:
+                overview.count = count
+
+    def remove(self, table_name: str) -> None:
+        """移除数据表的汇总信息"""
+        with self.lock:
+            self.bar_overviews.pop(table_name, None)
+            self.tick_overviews.pop(table_name, None)
+
+    def clear(self) -> None:
+        """清空全部汇总信息"""
+        with self.lock:
+            self.bar_overviews.clear()
+            self.tick_overviews.clear()
+
+    def get_bar_overviews(self) -> list[BarOverview]:
+        """查询全部K线汇总信息"""
+        with self.lock:
+            return [copy(overview) for overview in self.bar_overviews.values()]
+
+    def get_tick_overviews(self) -> list[TickOverview]:
+        """查询全部tick汇总信息"""
+        with self.lock:
+            return [copy(overview) for overview in self.tick_overviews.values()]
+
+
+OverviewState = tuple[datetime | None, datetime | None, int]
+
+
+class OverviewUpdater:
+    """合并各数据表的汇总信息变化，定时批量写入标签"""
+
+    def __init__(self, flush: Callable[[dict[str, OverviewState]], None], interval: float) -> None:
+        """构造函数"""
+        self.flush_func: Callable[[dict[str, OverviewState]], None] = flush
+        self.interval: float = interval
+
+        self.states: dict[str, OverviewState] = {}
+        self.dirty: set[str] = set()
+        self.lock: Lock = Lock()
+
+        self.stop_event: Event = Event()
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def get_state(self, table_name: str) -> OverviewState | None:
+        """查询数据表当前的汇总信息"""
+        with self.lock:
+            return self.states.get(table_name)
+
+    def set_state(self, table_name: str, start: datetime | None, end: datetime | None, count: int) -> None:
+        """更新数据表的汇总信息，等待下次写入"""
+        with self.lock:
+            self.states[table_name] = (start, end, count)
+            self.dirty.add(table_name)
+
+    def set_count(self, table_name: str, count: int) -> None:
+        """更新数据表的数据条数"""
+        with self.lock:
+            state: OverviewState | None = self.states.get(table_name)
+            if state:
+                self.states[table_name] = (state[0], state[1], count)
+                self.dirty.add(table_name)
+
+    def remove(self, table_name: str) -> None:
+        """移除数据表的汇总信息"""
+        with self.lock:
+            self.states.pop(table_name, None)
+            self.dirty.discard(table_name)
+
+    def clear(self) -> None:
+        """清空全部汇总信息"""
+        with self.lock:
+            self.states.clear()
+            self.dirty.clear()
+
+    def flush(self) -> None:
+        """写入所有待更新的汇总信息"""
+        with self.lock:
+            if not self.dirty:
+                return
+
+            pending: dict[str, OverviewState] = {
+                table_name: self.states[table_name] for table_name in self.dirty
+            }
+            self.dirty.clear()
+
+        try:
+            self.flush_func(pending)
+        except Exception as e:
+            logger.bind(gateway_name="TAOS").error(f"更新汇总信息失败: {e}")
+
+            # 写入失败的数据表等待下次重试
+            with self.lock:
+                self.dirty.update(table_name for table_name in pending if table_name in self.states)
+
+    def run(self) -> None:
+        """定时写入线程"""
+        while not self.stop_event.wait(self.interval):
+            self.flush()
+
+    def close(self) -> None:
+        """停止定时线程并写入剩余的汇总信息"""
+        self.stop_event.set()
+        self.thread.join()
+
+        self.flush()
+
+
+def convert_tz(dt: datetime | None) -> datetime | None:
+    """转换为数据库时区"""
+    if not dt:
+        return None
+    return dt.astimezone(DB_TZ)
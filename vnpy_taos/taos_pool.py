@@ -0,0 +1,179 @@
+"""
+TDengine连接池，为每次数据库操作分配独立的连接。
+"""
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from functools import wraps
+from threading import Condition, local
+from time import monotonic, perf_counter
+from typing import Any, TypeVar
+
+import taos
+
+from .taos_metrics import KIND_METHOD
+
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ConnectionPool:
+    """线程安全的有界连接池"""
+
+    def __init__(
+        self,
+        connect: Callable[[], taos.TaosConnection],
+        size: int,
+        check_interval: float
+    ) -> None:
+        """构造函数"""
+        self.connect: Callable[[], taos.TaosConnection] = connect
+        self.size: int = size
+        self.check_interval: float = check_interval
+
+        # 空闲连接及其最近使用时间
+        self.idle: list[tuple[taos.TaosConnection, float]] = []
+        self.created: int = 0
+        self.condition: Condition = Condition()
+
+        # 当前线程持有的连接和游标
+        self.local: local = local()
+
+    @contextmanager
+    def connection(self) -> Iterator[taos.TaosConnection]:
+        """借出连接，当前线程已持有连接时直接复用"""
+        conn: taos.TaosConnection | None = getattr(self.local, "conn", None)
+        if conn:
+            yield conn
+            return
+
+        conn = self.acquire()
+        self.local.conn = conn
+        self.local.cursor = None
+
+        broken: bool = False
+        try:
+            yield conn
+        except Exception:
+            # 出错后检查连接是否仍然可用
+            broken = not self.check(conn)
+            raise
+        finally:
+            cursor: taos.TaosCursor | None = self.local.cursor
+            if cursor:
+                cursor.close()
+
+            self.local.conn = None
+            self.local.cursor = None
+
+            self.release(conn, broken)
+
+    def get_connection(self) -> taos.TaosConnection | None:
+        """获取当前线程持有的连接"""
+        return getattr(self.local, "conn", None)
+
+    def get_cursor(self) -> taos.TaosCursor | None:
+        """获取当前线程持有连接的游标"""
+        conn: taos.TaosConnection | None = getattr(self.local, "conn", None)
+        if not conn:
+            return None
+
+        if not self.local.cursor:
+            self.local.cursor = conn.cursor()
+
+        cursor: taos.TaosCursor = self.local.cursor
+        return cursor
+
+    def acquire(self) -> taos.TaosConnection:
+        """从连接池中取出连接，没有空闲连接时创建或等待"""
+        with self.condition:
+            while True:
+                if self.idle:
+                    conn, last_used = self.idle.pop()
+                    break
+
+                if self.created < self.size:
+                    self.created += 1
+
+                    conn = self.create()
+                    return conn
+
+                self.condition.wait()
+
+        # 空闲时间较长的连接先检查是否可用
+        if monotonic() - last_used > self.check_interval and not self.check(conn):
+            self.discard(conn)
+
+            with self.condition:
+                self.created += 1
+            conn = self.create()
+
+        return conn
+
+    def release(self, conn: taos.TaosConnection, broken: bool = False) -> None:
+        """归还连接，已失效的连接直接关闭"""
+        if broken:
+            self.discard(conn)
+            return
+
+        with self.condition:
+            self.idle.append((conn, monotonic()))
+            self.condition.notify()
+
+    def create(self) -> taos.TaosConnection:
+        """创建新连接，失败时释放占用的名额"""
+        try:
+            return self.connect()
+        except Exception:
+            with self.condition:
+                self.created -= 1
+                self.condition.notify()
+            raise
+
+    def discard(self, conn: taos.TaosConnection) -> None:
+        """关闭连接并释放占用的名额"""
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+        with self.condition:
+            self.created -= 1
+            self.condition.notify()
+
+    def check(self, conn: taos.TaosConnection) -> bool:
+        """检查连接是否可用"""
+        try:
+            conn.query("SELECT SERVER_STATUS()").fetch_all()
+            return True
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        """关闭全部空闲连接"""
+        with self.condition:
+            idle: list[tuple[taos.TaosConnection, float]] = self.idle
+            self.idle = []
+            self.created -= len(idle)
+
+        for conn, _ in idle:
+            conn.close()
+
+
+def pooled(func: F) -> F:
+    """在函数执行期间从连接池借出连接，启用性能指标时记录函数耗时"""
+    name: str = func.__name__
+
+    @wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        with self.pool.connection():
+            if not self.metrics:
+                return func(self, *args, **kwargs)
+
+            start: float = perf_counter()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                self.metrics.record(KIND_METHOD, name, perf_counter() - start)
+
+    return wrapper      # type: ignore
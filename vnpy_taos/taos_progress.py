@@ -0,0 +1,54 @@
+"""
+批量导入导出工具共用的进度统计。
+"""
+
+from threading import Lock
+from time import perf_counter
+
+
+class Progress:
+    """导入导出进度统计"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.lock: Lock = Lock()
+        self.start_time: float = perf_counter()
+
+        self.rows: int = 0
+        self.tables: int = 0
+
+        # 上次输出时的状态，用于计算区间速度
+        self.last_time: float = self.start_time
+        self.last_rows: int = 0
+
+    def add_rows(self, rows: int) -> None:
+        """记录写入的行数"""
+        with self.lock:
+            self.rows += rows
+
+    def add_table(self) -> None:
+        """记录完成的数据表数量"""
+        with self.lock:
+            self.tables += 1
+
+    def report(self, total_tables: int) -> str:
+        """生成进度信息，包括全程平均速度和距上次输出的区间速度"""
+        now: float = perf_counter()
+
+        with self.lock:
+            rows: int = self.rows
+            tables: int = self.tables
+
+        elapsed: float = now - self.start_time
+        average: float = rows / elapsed if elapsed else 0
+
+        interval: float = now - self.last_time
+        recent: float = (rows - self.last_rows) / interval if interval else 0
+
+        self.last_time = now
+        self.last_rows = rows
+
+        return (
+            f"已完成{tables}/{total_tables}张数据表，写入{rows}行，耗时{elapsed:.0f}秒，"
+            f"平均{average:.0f}行/秒，最近{recent:.0f}行/秒"
+        )
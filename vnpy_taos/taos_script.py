@@ -22,7 +22,7 @@ TAGS(
 )
 """
 
-# 创建bar超级表
+# 创建bar超级表（字符串标签的类型由tag_type指定）
 CREATE_BAR_TABLE_SCRIPT = """
 CREATE STABLE IF NOT EXISTS s_bar (
     datetime TIMESTAMP,
@@ -35,16 +35,16 @@ CREATE STABLE IF NOT EXISTS s_bar (
     close_price DOUBLE
 )
 TAGS(
-    symbol BINARY(20),
-    exchange BINARY(10),
-    interval_ BINARY(5),
+    symbol {tag_type}(20),
+    exchange {tag_type}(10),
+    interval_ {tag_type}(5),
     start_time TIMESTAMP,
     end_time TIMESTAMP,
     count_ DOUBLE
 )
 """
 
-# 创建tick超级表
+# 创建tick超级表（字符串标签的类型由tag_type指定）
 CREATE_TICK_TABLE_SCRIPT = """
 CREATE STABLE IF NOT EXISTS s_tick (
     datetime TIMESTAMP,
@@ -83,10 +83,47 @@ CREATE STABLE IF NOT EXISTS s_tick (
     localtime TIMESTAMP
 )
 TAGS(
-    symbol BINARY(20),
-    exchange BINARY(10),
+    symbol {tag_type}(20),
+    exchange {tag_type}(10),
     start_time TIMESTAMP,
     end_time TIMESTAMP,
     count_ DOUBLE
 )
 """
+
+# 创建K线合成流（由1分钟K线持续合成更大周期K线，标签类型与s_bar一致）
+CREATE_BAR_STREAM_SCRIPT = """
+CREATE STREAM IF NOT EXISTS {stream_name}
+TRIGGER WINDOW_CLOSE
+WATERMARK {watermark}
+FILL_HISTORY {fill_history}
+IGNORE UPDATE 0
+INTO {stable_name} TAGS(
+    symbol {tag_type}(20),
+    exchange {tag_type}(10)
+)
+SUBTABLE(CONCAT('{stable_name}_', REPLACE(symbol, '-', '_'), '_', exchange))
+AS SELECT
+    _wstart AS datetime,
+    SUM(volume) AS volume,
+    SUM(turnover) AS turnover,
+    LAST(open_interest) AS open_interest,
+    FIRST(open_price) AS open_price,
+    MAX(high_price) AS high_price,
+    MIN(low_price) AS low_price,
+    LAST(close_price) AS close_price
+FROM s_bar
+WHERE interval_ = '1m'
+PARTITION BY symbol, exchange
+{interval_clause}
+"""
+
+# 删除合成流
+DROP_STREAM_SCRIPT = """
+DROP STREAM IF EXISTS {stream_name}
+"""
+
+# 查询合成流
+LIST_STREAM_SCRIPT = """
+SELECT stream_name, target_table, status FROM information_schema.ins_streams WHERE source_db = '{}'
+"""
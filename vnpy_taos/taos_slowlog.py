@@ -0,0 +1,239 @@
+"""
+慢查询日志，按去除字面量和数据表后缀的语句指纹汇总超过阈值的SQL语句，可选记录查询计划。
+"""
+
+import json
+import logging
+import re
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from queue import Full, Queue
+from threading import Lock, Thread
+from typing import Any
+
+import taos
+
+
+# 语句指纹计算时读取的最大长度（批量写入的SQL语句可能很长）
+FINGERPRINT_LENGTH: int = 4096
+
+# 日志中记录的SQL语句最大长度
+SQL_LENGTH: int = 2000
+
+# 每个指纹保留的最近耗时数量，用于计算分位数
+SAMPLE_SIZE: int = 1000
+
+# 日志文件保留的备份数量
+BACKUP_COUNT: int = 5
+
+# 等待记录查询计划的慢查询数量上限，超出时不再记录查询计划
+EXPLAIN_QUEUE_SIZE: int = 100
+
+# 语句指纹的替换规则，按顺序执行
+FINGERPRINT_RULES: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"'(?:[^'\\]|\\.)*'"), "?"),                                # 字符串和时间字面量
+    (re.compile(r"`[^`]*`"), "?"),                                          # 反引号引用的数据表名
+    (re.compile(r"\b(bar|tick|main_contract)_\w+", re.IGNORECASE), r"\1_?"),  # 数据表名中的合约后缀
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?![\w.])"), "?"),               # 数值字面量
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),                     # 字面量列表
+    (re.compile(r"\s+"), " "),
+]
+
+# 写入语句的VALUES部分
+VALUES_PATTERN: re.Pattern = re.compile(r"\bVALUES\b", re.IGNORECASE)
+
+# 可以记录查询计划的语句
+EXPLAIN_PATTERN: re.Pattern = re.compile(r"\s*SELECT\b", re.IGNORECASE)
+
+
+class FingerprintStats:
+    """单个语句指纹的慢查询统计"""
+
+    def __init__(self, fingerprint: str) -> None:
+        """构造函数"""
+        self.fingerprint: str = fingerprint
+        self.count: int = 0
+        self.total_time: float = 0
+        self.max_time: float = 0
+        self.samples: deque[float] = deque(maxlen=SAMPLE_SIZE)
+
+        # 耗时最长的语句及其查询计划
+        self.worst_sql: str = ""
+        self.explain: list[str] = []
+
+    def add(self, sql: str, latency: float) -> bool:
+        """记录一次慢查询，返回是否为新的最慢语句"""
+        self.count += 1
+        self.total_time += latency
+        self.samples.append(latency)
+
+        if latency <= self.max_time:
+            return False
+
+        self.max_time = latency
+        self.worst_sql = sql[:SQL_LENGTH]
+        return True
+
+    def get_percentile(self, percent: float) -> float:
+        """计算最近耗时的分位数"""
+        samples: list[float] = sorted(self.samples)
+        return samples[round((len(samples) - 1) * percent)]
+
+    def to_dict(self) -> dict[str, Any]:
+        """转换为汇总信息字典（耗时单位为毫秒）"""
+        return {
+            "fingerprint": self.fingerprint,
+            "count": self.count,
+            "p50": self.get_percentile(0.5) * 1000,
+            "p99": self.get_percentile(0.99) * 1000,
+            "max": self.max_time * 1000,
+            "total": self.total_time * 1000,
+            "worst_sql": self.worst_sql,
+            "explain": list(self.explain),
+        }
+
+
+class SlowQueryLog:
+    """超过耗时阈值的SQL语句记录，写入按大小轮转的本地日志"""
+
+    def __init__(
+        self,
+        threshold: float,
+        path: Path,
+        max_bytes: int,
+        connect: Callable[[], taos.TaosConnection] | None = None
+    ) -> None:
+        """构造函数，threshold单位为秒，传入connect时对慢查询记录查询计划"""
+        self.threshold: float = threshold
+        self.connect: Callable[[], taos.TaosConnection] | None = connect
+
+        self.stats: dict[str, FingerprintStats] = {}
+        self.lock: Lock = Lock()
+
+        # 使用独立的日志对象，不输出到vnpy日志
+        self.handler: RotatingFileHandler = RotatingFileHandler(
+            path, maxBytes=max_bytes, backupCount=BACKUP_COUNT, encoding="UTF-8"
+        )
+        self.logger: logging.Logger = logging.getLogger(f"vnpy_taos.slowlog.{id(self)}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(self.handler)
+
+        # 在后台线程中使用独立的连接执行EXPLAIN
+        self.queue: Queue[tuple[str, float, FingerprintStats] | None] = Queue(EXPLAIN_QUEUE_SIZE)
+        self.thread: Thread | None = None
+        self.conn: taos.TaosConnection | None = None
+
+        if connect:
+            self.thread = Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def on_statement(self, sql: str, latency: float) -> None:
+        """SQL语句执行完成的回调"""
+        if latency < self.threshold:
+            return
+
+        fingerprint: str = generate_fingerprint(sql)
+
+        with self.lock:
+            stats: FingerprintStats | None = self.stats.get(fingerprint)
+            if not stats:
+                stats = FingerprintStats(fingerprint)
+                self.stats[fingerprint] = stats
+
+            worst: bool = stats.add(sql, latency)
+
+        # 出现新的最慢语句时重新记录查询计划
+        if self.thread and worst and EXPLAIN_PATTERN.match(sql):
+            try:
+                self.queue.put_nowait((sql, latency, stats))
+                return
+            except Full:
+                pass
+
+        self.write(sql, latency, fingerprint)
+
+    def run(self) -> None:
+        """查询计划记录线程"""
+        while True:
+            item: tuple[str, float, FingerprintStats] | None = self.queue.get()
+            if item is None:
+                break
+
+            sql, latency, stats = item
+            explain: list[str] = self.explain(sql)
+
+            with self.lock:
+                stats.explain = explain
+
+            self.write(sql, latency, stats.fingerprint, explain)
+
+    def explain(self, sql: str) -> list[str]:
+        """执行EXPLAIN获取查询计划，失败时返回错误信息"""
+        try:
+            if not self.conn:
+                self.conn = self.connect()      # type: ignore
+
+            result: taos.TaosResult = self.conn.query(f"EXPLAIN {sql}")
+            return [str(row[0]) for row in result.fetch_all()]
+        except Exception as e:
+            self.conn = None
+            return [f"EXPLAIN失败: {e}"]
+
+    def write(self, sql: str, latency: float, fingerprint: str, explain: list[str] | None = None) -> None:
+        """写入一条慢查询日志"""
+        record: dict[str, Any] = {
+            "time": datetime.now().isoformat(),
+            "latency": round(latency * 1000, 3),
+            "fingerprint": fingerprint,
+            "sql": sql[:SQL_LENGTH],
+        }
+        if explain:
+            record["explain"] = explain
+
+        self.logger.info(json.dumps(record, ensure_ascii=False))
+
+    def get_top(self, count: int = 10, key: str = "total") -> list[dict[str, Any]]:
+        """查询慢查询最严重的语句指纹，key可选total、p50、p99、max、count"""
+        with self.lock:
+            results: list[dict[str, Any]] = [stats.to_dict() for stats in self.stats.values()]
+
+        results.sort(key=lambda d: d[key], reverse=True)
+        return results[:count]
+
+    def clear(self) -> None:
+        """清空统计数据"""
+        with self.lock:
+            self.stats.clear()
+
+    def close(self) -> None:
+        """停止查询计划记录线程并关闭日志文件"""
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+
+def generate_fingerprint(sql: str) -> str:
+    """去除字面量和数据表后缀，生成语句指纹"""
+    text: str = sql[:FINGERPRINT_LENGTH]
+
+    # 写入语句只保留VALUES之前的部分
+    match: re.Match | None = VALUES_PATTERN.search(text)
+    if match:
+        text = text[:match.end()] + " ?"
+
+    for pattern, replacement in FINGERPRINT_RULES:
+        text = pattern.sub(replacement, text)
+
+    return text.strip()
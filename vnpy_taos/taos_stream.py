@@ -0,0 +1,205 @@
+"""
+TDengine时间窗口聚合及流计算管理，由1分钟K线持续合成其他周期的K线。
+
+tick数据的累计成交量在交易时段切换时归零，需要按相邻tick的增量（DIFF）聚合，流计算中无法实现，
+因此不支持由tick数据创建合成流，tick合成K线可以使用TaosDatabase.load_tick_bar_data在查询时计算。
+"""
+
+import re
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from vnpy.trader.constant import Exchange, Interval
+from vnpy.trader.utility import extract_vt_symbol
+
+from .taos_script import (
+    CREATE_BAR_STREAM_SCRIPT,
+    DROP_STREAM_SCRIPT,
+    LIST_STREAM_SCRIPT,
+)
+
+if TYPE_CHECKING:
+    from .taos_database import TaosDatabase
+
+
+# 数据库端合成K线的时间窗口格式及对应周期
+WINDOW_PATTERN: re.Pattern = re.compile(r"^\d+[smhdw]$")
+WINDOW_INTERVALS: dict[str, Interval] = {
+    "m": Interval.MINUTE,
+    "h": Interval.HOUR,
+    "d": Interval.DAILY,
+    "w": Interval.WEEKLY,
+}
+
+# 合成数据来源
+SOURCE_BAR: str = "bar"
+SOURCE_TICK: str = "tick"
+
+# K线周期对应的合成流时间窗口
+INTERVAL_WINDOWS: dict[Interval, str] = {
+    Interval.MINUTE: "1m",
+    Interval.HOUR: "1h",
+    Interval.DAILY: "1d",
+    Interval.WEEKLY: "1w",
+}
+
+
+class StreamManager:
+    """管理K线合成流及其输出的超级表"""
+
+    def __init__(self, database: "TaosDatabase") -> None:
+        """构造函数"""
+        self.database: TaosDatabase = database
+
+        # 已存在的合成流名称
+        self.stream_names: set[str] = set()
+
+    def load(self) -> None:
+        """从数据库加载已存在的合成流"""
+        self.stream_names = {row[0] for row in self.list_streams()}
+
+    def list_streams(self) -> list[tuple]:
+        """查询当前数据库的合成流，返回名称、输出超级表和状态"""
+        with self.database.pool.connection():
+            self.database.cursor.execute(LIST_STREAM_SCRIPT.format(self.database.database))
+            return list(self.database.cursor.fetchall())
+
+    def create_stream(
+        self,
+        source: str,
+        window: str,
+        offset: str = "",
+        fill_history: bool = True,
+        watermark: str = "10s"
+    ) -> str:
+        """创建合成流，返回合成流名称"""
+        check_source(source)
+
+        stream_name, stable_name = generate_stream_names(source, window)
+
+        sql: str = CREATE_BAR_STREAM_SCRIPT.format(
+            stream_name=stream_name,
+            stable_name=stable_name,
+            watermark=watermark,
+            fill_history=int(fill_history),
+            tag_type="NCHAR" if self.database.insert_mode == "schemaless" else "BINARY",
+            interval_clause=generate_interval_clause(window, offset)
+        )
+
+        with self.database.pool.connection():
+            self.database.cursor.execute(sql)
+
+        self.stream_names.add(stream_name)
+
+        return stream_name
+
+    def drop_stream(self, source: str, window: str, drop_table: bool = False) -> None:
+        """删除合成流，drop_table为True时同时删除输出的超级表"""
+        stream_name, stable_name = generate_stream_names(source, window)
+
+        with self.database.pool.connection():
+            self.database.cursor.execute(DROP_STREAM_SCRIPT.format(stream_name=stream_name))
+            self.stream_names.discard(stream_name)
+
+            if drop_table:
+                self.database.cursor.execute(f"DROP STABLE IF EXISTS {stable_name}")
+
+    def backfill(
+        self,
+        source: str,
+        window: str,
+        start: datetime,
+        end: datetime,
+        offset: str = "",
+        vt_symbols: list[str] | None = None
+    ) -> int:
+        """在数据库中补算历史区间的合成数据，offset需与创建时一致，返回补算的合约数量"""
+        check_source(source)
+
+        _, stable_name = generate_stream_names(source, window)
+
+        with self.database.pool.connection():
+            # 未指定合约时补算全部数据来源
+            contracts: list[tuple[str, Exchange]] = []
+            if vt_symbols:
+                contracts = [extract_vt_symbol(vt_symbol) for vt_symbol in vt_symbols]
+            else:
+                self.database.cursor.execute("SELECT TAGS symbol, exchange FROM s_bar WHERE interval_ = '1m'")
+                contracts = [(row[0], Exchange(row[1])) for row in self.database.cursor.fetchall()]
+
+            for symbol, exchange in contracts:
+                sql: str = self.database.generate_resample_sql(
+                    symbol, exchange, Interval.MINUTE, window, start, end, offset
+                )
+
+                table_name: str = generate_stream_table_name(stable_name, symbol, exchange)
+
+                self.database.cursor.execute(
+                    f"INSERT INTO {table_name} USING {stable_name} "
+                    f"TAGS('{symbol}', '{exchange.value}') {sql}"
+                )
+
+        return len(contracts)
+
+    def get_table_name(self, source: str, window: str, symbol: str, exchange: Exchange) -> str:
+        """查询合约在合成流输出中的数据表名，合成流不存在时返回空字符串"""
+        stream_name, stable_name = generate_stream_names(source, window)
+
+        if stream_name not in self.stream_names:
+            return ""
+
+        return generate_stream_table_name(stable_name, symbol, exchange)
+
+    def get_bar_table_name(self, symbol: str, exchange: Exchange, interval: Interval) -> str:
+        """查询K线周期对应的合成数据表名"""
+        window: str | None = INTERVAL_WINDOWS.get(interval)
+        if not window:
+            return ""
+
+        return self.get_table_name(SOURCE_BAR, window, symbol, exchange)
+
+
+def check_source(source: str) -> None:
+    """检查合成流的数据来源，只支持由K线合成"""
+    if source == SOURCE_TICK:
+        raise ValueError(
+            "tick数据的累计成交量在交易时段切换时归零，流计算无法正确聚合成交量，"
+            "不支持由tick数据创建合成流，请使用load_tick_bar_data"
+        )
+    if source != SOURCE_BAR:
+        raise ValueError(f"不支持的合成数据来源：{source}")
+
+
+def generate_stream_names(source: str, window: str) -> tuple[str, str]:
+    """生成合成流名称和输出超级表名"""
+    if source == SOURCE_BAR:
+        return f"stream_bar_{window}", f"s_bar_{window}"
+    elif source == SOURCE_TICK:
+        return f"stream_tick_{window}", f"s_tick_bar_{window}"
+
+    raise ValueError(f"不支持的合成数据来源：{source}")
+
+
+def generate_stream_table_name(stable_name: str, symbol: str, exchange: Exchange) -> str:
+    """生成合成流输出的子表名，与K线数据表名相同地替换合约代码中的特殊字符"""
+    return "_".join([stable_name, symbol.replace("-", "_"), exchange.value])
+
+
+def generate_interval_clause(window: str, offset: str) -> str:
+    """生成时间窗口子句，窗口偏移用于对齐夜盘等交易时段"""
+    if not WINDOW_PATTERN.match(window):
+        raise ValueError(f"不支持的时间窗口：{window}")
+    if offset and not WINDOW_PATTERN.match(offset):
+        raise ValueError(f"不支持的窗口偏移：{offset}")
+
+    if offset:
+        return f"INTERVAL({window}, {offset})"
+    return f"INTERVAL({window})"
+
+
+def get_window_interval(window: str) -> Interval:
+    """根据时间窗口单位获取K线周期"""
+    interval: Interval | None = WINDOW_INTERVALS.get(window[-1])
+    if not interval:
+        raise ValueError(f"无法根据时间窗口{window}确定K线周期，请传入interval参数")
+    return interval
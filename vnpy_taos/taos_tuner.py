@@ -0,0 +1,67 @@
+"""
+写入语句的字节预算，按语句执行耗时自动调整，语句因超长被拒绝时降低上限。
+"""
+
+from threading import Lock
+
+from vnpy.trader.logger import logger
+
+
+# 预算下限（字节）
+MIN_BUDGET: int = 16 * 1024
+
+# SQL语句超长的错误码（TSDB_CODE_TSC_EXCEED_SQL_LIMIT）
+SQL_TOO_LONG_ERRNO: int = 0x0219
+
+# 单次调整的最大倍数
+MAX_RATIO: float = 2
+
+
+class BatchTuner:
+    """写入语句的字节预算"""
+
+    def __init__(self, max_bytes: int, target_latency: float = 0) -> None:
+        """构造函数，target_latency单位为秒，为0时不根据耗时调整"""
+        self.max_bytes: int = max(max_bytes, MIN_BUDGET)
+        self.target_latency: float = target_latency
+        self.budget: int = self.max_bytes
+
+        self.lock: Lock = Lock()
+
+    def record(self, size: int, latency: float) -> None:
+        """记录一条写入语句的字节数和执行耗时"""
+        if not self.target_latency or not latency:
+            return
+
+        # 远小于预算的语句（数据量不足）不能反映预算是否合适
+        if size < self.budget // 2:
+            return
+
+        # 按耗时与目标的比例估算目标耗时下的字节数，向估算值移动一半
+        ratio: float = min(max(self.target_latency / latency, 1 / MAX_RATIO), MAX_RATIO)
+        estimate: int = int(size * ratio)
+
+        with self.lock:
+            budget: int = (self.budget + estimate) // 2
+            self.budget = min(max(budget, MIN_BUDGET), self.max_bytes)
+
+    def reject(self, size: int) -> None:
+        """语句因超长被拒绝，将上限降低到该语句的一半"""
+        with self.lock:
+            max_bytes: int = max(size // 2, MIN_BUDGET)
+            if max_bytes >= self.max_bytes:
+                return
+
+            self.max_bytes = max_bytes
+            self.budget = min(self.budget, max_bytes)
+
+        logger.bind(gateway_name="TAOS").warning(f"SQL语句长度{size}字节超出限制，单条语句上限调整为{max_bytes}字节")
+
+
+def is_sql_too_long(e: Exception) -> bool:
+    """判断错误是否为SQL语句超长，带有错误码时只按错误码判断（断线等错误不能通过拆分语句解决）"""
+    errno: int = getattr(e, "errno", 0) or 0
+    if errno:
+        return (errno & 0xFFFF) == SQL_TOO_LONG_ERRNO
+
+    return "too long" in str(e).lower()
@@ -0,0 +1,332 @@
+"""
+tick数据异步批量写入器，在后台线程中合并多个合约的数据写入数据库。
+"""
+
+import os
+import pickle
+import shutil
+from collections import deque
+from threading import Condition, Thread
+from time import monotonic, perf_counter
+from typing import BinaryIO
+
+from vnpy.trader.logger import logger
+from vnpy.trader.object import TickData
+from vnpy.trader.utility import get_file_path
+
+from .taos_database import TaosDatabase
+
+
+# 队列满时的处理策略
+POLICY_BLOCK: str = "block"
+POLICY_DROP_OLDEST: str = "drop_oldest"
+POLICY_SPILL: str = "spill"
+
+
+class TickWriter:
+    """带有界队列的tick数据后台写入器"""
+
+    def __init__(
+        self,
+        database: TaosDatabase,
+        max_size: int = 100_000,
+        batch_size: int = 5000,
+        flush_interval: int = 500,
+        policy: str = POLICY_BLOCK,
+        spill_path: str = ""
+    ) -> None:
+        """构造函数，flush_interval单位为毫秒"""
+        if policy not in {POLICY_BLOCK, POLICY_DROP_OLDEST, POLICY_SPILL}:
+            raise ValueError(f"不支持的队列满处理策略：{policy}")
+
+        self.database: TaosDatabase = database
+        self.max_size: int = max_size
+        self.batch_size: int = batch_size
+        self.flush_interval: float = flush_interval / 1000
+        self.policy: str = policy
+        self.spill_path: str = spill_path or str(get_file_path("taos_tick_spill.pkl"))
+
+        self.queue: deque[TickData] = deque()
+        self.condition: Condition = Condition()
+        self.active: bool = False
+        self.thread: Thread | None = None
+
+        self.spill_file: BinaryIO | None = None
+        self.replay_files: list[str] = []
+        self.replay_index: int = 0
+
+        # 队列头部写入失败等待重试的数据条数
+        self.retry_rows: int = 0
+
+        # 统计数据
+        self.start_time: float = 0
+        self.rows_written: int = 0
+        self.rows_dropped: int = 0
+        self.rows_spilled: int = 0
+        self.flush_count: int = 0
+        self.error_count: int = 0
+        self.last_latency: float = 0
+        self.max_latency: float = 0
+        self.total_latency: float = 0
+
+    def start(self) -> None:
+        """启动后台写入线程，先补写上次运行遗留的溢出数据"""
+        if self.active:
+            return
+
+        # 遗留的溢出数据早于新数据，补写失败时保留文件，由后台线程继续重试
+        self.load_spill()
+        self.replay_spill()
+
+        self.active = True
+        self.start_time = monotonic()
+
+        self.thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """停止后台线程并写入剩余数据"""
+        if not self.active:
+            return
+
+        with self.condition:
+            self.active = False
+            self.condition.notify_all()
+
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+        # 写入队列和溢出文件中的剩余数据
+        while self.queue and self.flush():
+            pass
+
+        self.replay_spill()
+
+        # 数据库无法写入时保存剩余数据，下次启动时补写
+        if self.queue:
+            self.save_remaining()
+
+    def put(self, tick: TickData) -> bool:
+        """放入tick数据，返回是否进入队列"""
+        with self.condition:
+            # 溢出数据补写完成前新数据也写入溢出文件，保证写入顺序
+            if self.policy == POLICY_SPILL and (self.spill_file or self.replay_files):
+                self.spill(tick)
+                return False
+
+            if len(self.queue) >= self.max_size:
+                if self.policy == POLICY_BLOCK:
+                    while self.active and len(self.queue) >= self.max_size:
+                        self.condition.wait()
+
+                    # 写入器未启动或已停止时没有线程释放队列空间
+                    if len(self.queue) >= self.max_size:
+                        raise RuntimeError("TickWriter未运行且队列已满，无法放入数据")
+                elif self.policy == POLICY_DROP_OLDEST:
+                    self.queue.popleft()
+                    self.rows_dropped += 1
+
+                    if self.retry_rows:
+                        self.retry_rows -= 1
+                else:
+                    self.spill(tick)
+                    return False
+
+            self.queue.append(tick)
+
+            if len(self.queue) >= self.batch_size:
+                self.condition.notify_all()
+
+        return True
+
+    def run(self) -> None:
+        """后台写入线程，达到批量大小或时间间隔时写入"""
+        last_flush: float = monotonic()
+        success: bool = True
+
+        while self.active:
+            with self.condition:
+                # 写入失败后至少等待一个时间间隔再重试
+                while self.active and (len(self.queue) < self.batch_size or not success):
+                    timeout: float = self.flush_interval - (monotonic() - last_flush)
+                    if timeout <= 0:
+                        break
+                    self.condition.wait(timeout)
+
+            # 溢出数据晚于队列中的数据，队列写完后再补写
+            if self.queue:
+                success = self.flush()
+            elif self.spill_file or self.replay_files:
+                self.replay_spill()
+
+            last_flush = monotonic()
+
+    def flush(self) -> bool:
+        """取出一批数据写入数据库，返回是否写入成功"""
+        with self.condition:
+            count: int = min(len(self.queue), self.batch_size)
+            batch: list[TickData] = [self.queue.popleft() for _ in range(count)]
+
+            # 重试的数据可能已经部分写入，需要重新统计汇总信息中的数据量
+            retry: bool = self.retry_rows > 0
+            self.retry_rows = max(self.retry_rows - count, 0)
+
+            # 通知等待中的生产者
+            self.condition.notify_all()
+
+        if not batch:
+            return True
+
+        start: float = perf_counter()
+
+        try:
+            self.database.save_tick_data_many(batch, stream=not retry)
+        except Exception as e:
+            logger.bind(gateway_name="TAOS").error(f"tick数据写入失败: {e}")
+            self.error_count += 1
+
+            # 写入失败的数据放回队列头部等待重试
+            with self.condition:
+                self.queue.extendleft(reversed(batch))
+                self.retry_rows += count
+            return False
+
+        latency: float = perf_counter() - start
+
+        self.flush_count += 1
+        self.rows_written += len(batch)
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
+        return True
+
+    def spill(self, tick: TickData) -> None:
+        """队列已满时将数据写入本地溢出文件"""
+        if not self.spill_file:
+            self.spill_file = open(self.spill_path, "ab")
+
+        pickle.dump(tick, self.spill_file)
+
+        self.rows_spilled += 1
+
+    def replay_spill(self) -> None:
+        """将溢出文件中的数据写入数据库"""
+        with self.condition:
+            # 转移当前溢出文件后再读取，新的溢出数据写入新文件
+            if self.spill_file:
+                self.spill_file.close()
+                self.spill_file = None
+
+                self.replay_index += 1
+                replay_path: str = f"{self.spill_path}.{self.replay_index}"
+                os.replace(self.spill_path, replay_path)
+
+                self.replay_files.append(replay_path)
+
+        while self.replay_files:
+            try:
+                self.replay_file(self.replay_files[0])
+            except Exception as e:
+                # 保留文件等待下次重试，重复写入的数据会被覆盖
+                logger.bind(gateway_name="TAOS").error(f"溢出数据写入失败: {e}")
+                self.error_count += 1
+                return
+
+            with self.condition:
+                os.remove(self.replay_files.pop(0))
+
+    def replay_file(self, path: str) -> None:
+        """分批读取溢出文件并写入数据库，补写的数据可能已经部分写入，按非流式方式重新统计数据量"""
+        batch: list[TickData] = []
+
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    batch.append(pickle.load(f))
+                except EOFError:
+                    break
+
+                if len(batch) >= self.batch_size:
+                    self.database.save_tick_data_many(batch)
+                    self.rows_written += len(batch)
+                    batch = []
+
+        if batch:
+            self.database.save_tick_data_many(batch)
+            self.rows_written += len(batch)
+
+    def load_spill(self) -> None:
+        """加载上次运行遗留的溢出文件，按编号顺序补写，未转移的溢出文件最后补写"""
+        folder, name = os.path.split(self.spill_path)
+
+        indexes: list[int] = []
+        for file_name in os.listdir(folder or "."):
+            suffix: str = file_name[len(name) + 1:]
+            if file_name.startswith(f"{name}.") and suffix.isdigit():
+                indexes.append(int(suffix))
+
+        indexes.sort()
+
+        with self.condition:
+            self.replay_files = [f"{self.spill_path}.{index}" for index in indexes]
+            self.replay_index = max(indexes, default=0)
+
+            if os.path.exists(self.spill_path) and not self.spill_file:
+                self.replay_index += 1
+                replay_path: str = f"{self.spill_path}.{self.replay_index}"
+                os.replace(self.spill_path, replay_path)
+
+                self.replay_files.append(replay_path)
+
+        if self.replay_files:
+            logger.bind(gateway_name="TAOS").info(f"发现{len(self.replay_files)}个遗留的tick溢出文件，开始补写")
+
+    def save_remaining(self) -> None:
+        """将队列中的数据和未补写的溢出文件按写入顺序合并保存为一个溢出文件"""
+        with self.condition:
+            ticks: list[TickData] = list(self.queue)
+            self.queue.clear()
+            self.retry_rows = 0
+
+            # 队列中的数据早于溢出文件中的数据
+            temp_path: str = f"{self.spill_path}.tmp"
+            with open(temp_path, "wb") as f:
+                for tick in ticks:
+                    pickle.dump(tick, f)
+
+                for replay_path in self.replay_files:
+                    with open(replay_path, "rb") as replay_file:
+                        shutil.copyfileobj(replay_file, f)
+
+            self.replay_index += 1
+            save_path: str = f"{self.spill_path}.{self.replay_index}"
+            os.replace(temp_path, save_path)
+
+            for replay_path in self.replay_files:
+                os.remove(replay_path)
+            self.replay_files = [save_path]
+
+            self.rows_spilled += len(ticks)
+
+        logger.bind(gateway_name="TAOS").error(
+            f"TickWriter停止时无法写入数据库，{len(ticks)}条tick数据已保存到{save_path}，下次启动时补写"
+        )
+
+    def get_statistics(self) -> dict[str, float]:
+        """查询写入统计信息"""
+        elapsed: float = monotonic() - self.start_time if self.start_time else 0
+
+        return {
+            "queue_depth": len(self.queue),
+            "rows_written": self.rows_written,
+            "rows_dropped": self.rows_dropped,
+            "rows_spilled": self.rows_spilled,
+            "rows_per_second": self.rows_written / elapsed if elapsed else 0,
+            "flush_count": self.flush_count,
+            "error_count": self.error_count,
+            "last_latency": self.last_latency,
+            "max_latency": self.max_latency,
+            "avg_latency": self.total_latency / self.flush_count if self.flush_count else 0,
+        }